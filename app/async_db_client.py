@@ -0,0 +1,417 @@
+# app/async_db_client.py
+
+# asyncio 네이티브 DB 클라이언트 (aiomysql)
+# DBClient와 동일한 메서드 구성을 async로 제공하여, 엔드포인트에서 쿼리를 기다리는 동안
+# 이벤트 루프(다른 요청, 열린 WebSocket)가 멈추지 않도록 합니다.
+# 풀 크기/타임아웃/recycle/ping 설정은 동기 풀(app.db_pool)과 같은 환경변수를 사용합니다.
+
+import ssl
+import time
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Dict, List, Optional, Tuple
+
+import aiomysql
+
+from app import metrics
+from app.db_routing import DB_REPLICA_DSNS, DB_REPLICA_STATUS_QUERY, ReplicaRouter, parse_dsn, lag_from_status
+from app.db_pool import (
+    DB_POOL_SIZE, DB_POOL_TIMEOUT, DB_POOL_RECYCLE, DB_POOL_PING_AFTER,
+    PoolTimeoutError, _WAIT_TIMEOUT_MARGIN,
+)
+from app.db_common import (
+    DB_HOST, DB_NAME, DB_USER, DB_PASSWORD, DB_SSL_CA,
+    validate_db_config, db_port, SchemaInfo, schema_columns_statement, schema_from_rows,
+    UploadIntent, insert_upload_intent_statement, insert_upload_intents_statement, update_status_statement,
+    select_upload_record_statement, select_upload_records_statement, row_to_upload_record,
+    list_user_jobs_statement, row_to_job_summary, select_job_owner_statement,
+    insert_multipart_upload_intent_statement, select_multipart_upload_statement,
+    row_to_multipart_upload, update_multipart_state_statement,
+    select_upload_intent_statement, row_to_upload_intent, mark_uploaded_statement, mark_processing_statement,
+    select_stale_uploads_statement, row_to_stale_upload, expire_upload_statement,
+)
+
+
+class AsyncDBClient:
+    def __init__(self, name: str = "async_db_pool.primary"):
+        # 설정 검증과 연결은 첫 사용 시점으로 미룸: DB가 없어도 앱(및 import)은 뜨고,
+        # DB를 쓰는 요청만 실패합니다.
+        self._conn_args = {
+            'host': DB_HOST,
+            'port': db_port(),
+            'db': DB_NAME,
+            'user': DB_USER,
+            'password': DB_PASSWORD,
+            'autocommit': True,  # 풀 연결이 오래된 스냅샷을 물고 있지 않도록
+        }
+        if DB_SSL_CA:
+            self._conn_args['ssl'] = ssl.create_default_context(cafile=DB_SSL_CA)
+
+        # 읽기 전용 replica (DB_REPLICA_DSNS). 계정/DB명이 DSN에 없으면 primary 설정을 사용
+        self._replica_args = []
+        for dsn in DB_REPLICA_DSNS:
+            parsed = parse_dsn(dsn)
+            parsed['db'] = parsed.pop('database')
+            self._replica_args.append(dict(self._conn_args, **{k: v for k, v in parsed.items() if v is not None}))
+        self._router = ReplicaRouter(len(self._replica_args))
+
+        # aiomysql 풀은 이벤트 루프 안에서만 만들 수 있으므로 첫 사용 시 생성
+        # key: None = primary, i = replica i
+        self._pools: Dict[Optional[int], aiomysql.Pool] = {}
+        self._pool_lock = asyncio.Lock()
+        # replica 지연 점검 태스크 (start()에서 시작, close()에서 중지)
+        self._lag_task: Optional[asyncio.Task] = None
+        # 테이블 컬럼 목록: 첫 사용 시 조회해 캐시 (refresh_schema()로 갱신)
+        self._schema: Optional[SchemaInfo] = None
+        self._stats = {
+            "checkouts": 0,
+            "waits": 0,
+            "timeouts": 0,
+            "ping_failures": 0,
+            "discarded": 0,
+            "max_wait_ms": 0.0,
+        }
+        self.metrics_name = metrics.register_source(name, self.pool_stats)
+
+    # ------------------------------------------------------------------
+    # 풀 / 연결 관리
+    # ------------------------------------------------------------------
+    async def _server_recycle(self, conn_args: dict) -> int:
+        """서버 wait_timeout을 한 번 조회해 recycle 값을 그보다 짧게 맞춥니다."""
+        recycle = DB_POOL_RECYCLE
+        try:
+            conn = await aiomysql.connect(**conn_args)
+            try:
+                async with conn.cursor() as cursor:
+                    await cursor.execute("SELECT @@SESSION.wait_timeout")
+                    row = await cursor.fetchone()
+            finally:
+                conn.close()
+            wait_timeout = int(row[0]) if row and row[0] is not None else None
+            if wait_timeout and wait_timeout > _WAIT_TIMEOUT_MARGIN * 2:
+                recycle = min(recycle, wait_timeout - _WAIT_TIMEOUT_MARGIN)
+        except Exception as e:
+            print(f"[Async DB Pool] wait_timeout 조회 실패 (recycle={recycle}s 유지): {e}")
+        return recycle
+
+    async def _get_pool(self, replica: Optional[int] = None) -> aiomysql.Pool:
+        pool = self._pools.get(replica)
+        if pool is not None:
+            return pool
+        async with self._pool_lock:
+            if replica not in self._pools:
+                validate_db_config()
+                conn_args = self._conn_args if replica is None else self._replica_args[replica]
+                recycle = await self._server_recycle(conn_args)
+                self._pools[replica] = await aiomysql.create_pool(
+                    minsize=0,
+                    maxsize=max(1, DB_POOL_SIZE),
+                    pool_recycle=recycle,
+                    **conn_args,
+                )
+        return self._pools[replica]
+
+    @asynccontextmanager
+    async def _connection(self, replica: Optional[int] = None):
+        pool = await self._get_pool(replica)
+        started = time.monotonic()
+        waited = pool.freesize == 0 and pool.size >= pool.maxsize
+        if waited:
+            self._stats["waits"] += 1
+        try:
+            conn = await asyncio.wait_for(pool.acquire(), timeout=DB_POOL_TIMEOUT)
+        except asyncio.TimeoutError:
+            self._stats["timeouts"] += 1
+            raise PoolTimeoutError(
+                f"DB connection pool exhausted (size={pool.maxsize}, timeout={DB_POOL_TIMEOUT}s)"
+            )
+        self._stats["checkouts"] += 1
+        if waited:
+            waited_ms = (time.monotonic() - started) * 1000
+            self._stats["max_wait_ms"] = max(self._stats["max_wait_ms"], round(waited_ms, 2))
+
+        # 일정 시간 놀던 연결은 재사용 전에 ping (끊겼으면 재연결)
+        if time.monotonic() - conn.last_usage >= DB_POOL_PING_AFTER:
+            try:
+                await conn.ping(reconnect=True)
+            except Exception:
+                self._stats["ping_failures"] += 1
+                conn.close()
+                pool.release(conn)
+                raise
+
+        try:
+            yield conn
+        except BaseException:
+            # 취소/오류로 중단된 연결은 프로토콜 상태를 신뢰할 수 없으므로 폐기
+            self._stats["discarded"] += 1
+            conn.close()
+            raise
+        finally:
+            pool.release(conn)
+
+    async def _execute(self, sql: str, params: tuple) -> int:
+        async with self._connection() as conn:
+            async with conn.cursor() as cursor:
+                await cursor.execute(sql, params)
+                return cursor.rowcount
+
+    async def _fetch_one(self, sql: str, params: tuple, replica: Optional[int] = None):
+        async with self._connection(replica) as conn:
+            async with conn.cursor() as cursor:
+                await cursor.execute(sql, params)
+                return await cursor.fetchone()
+
+    async def _fetch_all(self, sql: str, params: tuple, replica: Optional[int] = None) -> list:
+        async with self._connection(replica) as conn:
+            async with conn.cursor() as cursor:
+                await cursor.execute(sql, params)
+                return list(await cursor.fetchall())
+
+    # ------------------------------------------------------------------
+    # 읽기 라우팅: replica 우선, 최근 쓰기로 pin된 키나 replica 오류 시 primary
+    # ------------------------------------------------------------------
+    async def _read(self, fetch, sql: str, params: tuple, *keys: Optional[str]):
+        # 지연 점검은 백그라운드 태스크(start())가 수행하고, 여기서는 마지막 결과만 사용
+        idx = self._router.choose(*keys)
+        if idx is not None:
+            try:
+                return await fetch(sql, params, idx)
+            except Exception as e:
+                self._router.record_failure(idx, e)
+                self._router.record_primary_read()
+        elif not self._router.enabled:
+            self._router.record_primary_read()
+        return await fetch(sql, params)
+
+    async def _check_one_replica(self, idx: int) -> None:
+        try:
+            async with self._connection(idx) as conn:
+                async with conn.cursor() as cursor:
+                    await cursor.execute(DB_REPLICA_STATUS_QUERY)
+                    row = await cursor.fetchone()
+                    columns = [d[0] for d in cursor.description or []]
+            self._router.record_lag(idx, lag_from_status(columns, row))
+        except Exception as e:
+            print(f"[DB Routing] replica#{idx} lag check failed: {e}")
+            self._router.record_lag(idx, None)
+
+    async def check_replica_lag(self) -> None:
+        """각 replica의 복제 지연을 동시에 조회해 라우팅 대상 여부를 갱신합니다 (REPLICATION CLIENT 권한 필요)."""
+        self._router.mark_lag_checked()
+        await asyncio.gather(*(self._check_one_replica(idx) for idx in range(len(self._replica_args))))
+
+    async def _lag_monitor(self) -> None:
+        while True:
+            try:
+                await self.check_replica_lag()
+            except Exception as e:
+                print(f"[DB Routing] lag check failed: {e}")
+            await asyncio.sleep(self._router.lag_check_interval)
+
+    def start(self) -> None:
+        """replica가 설정되어 있으면 지연 점검 태스크를 시작합니다. (lifespan에서 호출)"""
+        if self._router.enabled and self._lag_task is None:
+            self._lag_task = asyncio.create_task(self._lag_monitor())
+
+    async def refresh_schema(self) -> SchemaInfo:
+        """information_schema에서 테이블 컬럼을 다시 읽습니다 (라이브 마이그레이션 직후 호출)."""
+        self._schema = schema_from_rows(await self._fetch_all(*schema_columns_statement()))
+        return self._schema
+
+    async def _get_schema(self) -> SchemaInfo:
+        schema = self._schema
+        if schema is None or schema.is_stale():
+            schema = await self.refresh_schema()
+        return schema
+
+    # ------------------------------------------------------------------
+    # DBClient와 동일한 메서드 구성
+    # ------------------------------------------------------------------
+    async def insert_upload_intent(
+        self,
+        job_id: str,
+        user_id: Optional[str],
+        non_member_identifier: Optional[str],
+        upload_source: str,
+        s3_key: str,
+        filename: str,
+        filetype: str,
+        file_size_bytes: int,
+        s3_result_path: Optional[str] = None,
+        status: str = "PENDING",
+        s3_key_layout: Optional[str] = None,
+    ) -> str:
+        """업로드 의도 레코드를 초기 상태(status)로 한 문장에 삽입하고, job_id를 반환합니다."""
+        schema = await self._get_schema()
+        sql, params = insert_upload_intent_statement(
+            schema, job_id, user_id, non_member_identifier, upload_source,
+            s3_key, filename, filetype, file_size_bytes, s3_result_path, status, s3_key_layout,
+        )
+        await self._execute(sql, params)
+        self._router.pin(job_id, user_id)
+        return job_id
+
+    async def insert_upload_intents(self, intents: List[UploadIntent], status: str = "PENDING") -> List[str]:
+        """여러 업로드 intent를 multi-row INSERT 한 번으로 삽입하고, job_id 목록을 반환합니다."""
+        if not intents:
+            return []
+        schema = await self._get_schema()
+        await self._execute(*insert_upload_intents_statement(schema, intents, status))
+        self._router.pin(*{i.job_id for i in intents}, *{i.user_id for i in intents})
+        return [i.job_id for i in intents]
+
+    async def update_upload_status(self, job_id: str, status: str, s3_result_path: Optional[str] = None) -> None:
+        """job_id 레코드의 processing_status와 s3_result_path를 갱신합니다."""
+        schema = await self._get_schema()
+        await self._execute(*update_status_statement(schema, job_id, status, s3_result_path))
+        self._router.pin(job_id)
+
+    async def update_upload_status_with_paths(self, job_id: str, status: str, s3_result_path: Optional[str] = None, s3_result_paths: Optional[str] = None) -> None:
+        """processing_status, s3_result_path, s3_result_paths(JSON)를 한 문장으로 갱신합니다."""
+        schema = await self._get_schema()
+        await self._execute(*update_status_statement(schema, job_id, status, s3_result_path, s3_result_paths))
+        self._router.pin(job_id)
+
+    async def get_upload_record(self, job_id: str) -> Optional[dict]:
+        """API에서 사용하는 업로드 레코드 필드를 dict로 반환합니다."""
+        schema = await self._get_schema()
+        row = await self._read(self._fetch_one, *select_upload_record_statement(schema, job_id), job_id)
+        return row_to_upload_record(schema, row)
+
+    async def get_upload_records(self, job_ids: List[str]) -> Dict[str, dict]:
+        """
+        여러 job 레코드를 WHERE id IN (...) 한 번으로 조회해 {job_id: record}로 반환합니다.
+        존재하지 않는 job_id는 결과에 포함되지 않습니다.
+        """
+        if not job_ids:
+            return {}
+        schema = await self._get_schema()
+        rows = await self._read(self._fetch_all, *select_upload_records_statement(schema, job_ids), *job_ids)
+        records = (row_to_upload_record(schema, row) for row in rows)
+        return {rec["job_id"]: rec for rec in records}
+
+    async def list_user_jobs(
+        self,
+        user_id: str,
+        limit: int = 20,
+        before: Optional[Tuple[object, str]] = None,
+        status: Optional[str] = None,
+    ) -> List[dict]:
+        """
+        user_id의 job 목록을 최신순(created_at DESC, id DESC)으로 최대 limit개 반환합니다.
+        before=(created_at, job_id)는 직전 페이지 마지막 항목(keyset 커서)입니다.
+        """
+        schema = await self._get_schema()
+        rows = await self._read(self._fetch_all, *list_user_jobs_statement(schema, user_id, limit, before, status), user_id)
+        return [row_to_job_summary(schema, row) for row in rows]
+
+    async def get_job_owner(self, job_id: str) -> Optional[str]:
+        """job_id의 소유자(user_id)를 반환합니다. 없으면 None."""
+        row = await self._read(self._fetch_one, *select_job_owner_statement(job_id), job_id)
+        if not row:
+            return None
+        return row[0]
+
+    async def insert_multipart_upload_intent(
+        self,
+        intent: UploadIntent,
+        upload_id: str,
+        part_size: int,
+        part_count: int,
+        status: str = "PENDING",
+    ) -> str:
+        """멀티파트 업로드 intent(UploadId, 파트 크기/개수 포함)를 한 문장으로 삽입하고 job_id를 반환합니다."""
+        schema = await self._get_schema()
+        await self._execute(*insert_multipart_upload_intent_statement(
+            schema, intent, status, upload_id, part_size, part_count,
+        ))
+        self._router.pin(intent.job_id, intent.user_id)
+        return intent.job_id
+
+    async def get_multipart_upload(self, job_id: str) -> Optional[dict]:
+        """job의 멀티파트 업로드 정보를 반환합니다. 없는 job이거나 단일 PUT 업로드면 None."""
+        schema = await self._get_schema()
+        row = await self._read(self._fetch_one, *select_multipart_upload_statement(schema, job_id), job_id)
+        return row_to_multipart_upload(row)
+
+    async def update_multipart_state(self, job_id: str, state: str, status: Optional[str] = None) -> bool:
+        """INITIATED 상태의 멀티파트 업로드를 state로 전환합니다. 이미 전환된 경우 False."""
+        schema = await self._get_schema()
+        changed = await self._execute(*update_multipart_state_statement(schema, job_id, state, status))
+        self._router.pin(job_id)
+        return changed > 0
+
+    async def get_upload_intent(self, job_id: str) -> Optional[dict]:
+        """업로드 검증용 필드(s3_key, file_type, file_size_bytes, status 등)를 반환합니다."""
+        row = await self._read(self._fetch_one, *select_upload_intent_statement("id", job_id), job_id)
+        return row_to_upload_intent(row)
+
+    async def get_upload_intent_by_key(self, s3_key: str) -> Optional[dict]:
+        """S3 객체 키로 업로드 job을 찾습니다 (S3 이벤트 처리용, 쓰기 직후일 수 있으므로 primary에서 조회)."""
+        return row_to_upload_intent(await self._fetch_one(*select_upload_intent_statement("s3_key", s3_key)))
+
+    async def mark_uploaded(self, job_id: str) -> bool:
+        """업로드 대기 중인 job을 UPLOADED로 전환합니다. 이미 전환됐거나 다른 상태면 False."""
+        schema = await self._get_schema()
+        changed = await self._execute(*mark_uploaded_statement(schema, job_id))
+        self._router.pin(job_id)
+        return changed > 0
+
+    async def mark_processing(self, job_id: str) -> bool:
+        """PENDING/UPLOADED인 job을 PROCESSING으로 전환합니다 (워커 시작 알림). 이미 지난 상태면 False."""
+        schema = await self._get_schema()
+        changed = await self._execute(*mark_processing_statement(schema, job_id))
+        self._router.pin(job_id)
+        return changed > 0
+
+    async def list_stale_uploads(self, older_than_seconds: int, limit: int = 100) -> List[dict]:
+        """older_than_seconds 넘게 업로드 대기 중인 job 목록 (정리 직전 확인이므로 primary에서 조회)."""
+        schema = await self._get_schema()
+        rows = await self._fetch_all(*select_stale_uploads_statement(schema, older_than_seconds, limit))
+        return [row_to_stale_upload(r) for r in rows]
+
+    async def expire_upload(self, job_id: str) -> bool:
+        """업로드 대기 중인 job을 FAILED로 전환합니다. 그 사이 업로드가 끝났으면 False."""
+        schema = await self._get_schema()
+        changed = await self._execute(*expire_upload_statement(schema, job_id))
+        self._router.pin(job_id)
+        return changed > 0
+
+    def pool_stats(self) -> dict:
+        pool = self._pools.get(None)
+        if pool is None:
+            stats = dict(self._stats, size=DB_POOL_SIZE, open=0, idle=0, in_use=0)
+        else:
+            stats = dict(
+                self._stats,
+                size=pool.maxsize,
+                open=pool.size,
+                idle=pool.freesize,
+                in_use=pool.size - pool.freesize,
+            )
+        if self._replica_args:
+            stats["replicas"] = [
+                {"open": p.size, "idle": p.freesize} if p is not None else {"open": 0, "idle": 0}
+                for p in (self._pools.get(i) for i in range(len(self._replica_args)))
+            ]
+        return stats
+
+    def routing_stats(self) -> dict:
+        """primary/replica 라우팅 결정 횟수와 replica별 지연."""
+        return self._router.stats()
+
+    async def close(self) -> None:
+        if self._lag_task is not None:
+            self._lag_task.cancel()
+            try:
+                await self._lag_task
+            except asyncio.CancelledError:
+                pass
+            self._lag_task = None
+        metrics.unregister_source(self.metrics_name)
+        self._router.close()
+        pools, self._pools = list(self._pools.values()), {}
+        for pool in pools:
+            pool.close()
+            await pool.wait_closed()
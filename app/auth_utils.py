@@ -4,14 +4,18 @@
 
 import os
 import time
+import threading
 import requests
+from collections import OrderedDict
 from typing import Optional
 
-from jose import jwt, jwk
 from jose.exceptions import JWTError
-from jose.utils import base64url_decode
 from fastapi import Header, Cookie
 
+from app import metrics
+from app.token_cache import VerifiedTokenCache
+from app.jwt_verifiers import build_verifier, parse_token
+
 # 환경변수 로드
 COGNITO_REGION = os.getenv("COGNITO_REGION")
 COGNITO_USER_POOL_ID = os.getenv("COGNITO_USER_POOL_ID")
@@ -36,66 +40,160 @@ else:
 
 JWKS_URL = JWKS_URL_OVERRIDE or (f"{ISSUER}/.well-known/jwks.json" if ISSUER else None)
 
+# 검증된 토큰 캐시 (sha256(token) -> sub, exp까지 유효)
+_TOKEN_CACHE = VerifiedTokenCache()
+
 # JWKS 캐시
 _JWKS_CACHE: Optional[dict] = None
 _JWKS_CACHE_TS: float = 0
 _JWKS_TTL = 60 * 60  # 1시간
+# 서명 검증 백엔드 (JWT_VERIFIER_BACKEND: jose / jose-rsa / cryptography)
+_VERIFIER = build_verifier()
+# kid -> 검증 백엔드가 만든 공개키 객체. JWKS를 새로 받을 때마다 새 dict를 만든 뒤 통째로 교체하므로
+# 읽는 쪽은 lock 없이도 항상 완성된 맵(이전 것 또는 새 것)을 봄
+_JWKS_KEYS: dict = {}
+# 모르는 kid로 인한 강제 갱신 제한
+# - 동시에 여러 요청이 와도 조회는 한 번만 (나머지는 lock에서 기다렸다가 결과를 공유)
+# - 마지막 조회 후 JWKS_MIN_REFETCH_INTERVAL초 안에는 다시 조회하지 않음
+# - 조회 후에도 없던 kid는 JWKS_UNKNOWN_KID_TTL초 동안 바로 거부 (최대 JWKS_UNKNOWN_KID_MAX_ENTRIES개, LRU)
+JWKS_MIN_REFETCH_INTERVAL = int(os.getenv("JWKS_MIN_REFETCH_INTERVAL", "60"))
+JWKS_UNKNOWN_KID_TTL = int(os.getenv("JWKS_UNKNOWN_KID_TTL", "300"))
+JWKS_UNKNOWN_KID_MAX_ENTRIES = int(os.getenv("JWKS_UNKNOWN_KID_MAX_ENTRIES", "1000"))
+_JWKS_REFETCH_LOCK = threading.Lock()
+_JWKS_LAST_REFETCH: float = 0
+_UNKNOWN_KIDS: "OrderedDict[str, float]" = OrderedDict()  # kid -> 거부 유지 시각
+_UNKNOWN_KIDS_LOCK = threading.Lock()
+_KID_STATS = {"refetches": 0, "refetch_skipped": 0, "unknown_kid_rejects": 0}
+# app.jwks_refresher가 백그라운드에서 갱신 중이면 True -> 요청 경로는 TTL이 지나도 마지막으로 받은 키를 그대로 사용
+_JWKS_BACKGROUND_REFRESH = False
+
+def _build_key_map(jwks: dict) -> dict:
+    keys = {}
+    for k in jwks.get("keys", []):
+        kid = k.get("kid")
+        if not kid:
+            continue
+        try:
+            keys[kid] = _VERIFIER.load_key(k)
+        except Exception as e:
+            print(f"[auth_utils] JWKS 키 로드 실패 kid={kid}: {e}")
+    return keys
+
+def _install_jwks(jwks: dict) -> None:
+    """새로 받은 JWKS로 키 맵을 먼저 만든 뒤 교체합니다. (동기 조회와 백그라운드 갱신 공용)"""
+    global _JWKS_CACHE, _JWKS_CACHE_TS, _JWKS_KEYS
+    _JWKS_KEYS = _build_key_map(jwks)
+    _JWKS_CACHE = jwks
+    _JWKS_CACHE_TS = time.time()
+    # 새 키 세트에 들어온 kid는 더 이상 거부하면 안 됨
+    with _UNKNOWN_KIDS_LOCK:
+        _UNKNOWN_KIDS.clear()
+
+def _jwks_age() -> Optional[float]:
+    return time.time() - _JWKS_CACHE_TS if _JWKS_CACHE else None
 
 def _fetch_jwks(force: bool = False) -> dict:
-    global _JWKS_CACHE, _JWKS_CACHE_TS
     if not JWKS_URL:
         raise JWTError("JWKS URL 미설정: COGNITO_REGION/Cognito_USER_POOL_ID 또는 JWKS_URL 확인 필요")
-    if _JWKS_CACHE and (time.time() - _JWKS_CACHE_TS) < _JWKS_TTL and not force:
+    if _JWKS_CACHE and not force and (_JWKS_BACKGROUND_REFRESH or (time.time() - _JWKS_CACHE_TS) < _JWKS_TTL):
         return _JWKS_CACHE
     try:
         print(f"[auth_utils] JWKS 조회: {JWKS_URL}")
         r = requests.get(JWKS_URL, timeout=5)
         r.raise_for_status()
-        _JWKS_CACHE = r.json()
-        _JWKS_CACHE_TS = time.time()
+        _install_jwks(r.json())
         return _JWKS_CACHE
     except requests.exceptions.RequestException as e:
         if _JWKS_CACHE:
             return _JWKS_CACHE
         raise JWTError(f"JWKS 조회 실패: {e}") from e
 
-def _get_jwk_for_kid(kid: str) -> Optional[dict]:
-    jwks = _fetch_jwks()
-    for k in jwks.get("keys", []):
-        if k.get("kid") == kid:
-            return k
-    return None
+def _get_key_for_kid(kid: str):
+    _fetch_jwks()
+    return _JWKS_KEYS.get(kid)
+
+def _is_unknown_kid(kid: str) -> bool:
+    with _UNKNOWN_KIDS_LOCK:
+        until = _UNKNOWN_KIDS.get(kid)
+        if until is None:
+            return False
+        if until <= time.time():
+            del _UNKNOWN_KIDS[kid]
+            return False
+        _UNKNOWN_KIDS.move_to_end(kid)
+        return True
+
+def _remember_unknown_kid(kid: str, until: float) -> None:
+    if JWKS_UNKNOWN_KID_MAX_ENTRIES <= 0:
+        return
+    with _UNKNOWN_KIDS_LOCK:
+        _UNKNOWN_KIDS[kid] = until
+        _UNKNOWN_KIDS.move_to_end(kid)
+        while len(_UNKNOWN_KIDS) > JWKS_UNKNOWN_KID_MAX_ENTRIES:
+            _UNKNOWN_KIDS.popitem(last=False)
+
+def _refetch_key_for_kid(kid: str):
+    """
+    캐시에 없는 kid: 키 교체(rotation) 직후일 수 있으므로 JWKS를 다시 받아 봅니다.
+    single-flight + 최소 간격 + 음성 캐시로, 임의의 kid를 뿌리는 요청이 Cognito 조회를 반복시키지 못하게 함.
+    """
+    global _JWKS_LAST_REFETCH
+    if _is_unknown_kid(kid):
+        _KID_STATS["unknown_kid_rejects"] += 1
+        return None
+    with _JWKS_REFETCH_LOCK:
+        # 기다리는 동안 다른 요청(또는 백그라운드 갱신)이 이미 받아 왔을 수 있음
+        public_key = _JWKS_KEYS.get(kid)
+        if public_key is not None:
+            return public_key
+        next_refetch = max(_JWKS_LAST_REFETCH, _JWKS_CACHE_TS) + JWKS_MIN_REFETCH_INTERVAL
+        if time.time() < next_refetch:
+            # 조회하지 않았으므로 정말 없는 kid인지 모름 -> 다음 조회가 허용되는 시각까지만 거부
+            # (키 교체 직후의 정상 토큰이 JWKS_UNKNOWN_KID_TTL 동안 막히지 않도록)
+            _KID_STATS["refetch_skipped"] += 1
+            _remember_unknown_kid(kid, next_refetch)
+            return None
+        _JWKS_LAST_REFETCH = time.time()
+        _KID_STATS["refetches"] += 1
+        installed_ts = _JWKS_CACHE_TS
+        _fetch_jwks(force=True)
+        public_key = _JWKS_KEYS.get(kid)
+        if public_key is None:
+            if _JWKS_CACHE_TS != installed_ts:
+                # 방금 받은 키 세트에도 없음 -> JWKS_UNKNOWN_KID_TTL 동안 바로 거부
+                _remember_unknown_kid(kid, time.time() + JWKS_UNKNOWN_KID_TTL)
+            else:
+                # 조회 실패로 이전 키 세트를 그대로 쓰는 중 -> 다음 조회 허용 시각까지만
+                _remember_unknown_kid(kid, _JWKS_LAST_REFETCH + JWKS_MIN_REFETCH_INTERVAL)
+        return public_key
+
+def _kid_stats() -> dict:
+    with _UNKNOWN_KIDS_LOCK:
+        return dict(_KID_STATS, unknown_kids=len(_UNKNOWN_KIDS))
+
+metrics.register_source("jwks_kids", _kid_stats)
 
 def _verify_signature(token: str) -> dict:
-    try:
-        header = jwt.get_unverified_header(token)
-    except Exception as e:
-        raise JWTError("잘못된 토큰 헤더") from e
+    # 토큰은 여기서 한 번만 분해하고 검증된 claims를 그대로 반환
+    parsed = parse_token(token)
 
-    kid = header.get("kid")
+    kid = parsed.header.get("kid")
     if not kid:
         raise JWTError("토큰 헤더에 kid가 없습니다.")
 
-    jwk_dict = _get_jwk_for_kid(kid)
-    if not jwk_dict:
-        # 강제 갱신 시도
-        jwk_dict = _fetch_jwks(force=True).get("keys", [])
-        jwk_dict = next((k for k in jwk_dict if k.get("kid") == kid), None)
-        if not jwk_dict:
+    public_key = _get_key_for_kid(kid)
+    if public_key is None:
+        public_key = _refetch_key_for_kid(kid)
+        if public_key is None:
             raise JWTError("JWKS에서 해당 kid를 찾을 수 없습니다.")
 
-    public_key = jwk.construct(jwk_dict)
     try:
-        message = token.rsplit(".", 1)[0]
-        encoded_sig = token.rsplit(".", 1)[1]
-        decoded_sig = base64url_decode(encoded_sig.encode("utf-8"))
-        if not public_key.verify(message.encode("utf-8"), decoded_sig):
-            raise JWTError("서명 검증 실패")
+        ok = _VERIFIER.verify(public_key, parsed)
     except Exception as e:
         raise JWTError("서명 검증 실패") from e
-
-    claims = jwt.get_unverified_claims(token)
-    return claims
+    if not ok:
+        raise JWTError("서명 검증 실패")
+    return parsed.claims
 
 def _validate_claims(claims: dict, audiences: Optional[list] = None) -> None:
     now = int(time.time())
@@ -143,6 +241,23 @@ def _validate_claims(claims: dict, audiences: Optional[list] = None) -> None:
         if audiences and aud and (not _audience_matches(aud)):
             raise JWTError(f"aud 검증 실패 (unknown token_use) aud={aud} allowed={audiences}")
 
+def _resolve_user_id(token: str) -> str:
+    """
+    토큰을 검증하고 sub를 반환합니다. 실패 시 JWTError.
+    한 번 검증된 토큰은 exp까지 캐시에서 바로 sub를 반환합니다.
+    """
+    user_id = _TOKEN_CACHE.get(token)
+    if user_id:
+        return user_id
+    claims = _verify_signature(token)
+    # audience 검증은 token_use에 따라 유동적으로 수행
+    _validate_claims(claims, audiences=ALLOWED_CLIENT_IDS if ALLOWED_CLIENT_IDS else None)
+    user_id = claims.get("sub")
+    if not user_id:
+        raise JWTError("토큰에 sub가 없습니다.")
+    _TOKEN_CACHE.set(token, user_id, claims["exp"])
+    return user_id
+
 def get_current_user_id(
     Authorization: Optional[str] = Header(None, alias="Authorization"),
     access_token_cookie: Optional[str] = Cookie(None, alias="access_token"),
@@ -164,13 +279,7 @@ def get_current_user_id(
         return None
 
     try:
-        claims = _verify_signature(token)
-        # audience 검증은 token_use에 따라 유동적으로 수행
-        _validate_claims(claims, audiences=ALLOWED_CLIENT_IDS if ALLOWED_CLIENT_IDS else None)
-        user_id = claims.get("sub")
-        if not user_id:
-            raise JWTError("토큰에 sub가 없습니다.")
-        return user_id
+        return _resolve_user_id(token)
     except JWTError as e:
         print(f"JWT 검증 실패: {e} (source={source})")
         return None
@@ -186,9 +295,7 @@ def get_user_id_from_token(token: Optional[str]) -> Optional[str]:
     if token.startswith("Bearer "):
         token = token.split(" ", 1)[1]
     try:
-        claims = _verify_signature(token)
-        _validate_claims(claims, audiences=ALLOWED_CLIENT_IDS if ALLOWED_CLIENT_IDS else None)
-        return claims.get("sub")
+        return _resolve_user_id(token)
     except JWTError as e:
         print(f"JWT 검증 실패 (token helper): {e}")
         return None
\ No newline at end of file
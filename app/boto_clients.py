@@ -0,0 +1,65 @@
+# app/boto_clients.py
+
+# 프로세스 전역 boto3 클라이언트 레지스트리
+# - boto3 클라이언트 생성은 수십 ms + 서비스 모델(JSON) 로드로 수 MB를 사용하므로
+#   (service, region, 자격 증명, 설정)마다 하나만 만들고 재사용
+# - boto3 클라이언트는 스레드 안전하지만 Session은 아니므로, 생성은 lock 안에서 공유 Session으로 수행
+# - main.py lifespan에서 S3Client.warm_up()을 호출해 모델 로드를 첫 요청이 아닌 시작 시점에 끝냄
+
+import threading
+from typing import Optional
+
+import boto3
+from botocore.config import Config
+
+from app import metrics
+
+_session: Optional[boto3.session.Session] = None
+_clients: dict = {}
+_lock = threading.Lock()
+
+
+def get_client(
+    service: str,
+    region: Optional[str] = None,
+    aws_access_key_id: Optional[str] = None,
+    aws_secret_access_key: Optional[str] = None,
+    signature_version: Optional[str] = None,
+    addressing_style: Optional[str] = None,
+    endpoint_url: Optional[str] = None,
+):
+    """같은 인자로 호출하면 항상 같은 클라이언트를 반환합니다."""
+    global _session
+    key = (service, region, aws_access_key_id, aws_secret_access_key, signature_version, addressing_style, endpoint_url)
+    client = _clients.get(key)
+    if client is not None:
+        return client
+    with _lock:
+        client = _clients.get(key)
+        if client is None:
+            if _session is None:
+                _session = boto3.session.Session()
+            config_args = {}
+            if signature_version:
+                config_args["signature_version"] = signature_version
+            if addressing_style:
+                config_args["s3"] = {"addressing_style": addressing_style}
+            client = _session.client(
+                service,
+                region_name=region,
+                aws_access_key_id=aws_access_key_id,
+                aws_secret_access_key=aws_secret_access_key,
+                endpoint_url=endpoint_url,
+                config=Config(**config_args) if config_args else None,
+            )
+            _clients[key] = client
+        return client
+
+
+def stats() -> dict:
+    with _lock:
+        return {"clients": len(_clients), "services": sorted({key[0] for key in _clients})}
+
+
+# 설정 조합이 늘어 클라이언트가 의도치 않게 여러 개 생기지 않았는지 /api/metrics로 확인
+metrics.register_source("boto_clients", stats)
@@ -1,39 +1,35 @@
 # backend-api/db_client.py
 
 # MariaDB 드라이버 사용해 db 연결, 업로드 레코드 삽입
+# 동기 클라이언트: 스크립트/마이그레이션 등 이벤트 루프 밖에서 사용.
+# FastAPI 엔드포인트는 app.async_db_client.AsyncDBClient를 사용합니다.
 
-import os
-import mysql.connector # 예시: MariaDB/MySQL 커넥터 사용 가정
-from typing import Optional
-from uuid import uuid4
+from typing import Dict, List, Optional, Tuple
+
+from app.db_pool import ConnectionPool
+from app.db_routing import DB_REPLICA_DSNS, DB_REPLICA_STATUS_QUERY, ReplicaRouter, parse_dsn, lag_from_status
+from app.db_common import (
+    DB_HOST, DB_NAME, DB_USER, DB_PASSWORD, DB_SSL_CA,
+    validate_db_config, db_port, SchemaInfo, schema_columns_statement, schema_from_rows,
+    UploadIntent, insert_upload_intent_statement, insert_upload_intents_statement, update_status_statement,
+    select_upload_record_statement, select_upload_records_statement, row_to_upload_record,
+    list_user_jobs_statement, row_to_job_summary, select_job_owner_statement,
+    insert_multipart_upload_intent_statement, select_multipart_upload_statement,
+    row_to_multipart_upload, update_multipart_state_statement,
+    select_upload_intent_statement, row_to_upload_intent, mark_uploaded_statement, mark_processing_statement,
+    select_stale_uploads_statement, row_to_stale_upload, expire_upload_statement,
+)
 
-# .env에서 DB 정보 로드
-DB_HOST = os.getenv("DB_HOST")
-DB_PORT = os.getenv("DB_PORT")
-DB_NAME = os.getenv("DB_NAME")
-DB_USER = os.getenv("DB_USER")
-DB_PASSWORD = os.getenv("DB_PASSWORD")
-DB_TABLE_NAME = os.getenv("DB_TABLE_NAME")
-DB_SSL_CA = os.getenv("DB_SSL_CA")  # optional path to RDS CA bundle for SSL connections
 
 class DBClient:
     def __init__(self):
         try:
             # Validate basic config
-            if not DB_HOST:
-                raise RuntimeError("DB_HOST is not configured")
-            if not DB_USER:
-                raise RuntimeError("DB_USER is not configured")
-
-            # Ensure port is an int and default to 3306
-            try:
-                port_val = int(DB_PORT) if DB_PORT else 3306
-            except Exception:
-                port_val = 3306
+            validate_db_config()
 
             conn_args = {
                 'host': DB_HOST,
-                'port': port_val,
+                'port': db_port(),
                 'database': DB_NAME,
                 'user': DB_USER,
                 'password': DB_PASSWORD,
@@ -43,209 +39,259 @@ class DBClient:
             if DB_SSL_CA:
                 conn_args['ssl_ca'] = DB_SSL_CA
 
-            self.conn = mysql.connector.connect(**conn_args)
+            # 단일 연결 대신 풀 사용: 각 메서드가 작업 단위로 연결을 빌리고 반납
+            self._pool = ConnectionPool(conn_args, name="db_pool.primary")
+            # 읽기 전용 replica 풀 (DB_REPLICA_DSNS). 계정/DB명이 DSN에 없으면 primary 설정을 사용
+            self._replicas = []
+            for i, dsn in enumerate(DB_REPLICA_DSNS):
+                replica_args = dict(conn_args, **{k: v for k, v in parse_dsn(dsn).items() if v is not None})
+                self._replicas.append(ConnectionPool(replica_args, name=f"db_pool.replica{i}"))
+            self._router = ReplicaRouter(len(self._replicas))
+            # 테이블 컬럼 목록: 첫 사용 시 조회해 캐시 (refresh_schema()로 갱신)
+            self._schema: Optional[SchemaInfo] = None
+            # 기존과 동일하게 설정 오류는 생성 시점에 드러나도록 연결 하나를 미리 열어 둠
+            self._pool.prewarm(1)
         except Exception as e:
             print(f"DB 연결 실패: {e}")
             raise
 
+    # ------------------------------------------------------------------
+    # 실행 헬퍼: 작업 하나마다 풀에서 연결을 빌려 실행 후 반납
+    # ------------------------------------------------------------------
+    def _execute(self, sql: str, params: tuple) -> int:
+        with self._pool.connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute(sql, params)
+                rowcount = cursor.rowcount
+            conn.commit()
+        return rowcount
+
+    def _fetch_one(self, sql: str, params: tuple, pool: Optional[ConnectionPool] = None):
+        with (pool or self._pool).connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute(sql, params)
+                return cursor.fetchone()
+
+    def _fetch_all(self, sql: str, params: tuple, pool: Optional[ConnectionPool] = None) -> list:
+        with (pool or self._pool).connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute(sql, params)
+                return cursor.fetchall()
+
+    # ------------------------------------------------------------------
+    # 읽기 라우팅: replica 우선, 최근 쓰기로 pin된 키나 replica 오류 시 primary
+    # ------------------------------------------------------------------
+    def _read(self, fetch, sql: str, params: tuple, *keys: Optional[str]):
+        if self._router.lag_check_due():
+            self.check_replica_lag()
+        idx = self._router.choose(*keys)
+        if idx is not None:
+            try:
+                return fetch(sql, params, self._replicas[idx])
+            except Exception as e:
+                self._router.record_failure(idx, e)
+                self._router.record_primary_read()
+        elif not self._router.enabled:
+            self._router.record_primary_read()
+        return fetch(sql, params, self._pool)
+
+    def check_replica_lag(self) -> None:
+        """각 replica의 복제 지연을 조회해 라우팅 대상 여부를 갱신합니다 (REPLICATION CLIENT 권한 필요)."""
+        self._router.mark_lag_checked()
+        for idx, pool in enumerate(self._replicas):
+            try:
+                with pool.connection() as conn:
+                    with conn.cursor() as cursor:
+                        cursor.execute(DB_REPLICA_STATUS_QUERY)
+                        row = cursor.fetchone()
+                        columns = [d[0] for d in cursor.description or []]
+                self._router.record_lag(idx, lag_from_status(columns, row))
+            except Exception as e:
+                print(f"[DB Routing] replica#{idx} lag check failed: {e}")
+                self._router.record_lag(idx, None)
+
+    # ------------------------------------------------------------------
+    # 스키마 감지: 선택 컬럼 유무를 한 번만 확인하고 캐시
+    # ------------------------------------------------------------------
+    def refresh_schema(self) -> SchemaInfo:
+        """information_schema에서 테이블 컬럼을 다시 읽습니다 (라이브 마이그레이션 직후 호출)."""
+        self._schema = schema_from_rows(self._fetch_all(*schema_columns_statement()))
+        return self._schema
+
+    def _get_schema(self) -> SchemaInfo:
+        schema = self._schema
+        if schema is None or schema.is_stale():
+            schema = self.refresh_schema()
+        return schema
+
     def insert_upload_intent(
-        self, 
+        self,
         job_id: str,    # job id를 외부에서 받아옴, websocket.py에서
         user_id: Optional[str],
-        non_member_identifier: Optional[str], 
-        upload_source: str,                   
-        s3_key: str, 
-        filename: str, 
-        filetype: str, 
-        file_size_bytes: int,     
-        s3_result_path: Optional[str] = None    # 초기 result는 당연히 None
+        non_member_identifier: Optional[str],
+        upload_source: str,
+        s3_key: str,
+        filename: str,
+        filetype: str,
+        file_size_bytes: int,
+        s3_result_path: Optional[str] = None,    # 초기 result는 당연히 None
+        status: str = "PENDING",    # 초기 상태를 INSERT에 바로 기록 (별도 update 왕복 없음)
+        s3_key_layout: Optional[str] = None,    # S3 키 레이아웃 버전 (v1/v2)
     ) -> str:
         """업로드 의도 레코드를 DB에 삽입하고, 생성된 UUID를 반환합니다."""
-        
-        upload_id = job_id  # 외부에서 받아온 job_id 사용
-
-        sql = f"""
-            INSERT INTO {DB_TABLE_NAME} (
-                id, user_id, non_member_identifier, upload_source, 
-                s3_key, original_filename, file_type, file_size_bytes, 
-                processing_status, s3_result_path
-            ) VALUES (
-                %s, %s, %s, %s, %s, %s, %s, %s, 'PENDING', %s
-            )
-        """
-        params = (
-            upload_id, # job_id 사용
-            user_id, 
-            non_member_identifier, 
-            upload_source,
-            s3_key, 
-            filename, 
-            filetype, 
-            file_size_bytes,
-            s3_result_path
+        sql, params = insert_upload_intent_statement(
+            self._get_schema(), job_id, user_id, non_member_identifier, upload_source,
+            s3_key, filename, filetype, file_size_bytes, s3_result_path, status, s3_key_layout,
         )
+        self._execute(sql, params)
+        self._router.pin(job_id, user_id)
+        return job_id  # 외부에서 받아온 job_id 사용
+
+    def insert_upload_intents(self, intents: List[UploadIntent], status: str = "PENDING") -> List[str]:
+        """
+        여러 업로드 intent(UploadIntent)를 multi-row INSERT 한 번으로 삽입하고 job_id 목록을 반환합니다.
+        한 문장이므로 전부 삽입되거나 전부 실패합니다.
+        """
+        if not intents:
+            return []
+        self._execute(*insert_upload_intents_statement(self._get_schema(), intents, status))
+        self._router.pin(*{i.job_id for i in intents}, *{i.user_id for i in intents})
+        return [i.job_id for i in intents]
 
-        with self.conn.cursor() as cursor:
-            cursor.execute(sql, params)
-        self.conn.commit()
-        return upload_id
-    
     def update_upload_status(self, job_id: str, status: str, s3_result_path: Optional[str] = None) -> None:
         """
         job_id 레코드의 processing_status와 s3_result_path를 갱신합니다.
+        s3_result_path 컬럼이 없는 스키마라면 상태만 갱신합니다.
         """
-        if not DB_TABLE_NAME:
-            raise RuntimeError("DB_TABLE_NAME not configured")
-        # Extended: allow optional s3_result_path and s3_result_paths (JSON string or list)
-        # Try to update both columns if provided; fall back gracefully if the column does not exist.
-        try:
-            if s3_result_path is not None:
-                sql = f"""
-                    UPDATE {DB_TABLE_NAME}
-                    SET processing_status = %s, s3_result_path = %s
-                    WHERE id = %s
-                """
-                params = (status, s3_result_path, job_id)
-            else:
-                sql = f"""
-                    UPDATE {DB_TABLE_NAME}
-                    SET processing_status = %s
-                    WHERE id = %s
-                """
-                params = (status, job_id)
-
-            with self.conn.cursor() as cursor:
-                cursor.execute(sql, params)
-            self.conn.commit()
-        except Exception:
-            # If the simple update failed (e.g., missing column), attempt a more conservative update
-            try:
-                sql = f"""
-                    UPDATE {DB_TABLE_NAME}
-                    SET processing_status = %s
-                    WHERE id = %s
-                """
-                params = (status, job_id)
-                with self.conn.cursor() as cursor:
-                    cursor.execute(sql, params)
-                self.conn.commit()
-            except Exception as e:
-                print(f"[DB Update Error - fallback] job_id={job_id} error={e}")
-                raise
+        self._execute(*update_status_statement(self._get_schema(), job_id, status, s3_result_path))
+        self._router.pin(job_id)
 
     def update_upload_status_with_paths(self, job_id: str, status: str, s3_result_path: Optional[str] = None, s3_result_paths: Optional[str] = None) -> None:
         """
-        Try to update processing_status, s3_result_path and s3_result_paths (JSON) if available.
-        s3_result_paths may be a JSON-encoded string or None. This method will attempt to write
-        the additional column but will silently fall back to updating only processing_status and
-        s3_result_path if the s3_result_paths column is not present in the DB schema.
+        Update processing_status, s3_result_path and s3_result_paths (JSON) in a single statement.
+        s3_result_paths may be a JSON-encoded string or None. Columns missing from the cached
+        schema are left out of the statement up front instead of retrying after a failure.
         """
-        if not DB_TABLE_NAME:
-            raise RuntimeError("DB_TABLE_NAME not configured")
-
-        # Prefer single SQL write including s3_result_paths if provided
-        try:
-            if s3_result_paths is not None and s3_result_path is not None:
-                sql = f"""
-                    UPDATE {DB_TABLE_NAME}
-                    SET processing_status = %s, s3_result_path = %s, s3_result_paths = %s
-                    WHERE id = %s
-                """
-                params = (status, s3_result_path, s3_result_paths, job_id)
-            elif s3_result_paths is not None:
-                sql = f"""
-                    UPDATE {DB_TABLE_NAME}
-                    SET processing_status = %s, s3_result_paths = %s
-                    WHERE id = %s
-                """
-                params = (status, s3_result_paths, job_id)
-            elif s3_result_path is not None:
-                sql = f"""
-                    UPDATE {DB_TABLE_NAME}
-                    SET processing_status = %s, s3_result_path = %s
-                    WHERE id = %s
-                """
-                params = (status, s3_result_path, job_id)
-            else:
-                sql = f"""
-                    UPDATE {DB_TABLE_NAME}
-                    SET processing_status = %s
-                    WHERE id = %s
-                """
-                params = (status, job_id)
-
-            with self.conn.cursor() as cursor:
-                cursor.execute(sql, params)
-            self.conn.commit()
-        except Exception:
-            # Fallback: try to update at least the basic status and s3_result_path
-            try:
-                sql = f"""
-                    UPDATE {DB_TABLE_NAME}
-                    SET processing_status = %s, s3_result_path = %s
-                    WHERE id = %s
-                """
-                params = (status, s3_result_path, job_id)
-                with self.conn.cursor() as cursor:
-                    cursor.execute(sql, params)
-                self.conn.commit()
-            except Exception as e:
-                print(f"[DB Update Error - fallback2] job_id={job_id} error={e}")
-                raise
+        self._execute(*update_status_statement(self._get_schema(), job_id, status, s3_result_path, s3_result_paths))
+        self._router.pin(job_id)
 
     def get_upload_record(self, job_id: str) -> Optional[dict]:
         """
         Return a dictionary with upload record fields used by the API.
-        Tries to include s3_result_paths if the column exists; otherwise returns basic fields.
+        Includes s3_result_paths if the column exists; otherwise it is None.
         """
-        if not DB_TABLE_NAME:
-            raise RuntimeError("DB_TABLE_NAME not configured")
+        schema = self._get_schema()
+        row = self._read(self._fetch_one, *select_upload_record_statement(schema, job_id), job_id)
+        return row_to_upload_record(schema, row)
 
-        # Attempt to select s3_result_paths; if that fails, fall back to fewer columns
-        try:
-            sql = f"SELECT id, user_id, processing_status, s3_result_path, s3_result_paths FROM {DB_TABLE_NAME} WHERE id = %s LIMIT 1"
-            with self.conn.cursor() as cursor:
-                cursor.execute(sql, (job_id,))
-                row = cursor.fetchone()
-                if not row:
-                    return None
-                return {
-                    "job_id": row[0],
-                    "user_id": row[1],
-                    "status": row[2],
-                    "s3_result_path": row[3],
-                    "s3_result_paths": row[4],
-                }
-        except Exception:
-            # Fallback to select without s3_result_paths
-            try:
-                sql = f"SELECT id, user_id, processing_status, s3_result_path FROM {DB_TABLE_NAME} WHERE id = %s LIMIT 1"
-                with self.conn.cursor() as cursor:
-                    cursor.execute(sql, (job_id,))
-                    row = cursor.fetchone()
-                    if not row:
-                        return None
-                    return {
-                        "job_id": row[0],
-                        "user_id": row[1],
-                        "status": row[2],
-                        "s3_result_path": row[3],
-                        "s3_result_paths": None,
-                    }
-            except Exception as e:
-                print(f"[DB Select Error] job_id={job_id} error={e}")
-                raise
+    def get_upload_records(self, job_ids: List[str]) -> Dict[str, dict]:
+        """
+        여러 job 레코드를 WHERE id IN (...) 한 번으로 조회해 {job_id: record}로 반환합니다.
+        존재하지 않는 job_id는 결과에 포함되지 않습니다.
+        """
+        if not job_ids:
+            return {}
+        schema = self._get_schema()
+        rows = self._read(self._fetch_all, *select_upload_records_statement(schema, job_ids), *job_ids)
+        records = (row_to_upload_record(schema, row) for row in rows)
+        return {rec["job_id"]: rec for rec in records}
+
+    def list_user_jobs(
+        self,
+        user_id: str,
+        limit: int = 20,
+        before: Optional[Tuple[object, str]] = None,
+        status: Optional[str] = None,
+    ) -> List[dict]:
+        """
+        user_id의 job 목록을 최신순(created_at DESC, id DESC)으로 최대 limit개 반환합니다.
+        before=(created_at, job_id)는 직전 페이지 마지막 항목(keyset 커서)입니다.
+        """
+        schema = self._get_schema()
+        rows = self._read(self._fetch_all, *list_user_jobs_statement(schema, user_id, limit, before, status), user_id)
+        return [row_to_job_summary(schema, row) for row in rows]
 
     def get_job_owner(self, job_id: str) -> Optional[str]:
         """
         Return the user_id (owner) for a given job_id. Returns None if not found.
         """
-        if not DB_TABLE_NAME:
-            raise RuntimeError("DB_TABLE_NAME not configured")
-        sql = f"SELECT user_id FROM {DB_TABLE_NAME} WHERE id = %s LIMIT 1"
-        with self.conn.cursor() as cursor:
-            cursor.execute(sql, (job_id,))
-            row = cursor.fetchone()
-            if not row:
-                return None
-            return row[0]
\ No newline at end of file
+        row = self._read(self._fetch_one, *select_job_owner_statement(job_id), job_id)
+        if not row:
+            return None
+        return row[0]
+
+    def insert_multipart_upload_intent(
+        self,
+        intent: UploadIntent,
+        upload_id: str,
+        part_size: int,
+        part_count: int,
+        status: str = "PENDING",
+    ) -> str:
+        """멀티파트 업로드 intent(UploadId, 파트 크기/개수 포함)를 한 문장으로 삽입하고 job_id를 반환합니다."""
+        sql, params = insert_multipart_upload_intent_statement(
+            self._get_schema(), intent, status, upload_id, part_size, part_count,
+        )
+        self._execute(sql, params)
+        self._router.pin(intent.job_id, intent.user_id)
+        return intent.job_id
+
+    def get_multipart_upload(self, job_id: str) -> Optional[dict]:
+        """job의 멀티파트 업로드 정보를 반환합니다. 없는 job이거나 단일 PUT 업로드면 None."""
+        row = self._read(self._fetch_one, *select_multipart_upload_statement(self._get_schema(), job_id), job_id)
+        return row_to_multipart_upload(row)
+
+    def update_multipart_state(self, job_id: str, state: str, status: Optional[str] = None) -> bool:
+        """INITIATED 상태의 멀티파트 업로드를 state로 전환합니다. 이미 전환된 경우 False."""
+        changed = self._execute(*update_multipart_state_statement(self._get_schema(), job_id, state, status))
+        self._router.pin(job_id)
+        return changed > 0
+
+    def get_upload_intent(self, job_id: str) -> Optional[dict]:
+        """업로드 검증용 필드(s3_key, file_type, file_size_bytes, status 등)를 반환합니다."""
+        return row_to_upload_intent(self._read(self._fetch_one, *select_upload_intent_statement("id", job_id), job_id))
+
+    def get_upload_intent_by_key(self, s3_key: str) -> Optional[dict]:
+        """S3 객체 키로 업로드 job을 찾습니다 (S3 이벤트 처리용, 쓰기 직후일 수 있으므로 primary에서 조회)."""
+        return row_to_upload_intent(self._fetch_one(*select_upload_intent_statement("s3_key", s3_key)))
+
+    def mark_uploaded(self, job_id: str) -> bool:
+        """업로드 대기 중인 job을 UPLOADED로 전환합니다. 이미 전환됐거나 다른 상태면 False."""
+        changed = self._execute(*mark_uploaded_statement(self._get_schema(), job_id))
+        self._router.pin(job_id)
+        return changed > 0
+
+    def mark_processing(self, job_id: str) -> bool:
+        """PENDING/UPLOADED인 job을 PROCESSING으로 전환합니다 (워커 시작 알림). 이미 지난 상태면 False."""
+        changed = self._execute(*mark_processing_statement(self._get_schema(), job_id))
+        self._router.pin(job_id)
+        return changed > 0
+
+    def list_stale_uploads(self, older_than_seconds: int, limit: int = 100) -> List[dict]:
+        """older_than_seconds 넘게 업로드 대기 중인 job 목록 (정리 직전 확인이므로 primary에서 조회)."""
+        rows = self._fetch_all(*select_stale_uploads_statement(self._get_schema(), older_than_seconds, limit))
+        return [row_to_stale_upload(r) for r in rows]
+
+    def expire_upload(self, job_id: str) -> bool:
+        """업로드 대기 중인 job을 FAILED로 전환합니다. 그 사이 업로드가 끝났으면 False."""
+        changed = self._execute(*expire_upload_statement(self._get_schema(), job_id))
+        self._router.pin(job_id)
+        return changed > 0
+
+    def connection(self):
+        """풀에서 연결 하나를 빌려주는 context manager (마이그레이션 등 스크립트용)."""
+        return self._pool.connection()
+
+    def pool_stats(self) -> dict:
+        """연결 풀 통계 (크기, 사용 중/유휴, 고갈 대기/타임아웃 횟수 등)."""
+        return self._pool.stats()
+
+    def routing_stats(self) -> dict:
+        """primary/replica 라우팅 결정 횟수와 replica별 지연."""
+        return self._router.stats()
+
+    def close(self) -> None:
+        self._pool.close()
+        for pool in self._replicas:
+            pool.close()
+        self._router.close()
@@ -0,0 +1,435 @@
+# app/db_common.py
+
+# 동기(DBClient) / 비동기(AsyncDBClient) 클라이언트가 공유하는 DB 설정과 SQL 빌더
+# 각 빌더는 (sql, params)를 반환하고, 실행은 각 클라이언트가 자신의 풀로 수행합니다.
+
+import os
+import time
+from collections import namedtuple
+from typing import Iterable, List, Optional, Tuple
+
+# .env에서 DB 정보 로드
+DB_HOST = os.getenv("DB_HOST")
+DB_PORT = os.getenv("DB_PORT")
+DB_NAME = os.getenv("DB_NAME")
+DB_USER = os.getenv("DB_USER")
+DB_PASSWORD = os.getenv("DB_PASSWORD")
+DB_TABLE_NAME = os.getenv("DB_TABLE_NAME")
+DB_SSL_CA = os.getenv("DB_SSL_CA")  # optional path to RDS CA bundle for SSL connections
+# 스키마(컬럼 목록) 캐시 유효 시간(초). 0이면 최초 1회만 조회하고 refresh_schema()로만 갱신
+try:
+    DB_SCHEMA_TTL = int(os.getenv("DB_SCHEMA_TTL", "0"))
+except ValueError:
+    DB_SCHEMA_TTL = 0
+
+Statement = Tuple[str, tuple]
+
+
+def validate_db_config() -> None:
+    if not DB_HOST:
+        raise RuntimeError("DB_HOST is not configured")
+    if not DB_USER:
+        raise RuntimeError("DB_USER is not configured")
+
+
+def db_port() -> int:
+    # Ensure port is an int and default to 3306
+    try:
+        return int(DB_PORT) if DB_PORT else 3306
+    except Exception:
+        return 3306
+
+
+def _table() -> str:
+    if not DB_TABLE_NAME:
+        raise RuntimeError("DB_TABLE_NAME not configured")
+    return DB_TABLE_NAME
+
+
+class SchemaInfo:
+    """
+    업로드 테이블에 실제로 존재하는 컬럼 목록.
+    information_schema를 한 번 조회해 캐시하고, 선택 컬럼(s3_result_paths 등)의 유무에 맞는
+    SQL을 처음부터 만들어 '실패 후 재시도' 왕복을 없앱니다.
+    """
+
+    def __init__(self, columns: Iterable[str]):
+        self.columns = frozenset(c.lower() for c in columns)
+        self.loaded_at = time.monotonic()
+
+    def has(self, column: str) -> bool:
+        return column.lower() in self.columns
+
+    def is_stale(self) -> bool:
+        return DB_SCHEMA_TTL > 0 and time.monotonic() - self.loaded_at >= DB_SCHEMA_TTL
+
+
+def schema_columns_statement() -> Statement:
+    sql = (
+        "SELECT COLUMN_NAME FROM information_schema.COLUMNS "
+        "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s"
+    )
+    return sql, (_table(),)
+
+
+def schema_from_rows(rows) -> SchemaInfo:
+    columns = [r[0] for r in rows or []]
+    if not columns:
+        raise RuntimeError(f"table {DB_TABLE_NAME} not found (or has no visible columns)")
+    return SchemaInfo(columns)
+
+
+# 업로드 intent 한 건 (insert_upload_intents_statement의 행 단위)
+UploadIntent = namedtuple(
+    "UploadIntent",
+    [
+        "job_id", "user_id", "non_member_identifier", "upload_source",
+        "s3_key", "filename", "filetype", "file_size_bytes", "s3_result_path",
+        "s3_key_layout",
+    ],
+    defaults=(None, None),
+)
+
+_INTENT_COLUMNS = (
+    "id", "user_id", "non_member_identifier", "upload_source",
+    "s3_key", "original_filename", "file_type", "file_size_bytes",
+    "processing_status", "s3_result_path",
+)
+
+
+def _insert_intents_statement(
+    schema: SchemaInfo,
+    intents: List[UploadIntent],
+    status: str,
+    extra_columns: Tuple[str, ...] = (),
+    extra_values: tuple = (),
+) -> Statement:
+    columns = list(_INTENT_COLUMNS)
+    # s3_key_layout 컬럼(마이그레이션 0006)이 없으면 레이아웃은 기록하지 않음
+    with_layout = schema.has("s3_key_layout")
+    if with_layout:
+        columns.append("s3_key_layout")
+    columns.extend(extra_columns)
+    row = "(" + ", ".join(["%s"] * len(columns)) + ")"
+    sql = f"""
+        INSERT INTO {_table()} (
+            {", ".join(columns)}
+        ) VALUES {", ".join([row] * len(intents))}
+    """
+    params = []
+    for i in intents:
+        params.extend((
+            i.job_id,
+            i.user_id,
+            i.non_member_identifier,
+            i.upload_source,
+            i.s3_key,
+            i.filename,
+            i.filetype,
+            i.file_size_bytes,
+            status,
+            i.s3_result_path,
+        ))
+        if with_layout:
+            params.append(i.s3_key_layout)
+        params.extend(extra_values)
+    return sql, tuple(params)
+
+
+def insert_upload_intents_statement(schema: SchemaInfo, intents: List[UploadIntent], status: str = "PENDING") -> Statement:
+    """
+    여러 업로드 intent를 하나의 multi-row INSERT로 만듭니다.
+    초기 상태(status)를 INSERT에 바로 넣으므로 insert 후 상태 update 왕복이 필요 없고,
+    단일 문장이라 전부 들어가거나 전부 실패합니다.
+    """
+    if not intents:
+        raise ValueError("intents must not be empty")
+    return _insert_intents_statement(schema, intents, status)
+
+
+def insert_upload_intent_statement(
+    schema: SchemaInfo,
+    job_id: str,
+    user_id: Optional[str],
+    non_member_identifier: Optional[str],
+    upload_source: str,
+    s3_key: str,
+    filename: str,
+    filetype: str,
+    file_size_bytes: int,
+    s3_result_path: Optional[str] = None,
+    status: str = "PENDING",
+    s3_key_layout: Optional[str] = None,
+) -> Statement:
+    return insert_upload_intents_statement(schema, [UploadIntent(
+        job_id, user_id, non_member_identifier, upload_source,
+        s3_key, filename, filetype, file_size_bytes, s3_result_path, s3_key_layout,
+    )], status)
+
+
+# 멀티파트 업로드 상태 컬럼 (마이그레이션 0005 multipart_upload)
+MULTIPART_STATE_INITIATED = "INITIATED"
+MULTIPART_STATE_COMPLETED = "COMPLETED"
+MULTIPART_STATE_ABORTED = "ABORTED"
+
+
+def _require_multipart(schema: SchemaInfo) -> None:
+    if not schema.has("multipart_upload_id"):
+        raise RuntimeError(f"{DB_TABLE_NAME}.multipart_* columns are required for multipart uploads (run python -m app.migrate)")
+
+
+def insert_multipart_upload_intent_statement(
+    schema: SchemaInfo,
+    intent: UploadIntent,
+    status: str,
+    upload_id: str,
+    part_size: int,
+    part_count: int,
+) -> Statement:
+    """업로드 intent와 멀티파트 정보(upload_id, 파트 크기/개수)를 한 문장으로 삽입합니다."""
+    _require_multipart(schema)
+    return _insert_intents_statement(
+        schema, [intent], status,
+        ("multipart_upload_id", "multipart_part_size", "multipart_part_count", "multipart_state"),
+        (upload_id, part_size, part_count, MULTIPART_STATE_INITIATED),
+    )
+
+
+def select_multipart_upload_statement(schema: SchemaInfo, job_id: str) -> Statement:
+    _require_multipart(schema)
+    sql = (
+        "SELECT id, user_id, s3_key, file_type, processing_status, "
+        "multipart_upload_id, multipart_part_size, multipart_part_count, multipart_state "
+        f"FROM {_table()} WHERE id = %s LIMIT 1"
+    )
+    return sql, (job_id,)
+
+
+def row_to_multipart_upload(row) -> Optional[dict]:
+    if not row or row[5] is None:
+        # 없는 job이거나 단일 PUT 업로드
+        return None
+    return {
+        "job_id": row[0],
+        "user_id": row[1],
+        "s3_key": row[2],
+        "file_type": row[3],
+        "status": row[4],
+        "upload_id": row[5],
+        "part_size": row[6],
+        "part_count": row[7],
+        "state": row[8],
+    }
+
+
+def update_multipart_state_statement(
+    schema: SchemaInfo,
+    job_id: str,
+    state: str,
+    status: Optional[str] = None,
+) -> Statement:
+    """
+    multipart_state(와 주어지면 processing_status)를 갱신합니다.
+    INITIATED 상태인 행만 바꾸므로 complete/abort가 중복 호출되어도 한 번만 적용됩니다.
+    """
+    _require_multipart(schema)
+    assignments = ["multipart_state = %s"]
+    params = [state]
+    if status is not None:
+        assignments.append("processing_status = %s")
+        params.append(status)
+    params.extend([job_id, MULTIPART_STATE_INITIATED])
+    sql = f"UPDATE {_table()} SET {', '.join(assignments)} WHERE id = %s AND multipart_state = %s"
+    return sql, tuple(params)
+
+
+def update_status_statement(
+    schema: SchemaInfo,
+    job_id: str,
+    status: str,
+    s3_result_path: Optional[str] = None,
+    s3_result_paths: Optional[str] = None,
+) -> Statement:
+    """
+    processing_status와, 값이 주어졌고 스키마에 존재하는 결과 경로 컬럼만 갱신하는 UPDATE 문을 만듭니다.
+    스키마에 없는 컬럼의 값은 (기존 fallback과 동일하게) 조용히 버립니다.
+    """
+    assignments = ["processing_status = %s"]
+    params = [status]
+    if s3_result_path is not None and schema.has("s3_result_path"):
+        assignments.append("s3_result_path = %s")
+        params.append(s3_result_path)
+    if s3_result_paths is not None and schema.has("s3_result_paths"):
+        assignments.append("s3_result_paths = %s")
+        params.append(s3_result_paths)
+    params.append(job_id)
+    sql = f"UPDATE {_table()} SET {', '.join(assignments)} WHERE id = %s"
+    return sql, tuple(params)
+
+
+# 업로드 완료 확인 (POST /api/upload/{job_id}/complete 또는 S3 이벤트)
+UPLOADED_STATUS = "UPLOADED"
+# 아직 객체가 올라오지 않은 상태: 이 상태에서만 UPLOADED로 전환 (PROCESSING/COMPLETED/FAILED를 되돌리지 않음)
+AWAITING_UPLOAD_STATUSES = ("PENDING",)
+# 워커 처리 시작 (POST /api/result/webhook/job/started)
+PROCESSING_STATUS = "PROCESSING"
+# 워커 시작 알림이 S3 이벤트보다 먼저 도착할 수 있으므로 PENDING에서도 전환 허용
+PROCESSABLE_STATUSES = ("PENDING", UPLOADED_STATUS)
+
+
+def select_upload_intent_statement(column: str, value: str) -> Statement:
+    """id 또는 s3_key로 업로드 검증에 필요한 필드를 조회합니다."""
+    if column not in ("id", "s3_key"):
+        raise ValueError(f"unsupported lookup column: {column}")
+    sql = (
+        "SELECT id, user_id, s3_key, file_type, file_size_bytes, processing_status "
+        f"FROM {_table()} WHERE {column} = %s LIMIT 1"
+    )
+    return sql, (value,)
+
+
+def row_to_upload_intent(row) -> Optional[dict]:
+    if not row:
+        return None
+    return {
+        "job_id": row[0],
+        "user_id": row[1],
+        "s3_key": row[2],
+        "file_type": row[3],
+        "file_size_bytes": row[4],
+        "status": row[5],
+    }
+
+
+def _transition_statement(job_id: str, status: str, from_statuses, assignments=()) -> Statement:
+    """processing_status가 from_statuses 중 하나일 때만 status로 바꾸는 UPDATE."""
+    sets = ["processing_status = %s", *assignments]
+    placeholders = ", ".join(["%s"] * len(from_statuses))
+    sql = (
+        f"UPDATE {_table()} SET {', '.join(sets)} "
+        f"WHERE id = %s AND processing_status IN ({placeholders})"
+    )
+    return sql, (status, job_id, *from_statuses)
+
+
+def mark_uploaded_statement(schema: SchemaInfo, job_id: str) -> Statement:
+    """업로드 대기 상태인 job만 UPLOADED로 바꾸고, 컬럼이 있으면 uploaded_at을 기록합니다."""
+    assignments = ["uploaded_at = CURRENT_TIMESTAMP"] if schema.has("uploaded_at") else []
+    return _transition_statement(job_id, UPLOADED_STATUS, AWAITING_UPLOAD_STATUSES, assignments)
+
+
+def mark_processing_statement(schema: SchemaInfo, job_id: str) -> Statement:
+    """PENDING/UPLOADED인 job만 PROCESSING으로 바꿉니다 (늦게 온 시작 알림이 COMPLETED를 되돌리지 않음)."""
+    return _transition_statement(job_id, PROCESSING_STATUS, PROCESSABLE_STATUSES)
+
+
+# 업로드가 끝나지 않은 채 버려진 job 정리 (app.upload_expiry): 취소(abort)와 같은 FAILED로 기록
+EXPIRED_UPLOAD_STATUS = "FAILED"
+
+
+def select_stale_uploads_statement(schema: SchemaInfo, older_than_seconds: int, limit: int) -> Statement:
+    """created_at 이후 older_than_seconds가 지나도록 업로드 대기 상태인 job (오래된 순, idx_processing_status 사용)."""
+    if not schema.has("created_at"):
+        raise RuntimeError(f"{DB_TABLE_NAME}.created_at column is required for upload expiry (run python -m app.migrate)")
+    multipart = "multipart_upload_id, multipart_state" if schema.has("multipart_upload_id") else "NULL, NULL"
+    placeholders = ", ".join(["%s"] * len(AWAITING_UPLOAD_STATUSES))
+    sql = (
+        f"SELECT id, s3_key, {multipart} FROM {_table()} "
+        f"WHERE processing_status IN ({placeholders}) AND created_at < CURRENT_TIMESTAMP - INTERVAL %s SECOND "
+        "ORDER BY created_at LIMIT %s"
+    )
+    return sql, (*AWAITING_UPLOAD_STATUSES, int(older_than_seconds), int(limit))
+
+
+def row_to_stale_upload(row) -> dict:
+    return {"job_id": row[0], "s3_key": row[1], "upload_id": row[2], "multipart_state": row[3]}
+
+
+def expire_upload_statement(schema: SchemaInfo, job_id: str) -> Statement:
+    """아직 업로드 대기 중인 job만 FAILED로 바꾸고, 진행 중인 멀티파트 세션도 ABORTED로 닫습니다."""
+    assignments = []
+    if schema.has("multipart_state"):
+        assignments.append(
+            f"multipart_state = CASE WHEN multipart_state = '{MULTIPART_STATE_INITIATED}' "
+            f"THEN '{MULTIPART_STATE_ABORTED}' ELSE multipart_state END"
+        )
+    return _transition_statement(job_id, EXPIRED_UPLOAD_STATUS, AWAITING_UPLOAD_STATUSES, assignments)
+
+
+def _record_columns(schema: SchemaInfo) -> str:
+    columns = "id, user_id, processing_status, s3_result_path"
+    if schema.has("s3_result_paths"):
+        columns += ", s3_result_paths"
+    return columns
+
+
+def select_upload_record_statement(schema: SchemaInfo, job_id: str) -> Statement:
+    return f"SELECT {_record_columns(schema)} FROM {_table()} WHERE id = %s LIMIT 1", (job_id,)
+
+
+def select_upload_records_statement(schema: SchemaInfo, job_ids: List[str]) -> Statement:
+    """여러 job을 한 번에 조회하는 WHERE id IN (...) 문. job_ids는 비어 있지 않아야 합니다."""
+    placeholders = ", ".join(["%s"] * len(job_ids))
+    return f"SELECT {_record_columns(schema)} FROM {_table()} WHERE id IN ({placeholders})", tuple(job_ids)
+
+
+def row_to_upload_record(schema: SchemaInfo, row) -> Optional[dict]:
+    if not row:
+        return None
+    return {
+        "job_id": row[0],
+        "user_id": row[1],
+        "status": row[2],
+        "s3_result_path": row[3],
+        "s3_result_paths": row[4] if schema.has("s3_result_paths") else None,
+    }
+
+
+def select_job_owner_statement(job_id: str) -> Statement:
+    return f"SELECT user_id FROM {_table()} WHERE id = %s LIMIT 1", (job_id,)
+
+
+def list_user_jobs_statement(
+    schema: SchemaInfo,
+    user_id: str,
+    limit: int,
+    before: Optional[Tuple[object, str]] = None,
+    status: Optional[str] = None,
+) -> Statement:
+    """
+    사용자의 job을 최신순으로 조회하는 keyset 페이지네이션 쿼리.
+    before=(created_at, id)이면 그 행 '이후'(더 오래된 쪽)부터 가져옵니다. OFFSET을 쓰지 않으므로
+    (user_id, created_at) 인덱스만 타고 페이지 깊이와 무관하게 일정한 비용으로 동작합니다.
+    """
+    if not schema.has("created_at"):
+        raise RuntimeError(f"{DB_TABLE_NAME}.created_at column is required for job history (run python -m app.migrate)")
+    columns = ["id", "processing_status", "created_at"]
+    for optional in ("upload_source", "original_filename"):
+        if schema.has(optional):
+            columns.append(optional)
+    where = ["user_id = %s"]
+    params = [user_id]
+    if status:
+        where.append("processing_status = %s")
+        params.append(status)
+    if before is not None:
+        created_at, last_id = before
+        where.append("(created_at < %s OR (created_at = %s AND id < %s))")
+        params.extend([created_at, created_at, last_id])
+    params.append(int(limit))
+    sql = (
+        f"SELECT {', '.join(columns)} FROM {_table()} "
+        f"WHERE {' AND '.join(where)} "
+        f"ORDER BY created_at DESC, id DESC LIMIT %s"
+    )
+    return sql, tuple(params)
+
+
+def row_to_job_summary(schema: SchemaInfo, row) -> dict:
+    summary = {"job_id": row[0], "status": row[1], "created_at": row[2]}
+    i = 3
+    for optional in ("upload_source", "original_filename"):
+        if schema.has(optional):
+            summary[optional] = row[i]
+            i += 1
+    return summary
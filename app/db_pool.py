@@ -0,0 +1,241 @@
+# app/db_pool.py
+
+# mysql.connector 연결 풀: 작업(operation) 단위로 연결을 빌려주고 반납받습니다.
+# - 크기 제한(DB_POOL_SIZE), 대기 타임아웃(DB_POOL_TIMEOUT)
+# - 일정 시간 놀던 연결은 재사용 전에 ping (DB_POOL_PING_AFTER)
+# - MySQL wait_timeout 이전에 연결을 폐기/재생성 (DB_POOL_RECYCLE)
+# - 풀 고갈(대기/타임아웃) 통계는 app.metrics에 등록되어 /api/metrics로 노출
+
+import os
+import time
+import threading
+from collections import deque
+from contextlib import contextmanager
+
+import mysql.connector
+
+from app import metrics
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+DB_POOL_SIZE = _env_int("DB_POOL_SIZE", 10)
+DB_POOL_TIMEOUT = _env_float("DB_POOL_TIMEOUT", 10.0)        # 연결을 기다리는 최대 시간(초)
+DB_POOL_RECYCLE = _env_int("DB_POOL_RECYCLE", 3600)          # 연결 최대 수명(초)
+DB_POOL_PING_AFTER = _env_float("DB_POOL_PING_AFTER", 10.0)  # 이 시간 이상 놀던 연결은 재사용 전 ping (0이면 항상)
+
+# 서버 wait_timeout보다 이만큼 먼저 재활용하여 서버가 끊은 연결을 집어드는 일을 막음
+_WAIT_TIMEOUT_MARGIN = 30
+
+
+class PoolTimeoutError(RuntimeError):
+    """DB_POOL_TIMEOUT 안에 빈 연결을 얻지 못했을 때 발생합니다."""
+
+
+class _PooledConnection:
+    __slots__ = ("conn", "created_at", "last_used")
+
+    def __init__(self, conn):
+        now = time.monotonic()
+        self.conn = conn
+        self.created_at = now
+        self.last_used = now
+
+
+class ConnectionPool:
+    def __init__(
+        self,
+        conn_args: dict,
+        size: int = DB_POOL_SIZE,
+        timeout: float = DB_POOL_TIMEOUT,
+        recycle: int = DB_POOL_RECYCLE,
+        ping_after: float = DB_POOL_PING_AFTER,
+        name: str = "db_pool",
+    ):
+        # autocommit: 풀에서 재사용되는 연결이 이전 SELECT의 REPEATABLE READ 스냅샷을
+        # 계속 물고 있으면 다른 워커가 커밋한 상태 변경을 보지 못하므로 켜 둡니다.
+        self._conn_args = dict(conn_args, autocommit=True)
+        self._size = max(1, int(size))
+        self._timeout = float(timeout)
+        self._recycle = int(recycle)
+        self._ping_after = float(ping_after)
+        self._wait_timeout_checked = False
+
+        self._idle: deque = deque()
+        self._total = 0  # 생성되어 아직 닫히지 않은 연결 수 (idle + in use)
+        self._cond = threading.Condition()
+
+        self._stats = {
+            "checkouts": 0,
+            "created": 0,
+            "recycled": 0,
+            "ping_failures": 0,
+            "discarded": 0,
+            "waits": 0,       # 풀이 고갈되어 대기한 횟수
+            "timeouts": 0,    # 대기 끝에 PoolTimeoutError가 난 횟수
+            "max_wait_ms": 0.0,
+        }
+        self.metrics_name = metrics.register_source(name, self.stats)
+
+    # ------------------------------------------------------------------
+    # 연결 생성/검증
+    # ------------------------------------------------------------------
+    def _connect(self) -> _PooledConnection:
+        conn = mysql.connector.connect(**self._conn_args)
+        if not self._wait_timeout_checked:
+            self._wait_timeout_checked = True
+            self._apply_server_wait_timeout(conn)
+        with self._cond:
+            self._stats["created"] += 1
+        return _PooledConnection(conn)
+
+    def _apply_server_wait_timeout(self, conn) -> None:
+        """서버의 wait_timeout이 recycle보다 짧으면 recycle을 그에 맞춰 줄입니다."""
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute("SELECT @@SESSION.wait_timeout")
+                row = cursor.fetchone()
+            wait_timeout = int(row[0]) if row and row[0] is not None else None
+        except Exception as e:
+            print(f"[DB Pool] wait_timeout 조회 실패 (recycle={self._recycle}s 유지): {e}")
+            return
+        if wait_timeout and wait_timeout > _WAIT_TIMEOUT_MARGIN * 2:
+            self._recycle = min(self._recycle, wait_timeout - _WAIT_TIMEOUT_MARGIN)
+
+    def _close_quietly(self, conn) -> None:
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+    def _is_usable(self, entry: _PooledConnection) -> bool:
+        now = time.monotonic()
+        if self._recycle > 0 and now - entry.created_at >= self._recycle:
+            with self._cond:
+                self._stats["recycled"] += 1
+            return False
+        if now - entry.last_used >= self._ping_after:
+            try:
+                entry.conn.ping(reconnect=False)
+            except Exception:
+                with self._cond:
+                    self._stats["ping_failures"] += 1
+                return False
+        return True
+
+    # ------------------------------------------------------------------
+    # checkout / checkin
+    # ------------------------------------------------------------------
+    def acquire(self) -> _PooledConnection:
+        started = time.monotonic()
+        deadline = started + self._timeout
+        waited = False
+        with self._cond:
+            while True:
+                if self._idle:
+                    entry = self._idle.pop()  # LIFO: 가장 최근에 쓴(따뜻한) 연결 우선
+                    break
+                if self._total < self._size:
+                    self._total += 1
+                    entry = None
+                    break
+                if not waited:
+                    waited = True
+                    self._stats["waits"] += 1
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._stats["timeouts"] += 1
+                    raise PoolTimeoutError(
+                        f"DB connection pool exhausted (size={self._size}, timeout={self._timeout}s)"
+                    )
+                self._cond.wait(remaining)
+            self._stats["checkouts"] += 1
+            if waited:
+                waited_ms = (time.monotonic() - started) * 1000
+                self._stats["max_wait_ms"] = max(self._stats["max_wait_ms"], round(waited_ms, 2))
+
+        if entry is not None and not self._is_usable(entry):
+            self._close_quietly(entry.conn)
+            entry = None
+
+        if entry is None:
+            try:
+                entry = self._connect()
+            except Exception:
+                with self._cond:
+                    self._total -= 1
+                    self._cond.notify()
+                raise
+        return entry
+
+    def release(self, entry: _PooledConnection, discard: bool = False) -> None:
+        if discard:
+            self._close_quietly(entry.conn)
+            with self._cond:
+                self._total -= 1
+                self._stats["discarded"] += 1
+                self._cond.notify()
+            return
+        entry.last_used = time.monotonic()
+        with self._cond:
+            self._idle.append(entry)
+            self._cond.notify()
+
+    @contextmanager
+    def connection(self):
+        """
+        작업 하나 동안 연결을 빌려줍니다.
+        예외가 나면 rollback을 시도하고, rollback조차 실패하면 연결을 버립니다.
+        """
+        entry = self.acquire()
+        try:
+            yield entry.conn
+        except Exception:
+            discard = False
+            try:
+                entry.conn.rollback()
+            except Exception:
+                discard = True
+            self.release(entry, discard=discard)
+            raise
+        else:
+            self.release(entry)
+
+    def prewarm(self, n: int = 1) -> None:
+        """연결을 미리 n개 만들어 둡니다 (DB 설정 오류를 시작 시점에 드러내는 용도)."""
+        entries = [self.acquire() for _ in range(min(n, self._size))]
+        for entry in entries:
+            self.release(entry)
+
+    def close(self) -> None:
+        with self._cond:
+            idle = list(self._idle)
+            self._idle.clear()
+            self._total -= len(idle)
+        for entry in idle:
+            self._close_quietly(entry.conn)
+        metrics.unregister_source(self.metrics_name)
+
+    def stats(self) -> dict:
+        with self._cond:
+            idle = len(self._idle)
+            return dict(
+                self._stats,
+                size=self._size,
+                open=self._total,
+                idle=idle,
+                in_use=self._total - idle,
+                recycle_seconds=self._recycle,
+            )
@@ -0,0 +1,34 @@
+# app/dependencies.py
+
+# 공유 클라이언트(DB, S3, job 캐시, 결과 파일 캐시, S3 이벤트 소비자)는 main.py의 lifespan에서 한 번 만들어 app.state에 보관하고,
+# 엔드포인트는 Depends로 주입받습니다.
+# 테스트/벤치마크에서는 app.dependency_overrides[get_db_client] = lambda: FakeDB() 처럼 교체할 수 있습니다.
+# (HTTPConnection은 Request/WebSocket 공통 부모라 HTTP와 WebSocket 엔드포인트 모두에서 사용 가능)
+
+from starlette.requests import HTTPConnection
+
+from app.async_db_client import AsyncDBClient
+from app.s3_client import S3Client
+from app.job_cache import JobRecordCache
+from app.result_file_cache import ResultFileCache
+from app.upload_events import UploadEventConsumer
+
+
+def get_db_client(conn: HTTPConnection) -> AsyncDBClient:
+    return conn.app.state.db_client
+
+
+def get_s3_client(conn: HTTPConnection) -> S3Client:
+    return conn.app.state.s3_client
+
+
+def get_job_cache(conn: HTTPConnection) -> JobRecordCache:
+    return conn.app.state.job_cache
+
+
+def get_result_file_cache(conn: HTTPConnection) -> ResultFileCache:
+    return conn.app.state.result_file_cache
+
+
+def get_upload_events(conn: HTTPConnection) -> UploadEventConsumer:
+    return conn.app.state.upload_events
@@ -0,0 +1,186 @@
+# app/job_cache.py
+
+# job_id -> 업로드 레코드(get_upload_record 결과) read-through 캐시
+# - 상태 폴링(GET /api/result/status)은 캐시에서 응답하고, 미스일 때만 DB 조회
+# - start_upload / webhook이 DB를 갱신한 직후 캐시에도 기록(write-through)
+# - DB 조회 결과는 빈 자리에만 채움(fill): replica에서 읽은 오래된 레코드가 webhook이 막 기록한 레코드를 덮어쓰지 않음
+# - 기본은 프로세스 내 LRU+TTL, JOB_CACHE_BACKEND=redis 이면 워커 간 공유(redis 패키지 필요)
+
+import os
+import json
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from app import metrics
+
+JOB_CACHE_BACKEND = os.getenv("JOB_CACHE_BACKEND", "memory").lower()
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+JOB_CACHE_MAX_ENTRIES = int(os.getenv("JOB_CACHE_MAX_ENTRIES", "10000"))
+# 진행 중인 job은 짧게(다른 워커가 받은 webhook을 놓치지 않도록), 종료된 job은 길게 캐시
+JOB_CACHE_TTL = float(os.getenv("JOB_CACHE_TTL", "10"))
+JOB_CACHE_TERMINAL_TTL = float(os.getenv("JOB_CACHE_TERMINAL_TTL", "300"))
+
+TERMINAL_STATUSES = {"COMPLETED", "FAILED"}
+
+
+class MemoryCacheBackend:
+    """프로세스 내 LRU + TTL 저장소 (워커마다 독립)."""
+
+    def __init__(self, max_entries: int = JOB_CACHE_MAX_ENTRIES):
+        self._data: "OrderedDict[str, tuple]" = OrderedDict()  # key -> (expires_at, value)
+        self._max_entries = max(1, max_entries)
+        self.evictions = 0
+
+    async def get(self, key: str) -> Optional[dict]:
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            self._data.pop(key, None)
+            return None
+        self._data.move_to_end(key)
+        return dict(value)
+
+    async def set(self, key: str, value: dict, ttl: float) -> None:
+        self._data[key] = (time.monotonic() + ttl, dict(value))
+        self._data.move_to_end(key)
+        while len(self._data) > self._max_entries:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    async def add(self, key: str, value: dict, ttl: float) -> bool:
+        """키가 없을(또는 만료된) 때만 저장합니다."""
+        if await self.get(key) is not None:
+            return False
+        await self.set(key, value, ttl)
+        return True
+
+    async def delete(self, key: str) -> None:
+        self._data.pop(key, None)
+
+    def size(self) -> int:
+        return len(self._data)
+
+    async def close(self) -> None:
+        pass
+
+
+class RedisCacheBackend:
+    """여러 uvicorn 워커가 공유하는 Redis 저장소 (webhook을 받은 워커의 갱신이 모든 워커에 보임)."""
+
+    def __init__(self, url: str = REDIS_URL, prefix: str = "job:"):
+        try:
+            import redis.asyncio as aioredis
+        except ImportError as e:
+            raise RuntimeError("JOB_CACHE_BACKEND=redis 사용 시 redis 패키지가 필요합니다") from e
+        self._redis = aioredis.from_url(url)
+        self._prefix = prefix
+        self.evictions = 0  # Redis가 maxmemory 정책으로 관리
+
+    async def get(self, key: str) -> Optional[dict]:
+        raw = await self._redis.get(self._prefix + key)
+        return json.loads(raw) if raw else None
+
+    async def set(self, key: str, value: dict, ttl: float) -> None:
+        await self._redis.set(self._prefix + key, json.dumps(value, default=str), px=max(1, int(ttl * 1000)))
+
+    async def add(self, key: str, value: dict, ttl: float) -> bool:
+        return bool(await self._redis.set(self._prefix + key, json.dumps(value, default=str), px=max(1, int(ttl * 1000)), nx=True))
+
+    async def delete(self, key: str) -> None:
+        await self._redis.delete(self._prefix + key)
+
+    def size(self) -> Optional[int]:
+        return None
+
+    async def close(self) -> None:
+        # 연결 풀까지 닫음 (redis-py 5.0.1+는 aclose, 이전 버전은 close)
+        closer = getattr(self._redis, "aclose", None) or self._redis.close
+        await closer()
+
+
+class JobRecordCache:
+    def __init__(self, backend, ttl: float = JOB_CACHE_TTL, terminal_ttl: float = JOB_CACHE_TERMINAL_TTL):
+        self._backend = backend
+        self._ttl = ttl
+        self._terminal_ttl = terminal_ttl
+        self._stats = {"hits": 0, "misses": 0, "writes": 0, "invalidations": 0, "errors": 0}
+        self.metrics_name = metrics.register_source("job_cache", self.stats)
+
+    def _ttl_for(self, record: dict) -> float:
+        return self._terminal_ttl if record.get("status") in TERMINAL_STATUSES else self._ttl
+
+    async def get(self, job_id: str) -> Optional[dict]:
+        try:
+            record = await self._backend.get(job_id)
+        except Exception as e:
+            # 캐시 장애는 미스로 취급하고 DB로 진행
+            self._stats["errors"] += 1
+            print(f"[JobCache] get 실패 job_id={job_id} error={e}")
+            record = None
+        self._stats["hits" if record is not None else "misses"] += 1
+        return record
+
+    async def set(self, job_id: str, record: dict) -> None:
+        try:
+            await self._backend.set(job_id, record, self._ttl_for(record))
+            self._stats["writes"] += 1
+        except Exception as e:
+            self._stats["errors"] += 1
+            print(f"[JobCache] set 실패 job_id={job_id} error={e}")
+
+    async def fill(self, job_id: str, record: dict) -> None:
+        """DB 조회 결과 저장: 다른 워커/webhook이 먼저 기록한 항목이 있으면 덮어쓰지 않음."""
+        try:
+            if await self._backend.add(job_id, record, self._ttl_for(record)):
+                self._stats["writes"] += 1
+        except Exception as e:
+            self._stats["errors"] += 1
+            print(f"[JobCache] fill 실패 job_id={job_id} error={e}")
+
+    async def update(self, job_id: str, **fields) -> None:
+        """
+        write-through 부분 갱신: 캐시에 레코드가 있으면 필드를 덮어쓰고, 없으면 무효화만 합니다.
+        (webhook은 user_id 등 전체 필드를 모르므로 빈 캐시에 불완전한 레코드를 넣지 않음)
+        """
+        try:
+            record = await self._backend.get(job_id)
+        except Exception:
+            record = None
+        if record is None:
+            await self.invalidate(job_id)
+            return
+        record.update(fields)
+        await self.set(job_id, record)
+
+    async def invalidate(self, job_id: str) -> None:
+        try:
+            await self._backend.delete(job_id)
+            self._stats["invalidations"] += 1
+        except Exception as e:
+            self._stats["errors"] += 1
+            print(f"[JobCache] invalidate 실패 job_id={job_id} error={e}")
+
+    async def close(self) -> None:
+        metrics.unregister_source(self.metrics_name)
+        await self._backend.close()
+
+    def stats(self) -> dict:
+        lookups = self._stats["hits"] + self._stats["misses"]
+        return dict(
+            self._stats,
+            backend=type(self._backend).__name__,
+            size=self._backend.size(),
+            evictions=self._backend.evictions,
+            hit_rate=round(self._stats["hits"] / lookups, 4) if lookups else None,
+        )
+
+
+def build_job_cache() -> JobRecordCache:
+    if JOB_CACHE_BACKEND == "redis":
+        backend = RedisCacheBackend(REDIS_URL)
+    else:
+        backend = MemoryCacheBackend(JOB_CACHE_MAX_ENTRIES)
+    return JobRecordCache(backend)
@@ -0,0 +1,87 @@
+# app/jwks_refresher.py
+
+# Cognito JWKS 백그라운드 갱신 (stale-while-revalidate)
+# - lifespan 시작 시 한 번 받아 두고, 이후 TTL 만료 JWKS_REFRESH_AHEAD초 전에 미리 다시 받음
+# - 갱신 중이거나 실패해도 auth_utils는 마지막으로 받은 키를 계속 사용 -> 요청이 Cognito 응답을 기다리지 않음
+# - 실패 시 JWKS_RETRY_INTERVAL초 후 재시도 (키를 받은 적이 없으면 요청 경로의 동기 조회가 마지막 수단)
+# - httpx.AsyncClient 하나를 재사용 (커넥션 풀/keep-alive)
+
+import os
+import asyncio
+from typing import Optional
+
+import httpx
+
+from app import metrics
+from app import auth_utils
+
+JWKS_REFRESH_AHEAD = int(os.getenv("JWKS_REFRESH_AHEAD", "300"))
+JWKS_RETRY_INTERVAL = int(os.getenv("JWKS_RETRY_INTERVAL", "30"))
+JWKS_FETCH_TIMEOUT = float(os.getenv("JWKS_FETCH_TIMEOUT", "5"))
+
+
+class JwksRefresher:
+    def __init__(self, url: Optional[str] = auth_utils.JWKS_URL):
+        self._url = url
+        self._client: Optional[httpx.AsyncClient] = None
+        self._task: Optional[asyncio.Task] = None
+        self._stats = {"refreshes": 0, "failures": 0}
+        self.metrics_name = metrics.register_source("jwks_refresher", self.stats)
+
+    async def refresh(self) -> bool:
+        """JWKS를 한 번 받아 auth_utils에 설치합니다. 실패하면 기존 키를 그대로 두고 False."""
+        try:
+            r = await self._client.get(self._url)
+            r.raise_for_status()
+            jwks = r.json()
+            if not isinstance(jwks, dict) or not jwks.get("keys"):
+                raise ValueError("JWKS 응답에 keys가 없습니다.")
+        except Exception as e:
+            self._stats["failures"] += 1
+            print(f"[JWKS Refresh] 조회 실패: {e}")
+            return False
+        auth_utils._install_jwks(jwks)
+        self._stats["refreshes"] += 1
+        return True
+
+    def _next_delay(self, ok: bool) -> float:
+        if not ok:
+            return JWKS_RETRY_INTERVAL
+        return max(auth_utils._JWKS_TTL - JWKS_REFRESH_AHEAD, JWKS_RETRY_INTERVAL)
+
+    async def _run(self, ok: bool) -> None:
+        while True:
+            await asyncio.sleep(self._next_delay(ok))
+            ok = await self.refresh()
+
+    async def start(self) -> None:
+        """첫 조회를 기다린 뒤 갱신 루프를 시작합니다. JWKS URL이 없으면 아무것도 하지 않음."""
+        if not self._url or self._task is not None:
+            return
+        self._client = httpx.AsyncClient(timeout=JWKS_FETCH_TIMEOUT)
+        ok = await self.refresh()
+        auth_utils._JWKS_BACKGROUND_REFRESH = True
+        self._task = asyncio.create_task(self._run(ok))
+
+    async def stop(self) -> None:
+        auth_utils._JWKS_BACKGROUND_REFRESH = False
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+        metrics.unregister_source(self.metrics_name)
+
+    def stats(self) -> dict:
+        age = auth_utils._jwks_age()
+        return dict(
+            self._stats,
+            running=self._task is not None,
+            keys=len(auth_utils._JWKS_KEYS),
+            age_seconds=round(age, 1) if age is not None else None,
+        )
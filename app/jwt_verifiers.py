@@ -0,0 +1,111 @@
+# app/jwt_verifiers.py
+
+# JWT 서명 검증 백엔드 (JWT_VERIFIER_BACKEND로 선택)
+# - jose:         python-jose의 jwk.construct() 키 (python-jose가 고른 내부 백엔드 사용, 기본값)
+# - jose-rsa:     python-jose의 순수 파이썬 rsa 백엔드 (cryptography 없이 동작, 가장 느림)
+# - cryptography: cryptography로 RS256만 직접 검증 (cryptography 패키지 필요)
+# 토큰은 parse_token()으로 한 번만 분해하고, 헤더/claims/서명 입력을 그대로 백엔드와 claims 검증에 넘김
+
+import os
+import json
+from collections import namedtuple
+
+from jose import jwk
+from jose.exceptions import JWTError
+from jose.utils import base64url_decode
+
+JWT_VERIFIER_BACKEND = os.getenv("JWT_VERIFIER_BACKEND", "jose").lower()
+
+ParsedToken = namedtuple("ParsedToken", ["header", "claims", "signing_input", "signature"])
+
+
+def _b64_json(segment: str) -> dict:
+    value = json.loads(base64url_decode(segment.encode("ascii")))
+    if not isinstance(value, dict):
+        raise ValueError("JSON object가 아닙니다.")
+    return value
+
+
+def parse_token(token: str) -> ParsedToken:
+    """header.claims.signature를 한 번에 분해합니다. 형식이 잘못되면 JWTError."""
+    try:
+        signing_input, encoded_sig = token.rsplit(".", 1)
+        encoded_header, encoded_claims = signing_input.split(".")
+        header = _b64_json(encoded_header)
+        claims = _b64_json(encoded_claims)
+        signature = base64url_decode(encoded_sig.encode("ascii"))
+    except Exception as e:
+        raise JWTError("잘못된 토큰 형식") from e
+    return ParsedToken(header, claims, signing_input.encode("ascii"), signature)
+
+
+class JoseVerifier:
+    name = "jose"
+
+    def load_key(self, jwk_dict: dict):
+        return jwk.construct(jwk_dict)
+
+    def verify(self, key, parsed: ParsedToken) -> bool:
+        return key.verify(parsed.signing_input, parsed.signature)
+
+
+class JoseRsaVerifier(JoseVerifier):
+    name = "jose-rsa"
+
+    def __init__(self):
+        try:
+            from jose.backends.rsa_backend import RSAKey
+        except ImportError as e:
+            raise RuntimeError("JWT_VERIFIER_BACKEND=jose-rsa 사용 시 rsa 패키지가 필요합니다") from e
+        self._key_class = RSAKey
+
+    def load_key(self, jwk_dict: dict):
+        return self._key_class(jwk_dict, jwk_dict.get("alg", "RS256"))
+
+
+class CryptographyRS256Verifier:
+    name = "cryptography"
+
+    def __init__(self):
+        try:
+            from cryptography.exceptions import InvalidSignature
+            from cryptography.hazmat.primitives import hashes
+            from cryptography.hazmat.primitives.asymmetric import padding, rsa
+        except ImportError as e:
+            raise RuntimeError("JWT_VERIFIER_BACKEND=cryptography 사용 시 cryptography 패키지가 필요합니다") from e
+        self._invalid_signature = InvalidSignature
+        self._padding = padding.PKCS1v15()
+        self._hash = hashes.SHA256()
+        self._public_numbers = rsa.RSAPublicNumbers
+
+    def load_key(self, jwk_dict: dict):
+        if jwk_dict.get("kty") != "RSA" or jwk_dict.get("alg", "RS256") != "RS256":
+            raise ValueError(f"RS256 RSA 키가 아닙니다 (kty={jwk_dict.get('kty')} alg={jwk_dict.get('alg')})")
+        n = int.from_bytes(base64url_decode(jwk_dict["n"].encode("ascii")), "big")
+        e = int.from_bytes(base64url_decode(jwk_dict["e"].encode("ascii")), "big")
+        return self._public_numbers(e, n).public_key()
+
+    def verify(self, key, parsed: ParsedToken) -> bool:
+        # 이 백엔드는 RS256만 구현하므로 다른 alg는 거부 (alg 혼동 방지)
+        if parsed.header.get("alg") != "RS256":
+            return False
+        try:
+            key.verify(parsed.signature, parsed.signing_input, self._padding, self._hash)
+            return True
+        except self._invalid_signature:
+            return False
+
+
+VERIFIER_BACKENDS = {
+    JoseVerifier.name: JoseVerifier,
+    JoseRsaVerifier.name: JoseRsaVerifier,
+    CryptographyRS256Verifier.name: CryptographyRS256Verifier,
+}
+
+
+def build_verifier(name: str = JWT_VERIFIER_BACKEND):
+    try:
+        backend = VERIFIER_BACKENDS[name]
+    except KeyError:
+        raise RuntimeError(f"알 수 없는 JWT_VERIFIER_BACKEND={name} (가능: {', '.join(VERIFIER_BACKENDS)})")
+    return backend()
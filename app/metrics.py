@@ -0,0 +1,43 @@
+# app/metrics.py
+
+# 서브시스템(DB 풀, 캐시 등)이 자신의 통계를 등록하는 간단한 프로세스 내 메트릭 레지스트리
+# /api/metrics 엔드포인트가 snapshot()을 그대로 반환합니다.
+
+import threading
+from typing import Callable, Dict
+
+_SOURCES: Dict[str, Callable[[], dict]] = {}
+_LOCK = threading.Lock()
+
+
+def register_source(name: str, fn: Callable[[], dict]) -> str:
+    """
+    통계 함수를 등록하고 실제 등록된 이름을 반환합니다.
+    같은 이름이 이미 있으면 '#2', '#3' 접미사를 붙여 충돌을 피합니다.
+    """
+    with _LOCK:
+        key = name
+        n = 2
+        while key in _SOURCES:
+            key = f"{name}#{n}"
+            n += 1
+        _SOURCES[key] = fn
+        return key
+
+
+def unregister_source(name: str) -> None:
+    with _LOCK:
+        _SOURCES.pop(name, None)
+
+
+def snapshot() -> dict:
+    """등록된 모든 통계 함수를 호출해 {이름: 통계} 형태로 반환합니다."""
+    with _LOCK:
+        sources = list(_SOURCES.items())
+    out = {}
+    for name, fn in sources:
+        try:
+            out[name] = fn()
+        except Exception as e:
+            out[name] = {"error": str(e)}
+    return out
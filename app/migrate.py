@@ -0,0 +1,248 @@
+# app/migrate.py
+
+# 업로드 테이블(DB_TABLE_NAME) 버전 관리 마이그레이션
+# - 적용된 버전은 DB_MIGRATIONS_TABLE(기본 schema_migrations)에 기록
+# - 각 마이그레이션은 information_schema를 보고 '아직 없는 것만' DDL로 만들어 반환하므로
+#   기존 운영 DB(수동으로 만든 테이블)에도, 중간에 실패한 뒤 재실행해도 안전합니다.
+#
+# 실행:
+#   python -m app.migrate             # 미적용 마이그레이션 전부 적용
+#   python -m app.migrate --dry-run   # 실행할 SQL만 출력
+#   python -m app.migrate --status    # 버전별 적용 여부 출력
+#   python -m app.migrate --target 3  # 3번까지만 적용
+
+import os
+import sys
+import argparse
+from collections import namedtuple
+
+from dotenv import load_dotenv
+
+# main.py와 동일하게 .env.local 우선 로드 (app.db_common이 import 시 환경변수를 읽음)
+if os.path.exists('.env.local'):
+    load_dotenv('.env.local')
+else:
+    load_dotenv()
+
+from app.db_common import DB_TABLE_NAME
+
+DB_MIGRATIONS_TABLE = os.getenv("DB_MIGRATIONS_TABLE", "schema_migrations")
+
+# plan(cursor, table) -> 아직 적용되지 않은 SQL 목록
+Migration = namedtuple("Migration", ["version", "name", "plan"])
+
+
+# ----------------------------------------------------------------------
+# introspection helpers
+# ----------------------------------------------------------------------
+def _table_exists(cursor, table: str) -> bool:
+    cursor.execute(
+        "SELECT 1 FROM information_schema.TABLES WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s",
+        (table,),
+    )
+    return cursor.fetchone() is not None
+
+
+def _column_type(cursor, table: str, column: str):
+    """컬럼의 DATA_TYPE(소문자)을 반환, 없으면 None."""
+    cursor.execute(
+        "SELECT DATA_TYPE FROM information_schema.COLUMNS "
+        "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND COLUMN_NAME = %s",
+        (table, column),
+    )
+    row = cursor.fetchone()
+    return str(row[0]).lower() if row else None
+
+
+def _index_exists(cursor, table: str, index: str) -> bool:
+    cursor.execute(
+        "SELECT 1 FROM information_schema.STATISTICS "
+        "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND INDEX_NAME = %s LIMIT 1",
+        (table, index),
+    )
+    return cursor.fetchone() is not None
+
+
+def _add_missing_columns(cursor, table: str, columns) -> list:
+    return [
+        f"ALTER TABLE {table} ADD COLUMN {name} {ddl}"
+        for name, ddl in columns
+        if _column_type(cursor, table, name) is None
+    ]
+
+
+def _add_missing_indexes(cursor, table: str, indexes) -> list:
+    return [
+        f"CREATE INDEX {name} ON {table} ({columns})"
+        for name, columns in indexes
+        if not _index_exists(cursor, table, name)
+    ]
+
+
+# ----------------------------------------------------------------------
+# migrations
+# ----------------------------------------------------------------------
+def _v1_create_uploads_table(cursor, table: str) -> list:
+    if _table_exists(cursor, table):
+        # 수동으로 만든 기존 테이블: 코드가 항상 쓰는 결과 경로 컬럼만 보장
+        return _add_missing_columns(cursor, table, [("s3_result_path", "VARCHAR(1024) NULL")])
+    return [f"""
+        CREATE TABLE {table} (
+            id CHAR(36) NOT NULL PRIMARY KEY,
+            user_id VARCHAR(128) NULL,
+            non_member_identifier VARCHAR(255) NULL,
+            upload_source VARCHAR(16) NOT NULL,
+            s3_key VARCHAR(1024) NOT NULL,
+            original_filename VARCHAR(512) NULL,
+            file_type VARCHAR(128) NULL,
+            file_size_bytes BIGINT NULL,
+            processing_status VARCHAR(32) NOT NULL DEFAULT 'PENDING',
+            s3_result_path VARCHAR(1024) NULL
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+    """.strip()]
+
+
+def _v2_result_paths_json(cursor, table: str) -> list:
+    current = _column_type(cursor, table, "s3_result_paths")
+    if current is None:
+        return [f"ALTER TABLE {table} ADD COLUMN s3_result_paths JSON NULL"]
+    # MariaDB는 JSON을 longtext(+ JSON_VALID 체크)로 보고함
+    if current not in ("json", "longtext"):
+        return [f"ALTER TABLE {table} MODIFY COLUMN s3_result_paths JSON NULL"]
+    return []
+
+
+def _v3_timestamps(cursor, table: str) -> list:
+    return _add_missing_columns(cursor, table, [
+        ("created_at", "TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP"),
+        ("updated_at", "TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP"),
+    ])
+
+
+def _v4_hot_path_indexes(cursor, table: str) -> list:
+    # (user_id, created_at): GET /api/result/jobs keyset 페이지네이션 (InnoDB 보조 인덱스는 PK(id)를 포함)
+    # (processing_status): 상태별 조회
+    return _add_missing_indexes(cursor, table, [
+        ("idx_user_created_at", "user_id, created_at"),
+        ("idx_processing_status", "processing_status"),
+    ])
+
+
+def _v5_multipart_upload(cursor, table: str) -> list:
+    # POST /api/upload/multipart: S3 UploadId와 파트 분할 정보, INITIATED/COMPLETED/ABORTED 상태
+    return _add_missing_columns(cursor, table, [
+        ("multipart_upload_id", "VARCHAR(1024) NULL"),
+        ("multipart_part_size", "BIGINT NULL"),
+        ("multipart_part_count", "INT NULL"),
+        ("multipart_state", "VARCHAR(16) NULL"),
+    ])
+
+
+def _v6_s3_key_layout(cursor, table: str) -> list:
+    # 업로드 키 레이아웃 버전(v1/v2, S3_KEY_LAYOUT). 기존 행은 NULL = v1
+    return _add_missing_columns(cursor, table, [("s3_key_layout", "VARCHAR(8) NULL")])
+
+
+def _v7_upload_completion(cursor, table: str) -> list:
+    # UPLOADED 전환 시각, S3 이벤트(객체 키)로 job을 찾기 위한 s3_key 인덱스
+    # (utf8mb4 VARCHAR(1024)는 InnoDB 인덱스 키 길이 제한을 넘으므로 prefix 인덱스)
+    return _add_missing_columns(cursor, table, [
+        ("uploaded_at", "TIMESTAMP NULL"),
+    ]) + _add_missing_indexes(cursor, table, [
+        ("idx_s3_key", "s3_key(255)"),
+    ])
+
+
+MIGRATIONS = [
+    Migration(1, "create_uploads_table", _v1_create_uploads_table),
+    Migration(2, "result_paths_json", _v2_result_paths_json),
+    Migration(3, "timestamps", _v3_timestamps),
+    Migration(4, "hot_path_indexes", _v4_hot_path_indexes),
+    Migration(5, "multipart_upload", _v5_multipart_upload),
+    Migration(6, "s3_key_layout", _v6_s3_key_layout),
+    Migration(7, "upload_completion", _v7_upload_completion),
+]
+
+
+# ----------------------------------------------------------------------
+# runner
+# ----------------------------------------------------------------------
+def _applied_versions(cursor) -> set:
+    if not _table_exists(cursor, DB_MIGRATIONS_TABLE):
+        return set()
+    cursor.execute(f"SELECT version FROM {DB_MIGRATIONS_TABLE}")
+    return {int(r[0]) for r in cursor.fetchall()}
+
+
+def _ensure_migrations_table(cursor, dry_run: bool) -> None:
+    if _table_exists(cursor, DB_MIGRATIONS_TABLE):
+        return
+    sql = (
+        f"CREATE TABLE {DB_MIGRATIONS_TABLE} ("
+        "version INT NOT NULL PRIMARY KEY, "
+        "name VARCHAR(255) NOT NULL, "
+        "applied_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP"
+        ") ENGINE=InnoDB DEFAULT CHARSET=utf8mb4"
+    )
+    print(f"{'[dry-run] ' if dry_run else ''}{sql}")
+    if not dry_run:
+        cursor.execute(sql)
+
+
+def run(cursor, table: str, dry_run: bool = False, target=None) -> int:
+    """미적용 마이그레이션을 버전 순으로 적용하고, 적용한 개수를 반환합니다."""
+    applied = _applied_versions(cursor)
+    _ensure_migrations_table(cursor, dry_run)
+    count = 0
+    for m in MIGRATIONS:
+        if m.version in applied or (target is not None and m.version > target):
+            continue
+        statements = m.plan(cursor, table)
+        print(f"-- {m.version:04d} {m.name} ({len(statements)} statement(s))")
+        for sql in statements:
+            print(f"{'[dry-run] ' if dry_run else ''}{sql};")
+            if not dry_run:
+                cursor.execute(sql)
+        if not dry_run:
+            cursor.execute(
+                f"INSERT INTO {DB_MIGRATIONS_TABLE} (version, name) VALUES (%s, %s)",
+                (m.version, m.name),
+            )
+        count += 1
+    return count
+
+
+def status(cursor) -> None:
+    applied = _applied_versions(cursor)
+    for m in MIGRATIONS:
+        print(f"{m.version:04d} {m.name:<28} {'applied' if m.version in applied else 'pending'}")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m app.migrate", description="Upload table schema migrations")
+    parser.add_argument("--dry-run", action="store_true", help="print SQL without executing it")
+    parser.add_argument("--status", action="store_true", help="show applied/pending versions")
+    parser.add_argument("--target", type=int, default=None, help="apply migrations up to this version")
+    args = parser.parse_args(argv)
+
+    if not DB_TABLE_NAME:
+        print("DB_TABLE_NAME not configured")
+        return 1
+
+    from app.db_client import DBClient
+    db = DBClient()
+    try:
+        with db.connection() as conn:
+            with conn.cursor(buffered=True) as cursor:
+                if args.status:
+                    status(cursor)
+                    return 0
+                count = run(cursor, DB_TABLE_NAME, dry_run=args.dry_run, target=args.target)
+                print(f"{'would apply' if args.dry_run else 'applied'} {count} migration(s)")
+    finally:
+        db.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
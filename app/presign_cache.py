@@ -0,0 +1,77 @@
+# app/presign_cache.py
+
+# (bucket, key, expires_in) -> presigned GET URL 캐시
+# - COMPLETED job을 폴링할 때마다 같은 결과 키를 다시 서명하지 않도록 재사용
+# - 만료(expires_in) PRESIGNED_URL_CACHE_MARGIN초 전까지만 재사용하므로, 클라이언트가 받은 URL은
+#   최소 margin초 동안 유효함
+# - 같은 URL이 반복해서 내려가므로 브라우저/CDN이 결과 파일 다운로드를 캐시할 수 있음
+# - webhook에서 생성한 URL도 같은 캐시에 들어가 직후의 상태 폴링이 그대로 재사용
+
+import os
+import time
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+from app import metrics
+
+PRESIGNED_URL_CACHE_MARGIN = int(os.getenv("PRESIGNED_URL_CACHE_MARGIN", "300"))
+# 0이면 캐시 비활성화
+PRESIGNED_URL_CACHE_MAX_ENTRIES = int(os.getenv("PRESIGNED_URL_CACHE_MAX_ENTRIES", "10000"))
+
+
+class PresignedUrlCache:
+    def __init__(self, max_entries: int = PRESIGNED_URL_CACHE_MAX_ENTRIES, margin: int = PRESIGNED_URL_CACHE_MARGIN):
+        self._data: "OrderedDict[tuple, tuple]" = OrderedDict()  # (bucket, key, expires_in) -> (reuse_until, url)
+        self._max_entries = max_entries
+        self._margin = margin
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0}
+        self.metrics_name = metrics.register_source("presign_cache", self.stats)
+
+    def _enabled(self, expires_in: int) -> bool:
+        # margin보다 짧게 서명하는 URL은 재사용할 구간이 없음
+        return self._max_entries > 0 and expires_in > self._margin
+
+    def get(self, bucket: str, key: str, expires_in: int) -> Optional[str]:
+        if not self._enabled(expires_in):
+            return None
+        cache_key = (bucket, key, expires_in)
+        with self._lock:
+            entry = self._data.get(cache_key)
+            if entry is not None and entry[0] > time.monotonic():
+                self._data.move_to_end(cache_key)
+                self._stats["hits"] += 1
+                return entry[1]
+            if entry is not None:
+                del self._data[cache_key]
+            self._stats["misses"] += 1
+            return None
+
+    def set(self, bucket: str, key: str, expires_in: int, url: str) -> None:
+        """방금 서명한 URL을 저장합니다. (서명 시각 기준 expires_in - margin초 동안 재사용)"""
+        if not self._enabled(expires_in):
+            return
+        cache_key = (bucket, key, expires_in)
+        with self._lock:
+            self._data[cache_key] = (time.monotonic() + expires_in - self._margin, url)
+            self._data.move_to_end(cache_key)
+            while len(self._data) > self._max_entries:
+                self._data.popitem(last=False)
+                self._stats["evictions"] += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self._stats["hits"] + self._stats["misses"]
+            return dict(
+                self._stats,
+                size=len(self._data),
+                hit_rate=round(self._stats["hits"] / lookups, 4) if lookups else None,
+            )
+
+    def close(self) -> None:
+        metrics.unregister_source(self.metrics_name)
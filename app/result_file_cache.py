@@ -0,0 +1,174 @@
+# app/result_file_cache.py
+
+# 결과 파일 프록시(GET /api/result/{job_id}/files/{index})용 로컬 디스크 LRU 캐시
+# - 키: (S3 key, ETag) -> 결과가 같은 키로 다시 쓰여도 ETag가 바뀌므로 오래된 파일을 내보내지 않음
+# - 전체 크기가 RESULT_CACHE_MAX_BYTES를 넘으면 가장 오래 안 쓴 파일부터 삭제
+# - 파일은 임시 파일에 쓰고 완료 시 os.replace로 교체하므로, 다운로드 도중 끊겨도 반쪽 파일이 남지 않음
+# - 프로세스 재시작 시 디렉터리를 스캔해 (mtime 순으로) 인덱스를 복원
+# - get()이 돌려준 파일은 release()까지 사용 중으로 표시되어 삭제(evict) 대상에서 빠짐
+#   (다른 스레드의 evict가 응답 전송 중인 파일을 지우지 않도록)
+
+import os
+import hashlib
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional
+
+from app import metrics
+
+RESULT_CACHE_DIR = os.getenv("RESULT_CACHE_DIR", os.path.join(tempfile.gettempdir(), "golf-result-cache"))
+# 0이면 캐시 비활성화 (항상 S3에서 스트리밍)
+RESULT_CACHE_MAX_BYTES = int(os.getenv("RESULT_CACHE_MAX_BYTES", str(1024 ** 3)))
+
+_SUFFIX = ".bin"
+
+
+def _file_name(key: str, etag: str) -> str:
+    return hashlib.sha256(f"{key}\0{etag}".encode("utf-8")).hexdigest() + _SUFFIX
+
+
+class CacheWriter:
+    """S3 스트림을 임시 파일에 받아 적고, 길이가 맞을 때만 캐시에 등록합니다."""
+
+    def __init__(self, cache: "ResultFileCache", name: str, expected_size: int):
+        self._cache = cache
+        self._name = name
+        self._expected_size = expected_size
+        self._written = 0
+        fd, self._tmp_path = tempfile.mkstemp(dir=cache.directory, suffix=".part")
+        self._file = os.fdopen(fd, "wb")
+
+    def write(self, chunk: bytes) -> None:
+        self._file.write(chunk)
+        self._written += len(chunk)
+
+    def commit(self) -> None:
+        self._file.close()
+        if self._written != self._expected_size:
+            self.abort()
+            return
+        self._cache._commit(self._name, self._tmp_path, self._written)
+
+    def abort(self) -> None:
+        if not self._file.closed:
+            self._file.close()
+        try:
+            os.unlink(self._tmp_path)
+        except FileNotFoundError:
+            pass
+
+
+class ResultFileCache:
+    def __init__(self, directory: str = RESULT_CACHE_DIR, max_bytes: int = RESULT_CACHE_MAX_BYTES):
+        self.directory = directory
+        self._max_bytes = max_bytes
+        self._files: "OrderedDict[str, int]" = OrderedDict()  # 파일 이름 -> 크기 (LRU 순)
+        self._total = 0
+        self._in_use: Dict[str, int] = {}  # 파일 이름 -> 전송 중인 응답 수
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0, "bytes_written": 0}
+        if self.enabled:
+            os.makedirs(directory, exist_ok=True)
+            self._load()
+        self.metrics_name = metrics.register_source("result_file_cache", self.stats)
+
+    @property
+    def enabled(self) -> bool:
+        return self._max_bytes > 0
+
+    def _load(self) -> None:
+        entries = []
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+            if name.endswith(".part"):
+                # 이전 프로세스가 쓰다 만 임시 파일
+                os.unlink(path)
+            elif name.endswith(_SUFFIX):
+                st = os.stat(path)
+                entries.append((st.st_mtime, name, st.st_size))
+        for _, name, size in sorted(entries):
+            self._files[name] = size
+            self._total += size
+        self._evict()
+
+    def get(self, key: str, etag: str) -> Optional[str]:
+        """
+        캐시된 파일 경로를 반환하고 최근 사용으로 표시합니다. 없으면 None.
+        경로를 받은 쪽은 파일 사용이 끝나면 반드시 release(key, etag)를 호출해야 합니다.
+        """
+        if not self.enabled:
+            return None
+        name = _file_name(key, etag)
+        with self._lock:
+            if name not in self._files:
+                self._stats["misses"] += 1
+                return None
+            self._files.move_to_end(name)
+            self._in_use[name] = self._in_use.get(name, 0) + 1
+            self._stats["hits"] += 1
+        path = os.path.join(self.directory, name)
+        try:
+            os.utime(path)  # 재시작 후 LRU 순서 복원용
+        except FileNotFoundError:
+            # 인덱스에는 있지만 디스크에서 사라진 파일 (수동 삭제 등)
+            self.discard(key, etag)
+            return None
+        return path
+
+    def release(self, key: str, etag: str) -> None:
+        name = _file_name(key, etag)
+        with self._lock:
+            count = self._in_use.get(name, 0) - 1
+            if count > 0:
+                self._in_use[name] = count
+            else:
+                self._in_use.pop(name, None)
+            self._evict()
+
+    def discard(self, key: str, etag: str) -> None:
+        """디스크에 없는 항목을 인덱스에서 제거합니다 (get()으로 받은 사용 표시도 해제)."""
+        name = _file_name(key, etag)
+        with self._lock:
+            self._in_use.pop(name, None)
+            self._total -= self._files.pop(name, 0)
+
+    def can_store(self, size: int) -> bool:
+        return self.enabled and size <= self._max_bytes
+
+    def writer(self, key: str, etag: str, size: int) -> Optional[CacheWriter]:
+        """캐시에 담을 수 있는 크기면 CacheWriter를, 아니면 None을 반환합니다. (임시 파일을 바로 엶)"""
+        if not self.can_store(size):
+            return None
+        return CacheWriter(self, _file_name(key, etag), size)
+
+    def _commit(self, name: str, tmp_path: str, size: int) -> None:
+        os.replace(tmp_path, os.path.join(self.directory, name))
+        with self._lock:
+            self._total -= self._files.pop(name, 0)
+            self._files[name] = size
+            self._total += size
+            self._stats["bytes_written"] += size
+            self._evict()
+
+    def _evict(self) -> None:
+        # 오래 안 쓴 순서대로, 전송 중인 파일은 건너뜀 (release() 때 다시 정리)
+        for name in list(self._files):
+            if self._total <= self._max_bytes:
+                break
+            if name in self._in_use:
+                continue
+            size = self._files.pop(name)
+            self._total -= size
+            self._stats["evictions"] += 1
+            try:
+                os.unlink(os.path.join(self.directory, name))
+            except FileNotFoundError:
+                pass
+
+    def stats(self) -> dict:
+        with self._lock:
+            return dict(self._stats, files=len(self._files), bytes=self._total, max_bytes=self._max_bytes, in_use=len(self._in_use))
+
+    def close(self) -> None:
+        metrics.unregister_source(self.metrics_name)
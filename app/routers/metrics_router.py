@@ -0,0 +1,24 @@
+# app/routers/metrics_router.py
+
+import os
+import hmac
+from typing import Optional
+from fastapi import APIRouter, Header, HTTPException
+
+from app import metrics
+
+router = APIRouter(
+    prefix="/metrics", # 최종 URL: /api/metrics
+    tags=["metrics"]
+)
+
+# 설정되어 있으면 X-Metrics-Token 헤더가 일치해야 조회 가능 (미설정 시 공개)
+METRICS_TOKEN = os.getenv("METRICS_TOKEN")
+
+
+@router.get("/")
+def get_metrics(x_metrics_token: Optional[str] = Header(None, alias="X-Metrics-Token")):
+    """DB 풀 등 각 서브시스템이 app.metrics에 등록한 통계를 반환합니다."""
+    if METRICS_TOKEN and not hmac.compare_digest(x_metrics_token or "", METRICS_TOKEN):
+        raise HTTPException(status_code=401, detail="invalid metrics token")
+    return metrics.snapshot()
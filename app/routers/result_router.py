@@ -1,8 +1,16 @@
 # app/routers/result_router.py
 
-from fastapi import APIRouter, WebSocket, WebSocketDisconnect, HTTPException, Request
+from fastapi import APIRouter, WebSocket, WebSocketDisconnect, HTTPException, Request, Depends, Query
+from fastapi.responses import FileResponse, StreamingResponse
+from starlette.concurrency import run_in_threadpool
+from botocore.exceptions import ClientError
 from pydantic import BaseModel
-from typing import Optional
+from typing import List, Optional
+from datetime import datetime
+import os
+import json
+import base64
+from urllib.parse import quote
 
 # websocket manager
 from app.websocket_manager import manager   # manager는 app.websocket_manager에서
@@ -10,22 +18,27 @@ from app.webhook_auth import verify_runpod_signature
 
 # 추가: S3 / DB 클라이언트 임포트
 from app.s3_client import S3Client
-from app.db_client import DBClient
+from app.async_db_client import AsyncDBClient
+from app.job_cache import JobRecordCache
+from app.dependencies import get_db_client, get_s3_client, get_job_cache, get_result_file_cache
+from app.result_file_cache import ResultFileCache
+from app.auth_utils import get_current_user_id
 
 router = APIRouter(
     prefix="/result",
     tags=["analysis_result"]
 )
 
-s3_client = S3Client()
-db_client = DBClient()
-
 # ----------------------------------------------------
 # 1. WebSocket 연결 엔드포인트: /result/ws/analysis/{job_id}
 # ----------------------------------------------------
 
 @router.websocket("/ws/analysis")
-async def websocket_preconnect(websocket: WebSocket):
+async def websocket_preconnect(
+    websocket: WebSocket,
+    db_client: AsyncDBClient = Depends(get_db_client),
+    job_cache: JobRecordCache = Depends(get_job_cache),
+):
     """
     Preconnect endpoint (주석 참고):
     - FE가 먼저 WebSocket을 엽니다.
@@ -107,7 +120,8 @@ async def websocket_preconnect(websocket: WebSocket):
             #    (auth_utils.get_user_id_from_token는 JWT 서명/claims를 검증하여 sub(user id)를 반환)
             from app.auth_utils import get_user_id_from_token
             try:
-                user_id = get_user_id_from_token(token) if token else None
+                # 서명 검증(RSA)과 JWKS 강제 갱신은 동기 코드이므로 이벤트 루프 밖에서 실행
+                user_id = await run_in_threadpool(get_user_id_from_token, token) if token else None
             except Exception as e:
                 print(f"[WS DEBUG] get_user_id_from_token error: {e}")
                 user_id = None
@@ -115,7 +129,8 @@ async def websocket_preconnect(websocket: WebSocket):
 
             # 6) DB에서 job의 소유자(owner)를 조회
             #    (여기서 owner가 없으면 job이 아직 DB에 기록되지 않았거나 job_id가 잘못된 것)
-            owner_id = db_client.get_job_owner(job_id)
+            cached = await job_cache.get(job_id)
+            owner_id = cached.get("user_id") if cached else await db_client.get_job_owner(job_id)
             print(f"[WS DEBUG] lookup owner for job_id={job_id} returned owner_id={owner_id}")
             if owner_id is None:
                 # owner가 없다는 것은 job 레코드가 존재하지 않음 -> 등록 실패
@@ -165,9 +180,27 @@ class WebhookData(BaseModel):
     job_id: str
     s3_result_path: str
 
+async def _write_through_record(job_id: str, db_client: AsyncDBClient, job_cache: JobRecordCache) -> None:
+    """
+    webhook으로 DB를 갱신한 직후 전체 레코드를 캐시에 기록합니다.
+    replica pin은 이 워커에만 있으므로, 무효화만 하면 다른 워커의 폴링이 지연된 replica에서
+    이전 상태를 읽어 캐시에 채울 수 있음 (pin 덕분에 여기서의 조회는 primary로 감).
+    """
+    rec = await db_client.get_upload_record(job_id)
+    if rec:
+        await job_cache.set(job_id, rec)
+    else:
+        await job_cache.invalidate(job_id)
+
+
 # RunPod에서 작업 완료 시 호출하는 Webhook 엔드포인트
 @router.post("/webhook/job/complete", status_code=202) # 202 Accepted
-async def handle_webhook(request: Request):
+async def handle_webhook(
+    request: Request,
+    db_client: AsyncDBClient = Depends(get_db_client),
+    s3_client: S3Client = Depends(get_s3_client),
+    job_cache: JobRecordCache = Depends(get_job_cache),
+):
     # 0) 서명/타임스탬프 검증 (예외 발생 시 401)
     await verify_runpod_signature(request)
 
@@ -188,14 +221,13 @@ async def handle_webhook(request: Request):
             except Exception:
                 s3_paths_json = str(data.get("s3_result_paths"))
 
-        # Use new helper that attempts to write s3_result_paths when available
-        try:
-            db_client.update_upload_status_with_paths(job_id=job_id, status="COMPLETED", s3_result_path=s3_key, s3_result_paths=s3_paths_json)
-        except Exception:
-            # fallback to old API
-            db_client.update_upload_status(job_id=job_id, status="COMPLETED", s3_result_path=s3_key)
+        # s3_result_paths 컬럼 유무는 DB 클라이언트가 캐시한 스키마로 판단 (재시도 불필요)
+        await db_client.update_upload_status_with_paths(job_id=job_id, status="COMPLETED", s3_result_path=s3_key, s3_result_paths=s3_paths_json)
+        # write-through: 폴링 중인 클라이언트가 캐시에서 바로 COMPLETED를 보도록 갱신
+        await _write_through_record(job_id, db_client, job_cache)
     except Exception as e:
         print(f"[DB Update Error] job_id={job_id} error={e}")
+        await job_cache.invalidate(job_id)
 
     # 3) presigned GET 생성: primary 하나뿐 아니라 전달된 모든 경로에 대해 presigned URL을 생성
     presigned_urls = []
@@ -243,57 +275,431 @@ async def handle_webhook(request: Request):
     return response_body
 
 
+# RunPod 워커가 작업을 집어 들었을 때 호출 (UPLOADED -> PROCESSING)
+@router.post("/webhook/job/started", status_code=202)
+async def handle_started_webhook(
+    request: Request,
+    db_client: AsyncDBClient = Depends(get_db_client),
+    job_cache: JobRecordCache = Depends(get_job_cache),
+):
+    await verify_runpod_signature(request)
+
+    data = await request.json()
+    job_id = data.get("job_id")
+    if not job_id:
+        raise HTTPException(status_code=400, detail="job_id required")
+
+    # PENDING/UPLOADED에서만 전환: 완료 webhook보다 늦게 도착해도 COMPLETED를 되돌리지 않음
+    try:
+        changed = await db_client.mark_processing(job_id)
+    except Exception as e:
+        print(f"[DB Update Error] job_id={job_id} error={e}")
+        raise HTTPException(status_code=503, detail="failed to record job start")
+    if changed:
+        try:
+            await _write_through_record(job_id, db_client, job_cache)
+        except Exception as e:
+            print(f"[JobCache] write-through 실패 job_id={job_id} error={e}")
+            await job_cache.invalidate(job_id)
+
+    return {"job_id": job_id, "changed": changed}
+
+
+def _result_keys(rec: dict) -> List[str]:
+    """COMPLETED 레코드의 결과 S3 키 목록 (s3_result_paths 우선, 없으면 s3_result_path). 그 외 상태는 빈 리스트."""
+    if rec.get("status") != "COMPLETED":
+        return []
+    s3_key = rec.get("s3_result_path")
+    s3_paths = rec.get("s3_result_paths")
+    if s3_paths:
+        # s3_result_paths might be stored as JSON string by the DB client
+        try:
+            keys = json.loads(s3_paths) if isinstance(s3_paths, str) else s3_paths
+        except Exception:
+            # not JSON — treat as a single path string
+            keys = [s3_paths]
+        if isinstance(keys, str):
+            keys = [keys]
+        return [k for k in keys if k]
+    if s3_key:
+        return [s3_key]
+    return []
+
+
+async def _get_job_record(job_id: str, db_client: AsyncDBClient, job_cache: JobRecordCache) -> dict:
+    """job 레코드 조회: 캐시 우선, 미스일 때만 DB 조회 후 캐시에 저장. 없으면 404."""
+    rec = await job_cache.get(job_id)
+    if rec is None:
+        try:
+            rec = await db_client.get_upload_record(job_id)
+        except Exception as e:
+            print(f"[DB Error] get_upload_record job_id={job_id} error={e}")
+            raise HTTPException(status_code=500, detail="internal error")
+        if rec:
+            await job_cache.fill(job_id, rec)
+
+    if not rec:
+        raise HTTPException(status_code=404, detail="job not found")
+    return rec
+
+
 # ----------------------------------------------------
 # 3. 폴링용 상태 조회 엔드포인트: /result/status
 #    클라이언트(프론트)는 주기적으로 이 엔드포인트를 호출하여
 #    job 상태와 presigned result URL을 확인합니다.
 # ----------------------------------------------------
 @router.get("/status")
-async def get_result_status(job_id: str):
+async def get_result_status(
+    job_id: str,
+    db_client: AsyncDBClient = Depends(get_db_client),
+    s3_client: S3Client = Depends(get_s3_client),
+    job_cache: JobRecordCache = Depends(get_job_cache),
+):
     if not job_id:
         raise HTTPException(status_code=400, detail="job_id is required")
 
-    # DB에서 job 레코드 조회
-    try:
-        rec = db_client.get_upload_record(job_id)
-    except Exception as e:
-        print(f"[DB Error] get_upload_record job_id={job_id} error={e}")
-        raise HTTPException(status_code=500, detail="internal error")
-
-    if not rec:
-        raise HTTPException(status_code=404, detail="job not found")
+    rec = await _get_job_record(job_id, db_client, job_cache)
 
     status = rec.get("status")
-    s3_key = rec.get("s3_result_path")
-    s3_paths = rec.get("s3_result_paths")
 
     # If the job is COMPLETED, prefer to return all presigned URLs if available
     result_urls = None
-    if status == "COMPLETED":
-        keys = None
-        if s3_paths:
-            # s3_result_paths might be stored as JSON string by the DB client
-            try:
-                import json as _json
-                keys = _json.loads(s3_paths) if isinstance(s3_paths, str) else s3_paths
-            except Exception:
-                # not JSON — treat as a single path string
-                keys = [s3_paths]
-        elif s3_key:
-            keys = [s3_key]
-
-        if keys:
-            presigned_list = []
-            for key in keys:
-                try:
-                    presigned_list.append(s3_client.create_presigned_get_url(key))
-                except Exception as e:
-                    print(f"[S3 Presign Error] key={key} error={e}")
-                    # skip failing keys
-
-            if presigned_list:
-                result_urls = presigned_list
+    keys = _result_keys(rec)
+    if keys:
+        presigned = s3_client.create_presigned_get_urls(keys)
+        result_urls = [presigned[k] for k in keys if k in presigned] or None
 
     # For backward compatibility, include single result_url as first item if present
     single = result_urls[0] if result_urls else None
-    return {"job_id": job_id, "status": status, "result_url": single, "result_urls": result_urls}
\ No newline at end of file
+    return {"job_id": job_id, "status": status, "result_url": single, "result_urls": result_urls}
+
+
+# ----------------------------------------------------
+# 4. 다건 상태 조회 엔드포인트: POST /result/status/batch
+#    여러 업로드를 추적하는 클라이언트/대시보드용. DB는 IN (...) 한 번,
+#    COMPLETED job들의 결과 키는 한 번에 모아 서명합니다.
+#    존재하지 않는 job_id는 요청 전체를 실패시키지 않고 항목별 error로 반환합니다.
+# ----------------------------------------------------
+BATCH_STATUS_MAX_JOBS = int(os.getenv("BATCH_STATUS_MAX_JOBS", "100"))
+
+class BatchStatusPayload(BaseModel):
+    job_ids: List[str]
+
+@router.post("/status/batch")
+async def get_result_status_batch(
+    payload: BatchStatusPayload,
+    db_client: AsyncDBClient = Depends(get_db_client),
+    s3_client: S3Client = Depends(get_s3_client),
+    job_cache: JobRecordCache = Depends(get_job_cache),
+):
+    # 순서 유지 + 중복 제거
+    job_ids = list(dict.fromkeys(j for j in payload.job_ids if j))
+    if not job_ids:
+        raise HTTPException(status_code=400, detail="job_ids is required")
+    if len(job_ids) > BATCH_STATUS_MAX_JOBS:
+        raise HTTPException(status_code=400, detail=f"too many job_ids (max {BATCH_STATUS_MAX_JOBS})")
+
+    # 1) 캐시에서 먼저 찾고, 미스만 DB에서 한 번에 조회
+    records = {}
+    misses = []
+    for job_id in job_ids:
+        rec = await job_cache.get(job_id)
+        if rec is None:
+            misses.append(job_id)
+        else:
+            records[job_id] = rec
+    if misses:
+        try:
+            fetched = await db_client.get_upload_records(misses)
+        except Exception as e:
+            print(f"[DB Error] get_upload_records count={len(misses)} error={e}")
+            raise HTTPException(status_code=500, detail="internal error")
+        for job_id, rec in fetched.items():
+            records[job_id] = rec
+            await job_cache.fill(job_id, rec)
+
+    # 2) COMPLETED job들의 결과 키를 모아 한 번에 presign
+    keys_by_job = {job_id: _result_keys(rec) for job_id, rec in records.items()}
+    presigned = s3_client.create_presigned_get_urls(k for keys in keys_by_job.values() for k in keys)
+
+    # 3) 요청 순서대로 항목별 결과 구성
+    results = []
+    for job_id in job_ids:
+        rec = records.get(job_id)
+        if not rec:
+            results.append({"job_id": job_id, "error": "job_not_found"})
+            continue
+        result_urls = [presigned[k] for k in keys_by_job[job_id] if k in presigned] or None
+        results.append({
+            "job_id": job_id,
+            "status": rec.get("status"),
+            "result_url": result_urls[0] if result_urls else None,
+            "result_urls": result_urls,
+        })
+    return {"results": results}
+
+
+# ----------------------------------------------------
+# 5. 사용자별 job 이력: GET /result/jobs
+#    최신순, OFFSET 대신 keyset 커서(next_cursor)로 다음 페이지 조회.
+#    (user_id, created_at) 인덱스 필요: python -m app.migrate
+# ----------------------------------------------------
+JOB_HISTORY_MAX_LIMIT = 100
+
+def _encode_cursor(created_at, job_id: str) -> str:
+    value = created_at.isoformat() if isinstance(created_at, datetime) else str(created_at)
+    raw = json.dumps({"t": value, "id": job_id}, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+def _decode_cursor(cursor: str):
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        data = json.loads(raw)
+        return datetime.fromisoformat(data["t"]), str(data["id"])
+    except Exception:
+        raise HTTPException(status_code=400, detail="invalid cursor")
+
+@router.get("/jobs")
+async def list_my_jobs(
+    limit: int = Query(20, ge=1, le=JOB_HISTORY_MAX_LIMIT),
+    cursor: Optional[str] = None,
+    status: Optional[str] = Query(None, max_length=32),
+    user_id: Optional[str] = Depends(get_current_user_id),
+    db_client: AsyncDBClient = Depends(get_db_client),
+):
+    if not user_id:
+        raise HTTPException(status_code=401, detail="Authentication required")
+
+    before = _decode_cursor(cursor) if cursor else None
+    try:
+        # 한 개 더 가져와서 다음 페이지 존재 여부 판단
+        jobs = await db_client.list_user_jobs(user_id, limit=limit + 1, before=before, status=status)
+    except Exception as e:
+        print(f"[DB Error] list_user_jobs user_id={user_id} error={e}")
+        raise HTTPException(status_code=500, detail="internal error")
+
+    next_cursor = None
+    if len(jobs) > limit:
+        jobs = jobs[:limit]
+        last = jobs[-1]
+        next_cursor = _encode_cursor(last["created_at"], last["job_id"])
+
+    for job in jobs:
+        if isinstance(job.get("created_at"), datetime):
+            job["created_at"] = job["created_at"].isoformat()
+    return {"jobs": jobs, "next_cursor": next_cursor}
+
+
+# ----------------------------------------------------
+# 6. 결과 파일 프록시: GET /result/{job_id}/files/{index}
+#    S3에 직접 접근할 수 없는 클라이언트용. 결과 파일을 백엔드를 거쳐 스트리밍하고(Range 지원),
+#    (S3 key, ETag) 기준 로컬 디스크 LRU 캐시로 같은 스윙을 다시 볼 때 S3 다운로드를 생략합니다.
+# ----------------------------------------------------
+RESULT_PROXY_CHUNK_SIZE = 256 * 1024
+
+
+def _parse_byte_range(value: str, size: int) -> Optional[tuple]:
+    """
+    단일 구간 Range 헤더("bytes=a-b", "bytes=a-", "bytes=-n")를 (start, end) (end 포함)로 변환합니다.
+    여러 구간이거나 해석할 수 없으면 None (S3에 그대로 넘겨 처리/416을 맡김).
+    """
+    unit, _, spec = value.strip().partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return None
+    first, sep, last = spec.strip().partition("-")
+    if not sep:
+        return None
+    try:
+        if first:
+            start = int(first)
+            end = int(last) if last else size - 1
+        else:
+            start, end = max(size - int(last), 0), size - 1
+    except ValueError:
+        return None
+    if start < 0 or start > end or start >= size:
+        return None
+    return start, min(end, size - 1)
+
+
+def _content_disposition(filename: str) -> str:
+    """Starlette FileResponse와 같은 방식: ASCII가 아니거나 따옴표 등이 있으면 RFC 5987 filename*로 인코딩."""
+    quoted = quote(filename)
+    if quoted != filename:
+        return f"inline; filename*=utf-8''{quoted}"
+    return f'inline; filename="{filename}"'
+
+
+class _S3ProxyResponse(StreamingResponse):
+    """
+    S3 GetObject 스트림에서 [start, end] 구간만 클라이언트에 보내고, open_writer가 있으면 객체 전체를 디스크 캐시에 기록.
+    - 캐시 파일(.part)은 스트림을 실제로 읽기 시작할 때 엶
+    - 응답이 어떻게 끝나든(정상/클라이언트 끊김/전송 전 실패) __call__의 finally에서 S3 스트림과 캐시 파일을 정리
+    - 캐시 대상이면 클라이언트가 구간만 받고 끊어도(<video>의 bytes=0- 요청) 나머지를 받아 캐시를 완성
+    """
+
+    def __init__(self, body, start: int, end: int, open_writer=None, **kwargs):
+        self._body = body
+        self._start = start
+        self._end = end
+        self._open_writer = open_writer
+        self._writer = None
+        self._pos = 0
+        self._failed = False
+        super().__init__(self._iter_range(), **kwargs)
+
+    def _ensure_writer(self):
+        if self._writer is None and self._open_writer is not None:
+            self._writer = self._open_writer()
+            self._open_writer = None
+        return self._writer
+
+    def _iter_range(self):
+        writer = self._ensure_writer()
+        try:
+            for chunk in self._body.iter_chunks(RESULT_PROXY_CHUNK_SIZE):
+                if writer is not None:
+                    writer.write(chunk)
+                offset = self._pos
+                self._pos += len(chunk)
+                lo = max(self._start - offset, 0)
+                hi = min(self._end + 1 - offset, len(chunk))
+                if lo < hi:
+                    yield chunk[lo:hi]
+                if self._pos > self._end:
+                    break
+        except Exception:
+            self._failed = True
+            raise
+
+    def _finish(self) -> None:
+        try:
+            if self._failed:
+                # S3 스트림 오류: 반쪽 캐시 파일은 버림
+                if self._writer is not None:
+                    self._writer.abort()
+                return
+            # 요청 구간 뒤의 나머지를 받아 캐시 파일 완성 (전송 전에 끝났으면 여기서 처음부터 읽음)
+            # commit()은 길이가 객체 크기와 맞을 때만 캐시에 등록
+            writer = self._ensure_writer()
+            if writer is not None:
+                for chunk in self._body.iter_chunks(RESULT_PROXY_CHUNK_SIZE):
+                    writer.write(chunk)
+                writer.commit()
+        except Exception as e:
+            print(f"[Result Proxy] cache fill failed: {e}")
+            if self._writer is not None:
+                self._writer.abort()
+        finally:
+            self._body.close()
+
+    async def __call__(self, scope, receive, send):
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            await run_in_threadpool(self._finish)
+
+
+class _CachedFileResponse(FileResponse):
+    """디스크 캐시 파일 응답: 전송이 끝나면(중간에 끊겨도) 캐시의 사용 표시를 해제."""
+
+    def __init__(self, *args, release, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._release = release
+
+    async def __call__(self, scope, receive, send):
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            self._release()
+
+
+@router.get("/{job_id}/files/{index}")
+async def get_result_file(
+    job_id: str,
+    index: int,
+    request: Request,
+    user_id: Optional[str] = Depends(get_current_user_id),
+    db_client: AsyncDBClient = Depends(get_db_client),
+    s3_client: S3Client = Depends(get_s3_client),
+    job_cache: JobRecordCache = Depends(get_job_cache),
+    file_cache: ResultFileCache = Depends(get_result_file_cache),
+):
+    if not user_id:
+        raise HTTPException(status_code=401, detail="Authentication required")
+
+    rec = await _get_job_record(job_id, db_client, job_cache)
+    if rec.get("user_id") != user_id:
+        raise HTTPException(status_code=403, detail="forbidden")
+    keys = _result_keys(rec)
+    if not 0 <= index < len(keys):
+        raise HTTPException(status_code=404, detail="result file not found")
+    key = keys[index]
+
+    try:
+        meta = await run_in_threadpool(s3_client.head_result_object, key)
+    except ClientError as e:
+        print(f"[S3 Error] head_object key={key} error={e}")
+        raise HTTPException(status_code=404, detail="result file not found")
+    except Exception as e:
+        print(f"[S3 Error] head_object key={key} error={e}")
+        raise HTTPException(status_code=502, detail="failed to read result file")
+
+    filename = os.path.basename(key)
+    headers = {"ETag": meta["etag"], "Cache-Control": "private, max-age=3600"}
+
+    # 1) 디스크 캐시 적중: Range/If-Range 처리는 FileResponse에 맡김
+    #    get()이 사용 중으로 표시하므로 전송이 끝날 때까지 evict되지 않음
+    cached_path = file_cache.get(key, meta["etag"])
+    if cached_path is not None:
+        try:
+            stat_result = os.stat(cached_path)
+        except FileNotFoundError:
+            file_cache.discard(key, meta["etag"])
+        else:
+            return _CachedFileResponse(
+                cached_path, media_type=meta["content_type"], filename=filename, headers=headers,
+                content_disposition_type="inline", stat_result=stat_result,
+                release=lambda: file_cache.release(key, meta["etag"]),
+            )
+
+    # 2) 캐시 미스
+    byte_range = request.headers.get("range")
+    if_range = request.headers.get("if-range")
+    if byte_range and if_range is not None and if_range != meta["etag"]:
+        # 클라이언트가 가진 버전과 다르면(또는 날짜 형식이라 비교할 수 없으면) 전체를 200으로 보냄
+        byte_range = None
+    size = meta["size"]
+    wanted = _parse_byte_range(byte_range, size) if byte_range else (0, size - 1)
+    # 전체 요청이나 처음부터 시작하는 구간(<video>/모바일 플레이어의 첫 요청 bytes=0-)은 객체 전체를 받아
+    # 요청 구간을 내보내면서 캐시에 기록. 중간 위치 탐색(seek)은 첫 바이트 지연을 피하려고 해당 구간만 전달
+    fill_cache = wanted is not None and wanted[0] == 0 and file_cache.can_store(size)
+    s3_range = None if fill_cache or not byte_range else byte_range
+    try:
+        obj = await run_in_threadpool(s3_client.get_result_object, key, s3_range, meta["etag"])
+    except ClientError as e:
+        code = e.response.get("Error", {}).get("Code")
+        if code == "InvalidRange":
+            raise HTTPException(status_code=416, detail="range not satisfiable", headers={"Content-Range": f"bytes */{size}"})
+        print(f"[S3 Error] get_object key={key} error={e}")
+        raise HTTPException(status_code=502, detail="failed to read result file")
+
+    headers.update({"Accept-Ranges": "bytes", "Content-Disposition": _content_disposition(filename)})
+    status_code = 200
+    if s3_range:
+        # S3가 잘라 준 구간을 그대로 전달 (캐시하지 않음)
+        start, end = 0, obj["ContentLength"] - 1
+        if obj.get("ContentRange"):
+            headers["Content-Range"] = obj["ContentRange"]
+            status_code = 206
+    else:
+        start, end = wanted if byte_range and wanted else (0, size - 1)
+        if byte_range and wanted:
+            headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+            status_code = 206
+    headers["Content-Length"] = str(end - start + 1)
+    open_writer = (lambda: file_cache.writer(key, meta["etag"], size)) if fill_cache else None
+    return _S3ProxyResponse(
+        obj["Body"], start, end, open_writer=open_writer,
+        status_code=status_code, media_type=meta["content_type"], headers=headers,
+    )
@@ -1,23 +1,70 @@
 # backend-api/routers/upload_router.py
 
-from fastapi import APIRouter, Depends, HTTPException, Body
-from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Body, Request
+from typing import List, Literal, Optional
 from pydantic import BaseModel, Field
 from uuid import uuid4
+from starlette.concurrency import run_in_threadpool
+from botocore.exceptions import ClientError
 import os
+import hmac
+import asyncio
+import hashlib
 import logging
 import traceback
 from datetime import datetime
 
 # 로컬 모듈 임포트
-from app.db_client import DBClient
+from app.async_db_client import AsyncDBClient
+from app.db_common import (
+    UploadIntent, MULTIPART_STATE_INITIATED, MULTIPART_STATE_COMPLETED, MULTIPART_STATE_ABORTED,
+    UPLOADED_STATUS, AWAITING_UPLOAD_STATUSES,
+)
 from app.s3_client import S3Client
 from app.auth_utils import get_current_user_id 
+from app.job_cache import JobRecordCache
+from app.dependencies import get_db_client, get_s3_client, get_job_cache, get_upload_events
+from app.upload_events import UploadEventConsumer
 
 # 환경 변수에서 S3 버킷 이름 로드 (s3_client에서 사용)
 S3_VIDEO_BUCKET_NAME = os.getenv("S3_VIDEO_BUCKET_NAME")
 S3_RESULT_BUCKET_NAME = os.getenv("S3_RESULT_BUCKET_NAME")
 
+# 한 번의 배치 업로드 요청에서 등록할 수 있는 최대 파일 수
+UPLOAD_BATCH_MAX_FILES = int(os.getenv("UPLOAD_BATCH_MAX_FILES", "20"))
+
+# S3 키 레이아웃 (DB의 s3_key_layout 컬럼에 행마다 기록되므로 바꿔도 기존 키는 그대로 사용 가능)
+# - v1: [소유자 ID]/[업로드 소스]/[UUID].[확장자]
+# - v2: [해시 샤드]/[소유자 ID]/[업로드 소스]/[UUID].[확장자]
+#   S3는 prefix 단위로 요청 처리량이 늘어나므로, 한 사용자의 몰린 업로드도 여러 prefix로 분산됨
+S3_KEY_LAYOUTS = ("v1", "v2")
+S3_KEY_LAYOUT = os.getenv("S3_KEY_LAYOUT", "v1")
+if S3_KEY_LAYOUT not in S3_KEY_LAYOUTS:
+    print(f"[Config Warning] unknown S3_KEY_LAYOUT={S3_KEY_LAYOUT}, using v1")
+    S3_KEY_LAYOUT = "v1"
+S3_KEY_SHARD_CHARS = int(os.getenv("S3_KEY_SHARD_CHARS", "2"))  # hex 2자리 = 256개 prefix
+if not 1 <= S3_KEY_SHARD_CHARS <= 64:  # sha256 hex digest 길이
+    print(f"[Config Warning] S3_KEY_SHARD_CHARS={S3_KEY_SHARD_CHARS} out of range 1..64, using 2")
+    S3_KEY_SHARD_CHARS = 2
+
+# 멀티파트 업로드 파트 크기 (S3 제약: 마지막 파트 외 최소 5MiB, 파트당 최대 5GiB, 최대 10,000파트, 객체 최대 5TiB)
+MULTIPART_PART_SIZE = int(os.getenv("MULTIPART_PART_SIZE", str(16 * 1024 * 1024)))
+_MULTIPART_MIN_PART_SIZE = 5 * 1024 * 1024
+_MULTIPART_MAX_PART_SIZE = 5 * 1024 ** 3
+_MULTIPART_MAX_PARTS = 10000
+_MULTIPART_MAX_OBJECT_SIZE = 5 * 1024 ** 4
+
+# S3 단일 POST 업로드 최대 크기 (초과 시 멀티파트 사용)
+_PRESIGNED_POST_MAX_SIZE = 5 * 1024 ** 3
+
+# HeadObject가 "객체 없음"일 때의 오류 코드 (HEAD 응답에는 본문이 없어 보통 "404")
+_S3_NOT_FOUND_CODES = {"404", "NoSuchKey", "NotFound"}
+# CompleteMultipartUpload 오류 중 클라이언트가 고칠 수 있는 것 (나머지는 S3 쪽 문제 -> 502)
+_MULTIPART_CLIENT_ERROR_CODES = {"InvalidPart", "InvalidPartOrder", "NoSuchUpload", "EntityTooSmall"}
+
+# S3 이벤트 알림 webhook 인증 토큰 (MinIO notify_webhook auth_token). 미설정 시 엔드포인트 비활성화
+S3_EVENT_WEBHOOK_TOKEN = os.getenv("S3_EVENT_WEBHOOK_TOKEN")
+
 # 로거 설정
 logger = logging.getLogger(__name__)
 
@@ -26,8 +73,6 @@ router = APIRouter(
     prefix="/upload", # main.py에서 /api와 결합되어 최종 URL: /api/upload
     tags=["upload"]
 )
-db_client = DBClient()
-s3_client = S3Client()
 
 # 클라이언트로부터 받을 요청 본문 구조
 class UploadStartPayload(BaseModel):
@@ -39,10 +84,30 @@ class UploadStartPayload(BaseModel):
 
     # 비회원 식별자 (선택 사항)
     non_member_identifier: Optional[str] = None
+
+    # put: presigned PUT URL (기존 방식)
+    # post: presigned POST 폼 - S3가 크기(file_size_bytes)와 Content-Type(file_type)을 정책으로 강제
+    upload_mode: Literal["put", "post"] = "put"
     
+class UploadBatchPayload(BaseModel):
+    # 여러 스윙 영상을 한 번에 등록 (DB에는 multi-row INSERT 한 번으로 기록)
+    files: List[UploadStartPayload] = Field(..., min_length=1)
+
+class MultipartPresignPayload(BaseModel):
+    # 다시 받을(실패한) 파트 번호 목록
+    part_numbers: List[int] = Field(..., min_length=1)
+
+class MultipartCompletePart(BaseModel):
+    part_number: int
+    etag: str
+
+class MultipartCompletePayload(BaseModel):
+    # 클라이언트가 각 파트 PUT 응답의 ETag 헤더를 모아 전달
+    parts: List[MultipartCompletePart] = Field(..., min_length=1)
+
 # S3 Key 생성 로직 (사용자 ID, 소스, UUID를 조합하여 고유 경로 생성)
-def create_s3_key(user_id: Optional[str], non_member_id: Optional[str], source: str, file_type: str) -> str:
-    """S3 버킷 내에 저장될 고유한 키 경로를 생성합니다."""
+def create_s3_key(user_id: Optional[str], non_member_id: Optional[str], source: str, file_type: str, layout: str = S3_KEY_LAYOUT) -> str:
+    """S3 버킷 내에 저장될 고유한 키 경로를 생성합니다. (layout: S3_KEY_LAYOUTS 중 하나)"""
     # 소유자 식별자를 우선 사용
     owner_id = user_id if user_id else (non_member_id if non_member_id else "unknown")
     
@@ -59,15 +124,51 @@ def create_s3_key(user_id: Optional[str], non_member_id: Optional[str], source:
     
     # 최종 S3 Key 구조: [소유자 ID]/[업로드 소스]/[UUID].[확장자]
     s3_key = f"{owner_id}/{source.lower()}/{upload_uuid}.{ext}"
+    if layout == "v2":
+        # job(UUID)마다 샤드가 달라지도록 UUID의 해시 앞자리를 prefix로 사용
+        shard = hashlib.sha256(upload_uuid.encode()).hexdigest()[:S3_KEY_SHARD_CHARS]
+        s3_key = f"{shard}/{s3_key}"
     
     # 💡 수정: S3 Key와 함께 Job ID로 사용할 upload_uuid를 함께 반환
     return s3_key, upload_uuid # websocket을 위해 프론트도 작업 id를 알아야함
 
 
+def _check_upload_mode(payload: UploadStartPayload) -> None:
+    if payload.upload_mode == "post" and not 0 < payload.file_size_bytes <= _PRESIGNED_POST_MAX_SIZE:
+        raise HTTPException(status_code=400, detail=f"file_size_bytes must be 1..{_PRESIGNED_POST_MAX_SIZE} for upload_mode=post (use /multipart for larger files)")
+
+
+def _presign_upload(s3_client: S3Client, s3_key: str, payload: UploadStartPayload) -> dict:
+    """upload_mode에 맞는 업로드 대상을 응답 필드로 반환합니다."""
+    if payload.upload_mode == "post":
+        return {
+            "upload_mode": "post",
+            "presigned_post": s3_client.create_presigned_post(s3_key, payload.file_type, payload.file_size_bytes),
+        }
+    return {
+        "upload_mode": "put",
+        "presigned_url": s3_client.create_presigned_url(s3_key, payload.file_type, payload.file_size_bytes),
+    }
+
+
+def _initial_record(job_id: str, user_id: Optional[str], status: str) -> dict:
+    """업로드 직후 캐시에 기록할 job 레코드 (get_upload_record와 같은 형태)."""
+    return {
+        "job_id": job_id,
+        "user_id": user_id,
+        "status": status,
+        "s3_result_path": None,
+        "s3_result_paths": None,
+    }
+
+
 @router.post("/")
 async def start_upload(
     payload: UploadStartPayload,
-    user_id: Optional[str] = Depends(get_current_user_id)
+    user_id: Optional[str] = Depends(get_current_user_id),
+    db_client: AsyncDBClient = Depends(get_db_client),
+    s3_client: S3Client = Depends(get_s3_client),
+    job_cache: JobRecordCache = Depends(get_job_cache),
 ):
     """
     업로드 시작: S3 presigned URL 생성, DB에 업로드 intent 기록 후 presigned_url 반환
@@ -75,21 +176,24 @@ async def start_upload(
     # 보안 강화: 반드시 인증된 사용자만 업로드 허용
     if not user_id:
         raise HTTPException(status_code=401, detail="Authentication required for upload")
+    _check_upload_mode(payload)
     
     try:
         # 1) S3 키 생성
         s3_key, job_id = create_s3_key(user_id, payload.non_member_identifier, payload.upload_source, payload.file_type)
 
-        # 2) presigned URL 생성
+        # 2) presigned URL(PUT) 또는 presigned POST 폼 생성 (payload.upload_mode)
         try:
-            presigned_url = s3_client.create_presigned_url(s3_key, payload.file_type, payload.file_size_bytes)
-            print(f"Generated presigned URL: {presigned_url}")
+            upload_target = _presign_upload(s3_client, s3_key, payload)
+            print(f"Generated presigned {upload_target['upload_mode'].upper()} for key: {s3_key}")
         except Exception as e:
             raise HTTPException(status_code=500, detail=f"S3 presigned URL 생성 실패: {e}")
 
-        # 3) DB에 업로드 intent 기록 (메서드 시그니처에 맞춰 인자 전달)
+        # 3) DB에 업로드 intent 기록: 초기 상태 PENDING을 INSERT 한 문장에 포함 (insert 후 update 왕복 제거)
+        #    PENDING -> UPLOADED (complete/S3 이벤트) -> PROCESSING (워커 시작 webhook) -> COMPLETED
+        status = 'PENDING'
         try:
-            inserted_id = db_client.insert_upload_intent(
+            inserted_id = await db_client.insert_upload_intent(
                 job_id=job_id,
                 user_id=user_id,
                 non_member_identifier=payload.non_member_identifier,
@@ -97,21 +201,19 @@ async def start_upload(
                 s3_key=s3_key,
                 filename=payload.original_filename,
                 filetype=payload.file_type,
-                file_size_bytes=payload.file_size_bytes
+                file_size_bytes=payload.file_size_bytes,
+                status=status,
+                s3_key_layout=S3_KEY_LAYOUT,
             )
             print(f"DB record created with Job ID: {inserted_id}")
         except Exception as e:
             raise HTTPException(status_code=500, detail=f"DB 기록 실패: {e}")
 
-        # 3.a) 상태 업데이트: presigned URL 생성 직후, 프론트에 전달 전 S3_PUTING으로 기록
-        try:
-            db_client.update_upload_status(job_id=job_id, status='PROCESSING')
-        except Exception as e:
-            # 로그만 남기고 계속 진행 (프로토타입)
-            print(f"[DB Update Warning] Failed to set PROCESSING for job_id={job_id}: {e}")
+        # 3.a) job 레코드 캐시에 write-through (직후의 상태 폴링이 DB까지 가지 않도록)
+        await job_cache.set(job_id, _initial_record(job_id, user_id, status))
 
-        # 4) presigned URL과 S3 Key 반환
-        return {"presigned_url": presigned_url, 
+        # 4) presigned URL(또는 POST 폼)과 job_id 반환
+        return {**upload_target,
                 "job_id": job_id}
     except Exception as e:
         # 서버 콘솔에 전체 스택트레이스 출력 (디버그용)
@@ -120,4 +222,399 @@ async def start_upload(
         logger.error(traceback_str)
 
         # 개발/디버그 편의로 상세 메시지 응답 (운영에서는 숨길 것)
-        raise HTTPException(status_code=500, detail=f"internal error: {str(e)}")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=f"internal error: {str(e)}")
+
+
+@router.post("/batch")
+async def start_upload_batch(
+    payload: UploadBatchPayload,
+    user_id: Optional[str] = Depends(get_current_user_id),
+    db_client: AsyncDBClient = Depends(get_db_client),
+    s3_client: S3Client = Depends(get_s3_client),
+    job_cache: JobRecordCache = Depends(get_job_cache),
+):
+    """
+    배치 업로드 시작: 파일별 presigned URL을 만들고, 모든 업로드 intent를 한 문장으로 DB에 기록합니다.
+    하나라도 실패하면 아무 레코드도 남지 않습니다.
+    """
+    if not user_id:
+        raise HTTPException(status_code=401, detail="Authentication required for upload")
+    if len(payload.files) > UPLOAD_BATCH_MAX_FILES:
+        raise HTTPException(status_code=400, detail=f"too many files (max {UPLOAD_BATCH_MAX_FILES})")
+    for f in payload.files:
+        _check_upload_mode(f)
+
+    status = 'PENDING'
+    intents = []
+    uploads = []
+    try:
+        for f in payload.files:
+            s3_key, job_id = create_s3_key(user_id, f.non_member_identifier, f.upload_source, f.file_type)
+            upload_target = _presign_upload(s3_client, s3_key, f)
+            intents.append(UploadIntent(
+                job_id=job_id,
+                user_id=user_id,
+                non_member_identifier=f.non_member_identifier,
+                upload_source=f.upload_source,
+                s3_key=s3_key,
+                filename=f.original_filename,
+                filetype=f.file_type,
+                file_size_bytes=f.file_size_bytes,
+                s3_key_layout=S3_KEY_LAYOUT,
+            ))
+            uploads.append({**upload_target, "job_id": job_id})
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"S3 presigned URL 생성 실패: {e}")
+
+    try:
+        await db_client.insert_upload_intents(intents, status=status)
+    except Exception as e:
+        logger.error("start_upload_batch DB 기록 실패: %s", e)
+        raise HTTPException(status_code=500, detail=f"DB 기록 실패: {e}")
+
+    for intent in intents:
+        await job_cache.set(intent.job_id, _initial_record(intent.job_id, user_id, status))
+
+    return {"uploads": uploads}
+
+
+# ----------------------------------------------------
+# 멀티파트 업로드 (대용량 3D 캡처 zip): 시작 -> 파트 병렬 PUT -> complete / abort
+# ----------------------------------------------------
+def _multipart_layout(file_size_bytes: int) -> tuple:
+    """(part_size, part_count): 기본 MULTIPART_PART_SIZE, 10,000파트를 넘으면 파트 크기를 키움."""
+    # file_size_bytes는 start_multipart_upload에서 1.._MULTIPART_MAX_OBJECT_SIZE로 검증됨
+    # -> 10,000파트로 나눠도 파트 크기는 5GiB 이하
+    part_size = min(max(MULTIPART_PART_SIZE, _MULTIPART_MIN_PART_SIZE), _MULTIPART_MAX_PART_SIZE)
+    if -(-file_size_bytes // part_size) > _MULTIPART_MAX_PARTS:
+        part_size = -(-file_size_bytes // _MULTIPART_MAX_PARTS)
+    return part_size, -(-file_size_bytes // part_size)
+
+
+async def _get_owned_multipart(db_client: AsyncDBClient, job_id: str, user_id: Optional[str]) -> dict:
+    if not user_id:
+        raise HTTPException(status_code=401, detail="Authentication required for upload")
+    try:
+        upload = await db_client.get_multipart_upload(job_id)
+    except Exception as e:
+        print(f"[DB Error] get_multipart_upload job_id={job_id} error={e}")
+        raise HTTPException(status_code=500, detail="internal error")
+    if not upload:
+        raise HTTPException(status_code=404, detail="multipart upload not found")
+    if upload["user_id"] != user_id:
+        raise HTTPException(status_code=403, detail="forbidden")
+    return upload
+
+
+def _check_part_numbers(upload: dict, part_numbers: List[int]) -> None:
+    invalid = [n for n in part_numbers if not 1 <= n <= upload["part_count"]]
+    if invalid:
+        raise HTTPException(status_code=400, detail=f"invalid part numbers (1..{upload['part_count']}): {invalid}")
+
+
+def _require_initiated(upload: dict) -> None:
+    if upload["state"] != MULTIPART_STATE_INITIATED:
+        raise HTTPException(status_code=409, detail=f"multipart upload already {upload['state']}")
+
+
+@router.post("/multipart")
+async def start_multipart_upload(
+    payload: UploadStartPayload,
+    user_id: Optional[str] = Depends(get_current_user_id),
+    db_client: AsyncDBClient = Depends(get_db_client),
+    s3_client: S3Client = Depends(get_s3_client),
+    job_cache: JobRecordCache = Depends(get_job_cache),
+):
+    """
+    멀티파트 업로드 시작: S3 UploadId 발급, DB에 intent + 파트 분할 정보 기록,
+    모든 파트의 presigned PUT URL을 한 번에 반환합니다.
+    연결이 끊겨도 GET /{job_id}/parts로 이어 올릴 수 있으므로 모바일(2D) 업로드에도 사용합니다.
+    """
+    if not user_id:
+        raise HTTPException(status_code=401, detail="Authentication required for upload")
+    if not 0 < payload.file_size_bytes <= _MULTIPART_MAX_OBJECT_SIZE:
+        raise HTTPException(status_code=400, detail=f"file_size_bytes must be 1..{_MULTIPART_MAX_OBJECT_SIZE} for multipart upload")
+
+    s3_key, job_id = create_s3_key(user_id, payload.non_member_identifier, payload.upload_source, payload.file_type)
+    part_size, part_count = _multipart_layout(payload.file_size_bytes)
+
+    try:
+        upload_id = await run_in_threadpool(s3_client.create_multipart_upload, s3_key, payload.file_type)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"S3 multipart upload 생성 실패: {e}")
+
+    status = 'PENDING'
+    intent = UploadIntent(
+        job_id=job_id,
+        user_id=user_id,
+        non_member_identifier=payload.non_member_identifier,
+        upload_source=payload.upload_source,
+        s3_key=s3_key,
+        filename=payload.original_filename,
+        filetype=payload.file_type,
+        file_size_bytes=payload.file_size_bytes,
+        s3_key_layout=S3_KEY_LAYOUT,
+    )
+    try:
+        await db_client.insert_multipart_upload_intent(intent, upload_id, part_size, part_count, status=status)
+    except Exception as e:
+        # DB에 기록되지 않은 업로드는 아무도 complete/abort할 수 없으므로 즉시 폐기
+        try:
+            await run_in_threadpool(s3_client.abort_multipart_upload, s3_key, upload_id)
+        except Exception as abort_error:
+            print(f"[S3 Multipart] abort after DB failure failed job_id={job_id} error={abort_error}")
+        raise HTTPException(status_code=500, detail=f"DB 기록 실패: {e}")
+
+    await job_cache.set(job_id, _initial_record(job_id, user_id, status))
+
+    # 최대 10,000개 URL 서명은 CPU 작업이므로 이벤트 루프 밖에서 수행
+    urls = await run_in_threadpool(s3_client.create_presigned_part_urls, s3_key, upload_id, range(1, part_count + 1))
+    return {
+        "job_id": job_id,
+        "upload_id": upload_id,
+        "part_size": part_size,
+        "part_count": part_count,
+        "parts": [{"part_number": n, "url": url} for n, url in urls.items()],
+    }
+
+
+def _is_complete_part(upload: dict, part: dict) -> bool:
+    """마지막 파트를 제외하면 part_size와 크기가 같아야 정상 업로드된 파트로 봄."""
+    return part["PartNumber"] == upload["part_count"] or part["Size"] == upload["part_size"]
+
+
+@router.get("/{job_id}/parts")
+async def get_upload_parts(
+    job_id: str,
+    user_id: Optional[str] = Depends(get_current_user_id),
+    db_client: AsyncDBClient = Depends(get_db_client),
+    s3_client: S3Client = Depends(get_s3_client),
+):
+    """
+    업로드 재개: S3 ListParts로 이미 올라간 파트(ETag 포함)를 알려주고, 빠진 파트만 presigned URL을 다시 발급합니다.
+    클라이언트는 missing_parts만 전송한 뒤, uploaded_parts + 새 ETag로 complete를 호출합니다.
+    """
+    upload = await _get_owned_multipart(db_client, job_id, user_id)
+    if upload["state"] != MULTIPART_STATE_INITIATED:
+        return {"job_id": job_id, "state": upload["state"], "uploaded_parts": [], "missing_parts": []}
+
+    try:
+        listed = await run_in_threadpool(s3_client.list_parts, upload["s3_key"], upload["upload_id"])
+    except Exception as e:
+        print(f"[S3 Multipart] list_parts failed job_id={job_id} error={e}")
+        raise HTTPException(status_code=502, detail="S3 ListParts 실패")
+
+    uploaded = {p["PartNumber"]: p for p in listed if _is_complete_part(upload, p)}
+    missing = [n for n in range(1, upload["part_count"] + 1) if n not in uploaded]
+    urls = await run_in_threadpool(s3_client.create_presigned_part_urls, upload["s3_key"], upload["upload_id"], missing)
+    return {
+        "job_id": job_id,
+        "state": upload["state"],
+        "upload_id": upload["upload_id"],
+        "part_size": upload["part_size"],
+        "part_count": upload["part_count"],
+        "uploaded_parts": [
+            {"part_number": n, "etag": p["ETag"], "size": p["Size"]}
+            for n, p in sorted(uploaded.items())
+        ],
+        "missing_parts": [{"part_number": n, "url": url} for n, url in urls.items()],
+    }
+
+
+@router.post("/{job_id}/multipart/presign")
+async def presign_multipart_parts(
+    job_id: str,
+    payload: MultipartPresignPayload,
+    user_id: Optional[str] = Depends(get_current_user_id),
+    db_client: AsyncDBClient = Depends(get_db_client),
+    s3_client: S3Client = Depends(get_s3_client),
+):
+    """실패했거나 URL이 만료된 파트만 presigned URL을 다시 발급합니다."""
+    upload = await _get_owned_multipart(db_client, job_id, user_id)
+    _require_initiated(upload)
+    part_numbers = sorted(set(payload.part_numbers))
+    _check_part_numbers(upload, part_numbers)
+    urls = await run_in_threadpool(s3_client.create_presigned_part_urls, upload["s3_key"], upload["upload_id"], part_numbers)
+    return {
+        "job_id": job_id,
+        "parts": [{"part_number": n, "url": url} for n, url in urls.items()],
+    }
+
+
+async def _object_exists(s3_client: S3Client, s3_key: str) -> bool:
+    """업로드 버킷에 객체가 있는지 HEAD로 확인합니다. 확인 자체가 실패하면 False."""
+    try:
+        await run_in_threadpool(s3_client.head_upload_object, s3_key)
+        return True
+    except Exception as e:
+        print(f"[S3 Head] key={s3_key} error={e}")
+        return False
+
+
+@router.post("/{job_id}/multipart/complete")
+async def complete_multipart_upload(
+    job_id: str,
+    payload: MultipartCompletePayload,
+    user_id: Optional[str] = Depends(get_current_user_id),
+    db_client: AsyncDBClient = Depends(get_db_client),
+    s3_client: S3Client = Depends(get_s3_client),
+    job_cache: JobRecordCache = Depends(get_job_cache),
+):
+    """모든 파트의 ETag를 받아 S3 객체를 조립하고 멀티파트 상태를 COMPLETED, job을 UPLOADED로 기록합니다."""
+    upload = await _get_owned_multipart(db_client, job_id, user_id)
+    _require_initiated(upload)
+
+    parts = {p.part_number: p.etag for p in payload.parts}
+    _check_part_numbers(upload, list(parts))
+    missing = [n for n in range(1, upload["part_count"] + 1) if n not in parts]
+    if missing:
+        raise HTTPException(status_code=400, detail=f"missing parts: {missing}")
+
+    try:
+        await run_in_threadpool(
+            s3_client.complete_multipart_upload,
+            upload["s3_key"],
+            upload["upload_id"],
+            [{"PartNumber": n, "ETag": etag} for n, etag in parts.items()],
+        )
+    except ClientError as e:
+        print(f"[S3 Multipart Complete] job_id={job_id} key={upload['s3_key']} error={e}")
+        code = e.response.get("Error", {}).get("Code")
+        if code == "NoSuchUpload" and await _object_exists(s3_client, upload["s3_key"]):
+            # 이전 요청에서 S3 complete는 성공했지만 DB 기록이 실패한 경우 -> 이어서 DB만 기록
+            pass
+        elif code in _MULTIPART_CLIENT_ERROR_CODES:
+            # ETag 불일치/누락 파트 등: 업로드는 INITIATED로 남으므로 해당 파트만 다시 올린 뒤 재시도 가능
+            raise HTTPException(status_code=400, detail=f"S3 multipart complete 실패: {code}")
+        else:
+            raise HTTPException(status_code=502, detail="S3 multipart complete 실패")
+    except Exception as e:
+        print(f"[S3 Multipart Complete] job_id={job_id} key={upload['s3_key']} error={e}")
+        raise HTTPException(status_code=502, detail="S3 multipart complete 실패")
+
+    try:
+        await db_client.update_multipart_state(job_id, MULTIPART_STATE_COMPLETED)
+        # complete가 성공했으면 객체가 S3에 존재하므로 바로 UPLOADED
+        if await db_client.mark_uploaded(job_id):
+            await job_cache.update(job_id, status=UPLOADED_STATUS)
+    except Exception as e:
+        print(f"[DB Update Warning] multipart COMPLETED job_id={job_id} error={e}")
+        await job_cache.invalidate(job_id)
+
+    return {"job_id": job_id, "state": MULTIPART_STATE_COMPLETED}
+
+
+@router.post("/{job_id}/multipart/abort")
+async def abort_multipart_upload(
+    job_id: str,
+    user_id: Optional[str] = Depends(get_current_user_id),
+    db_client: AsyncDBClient = Depends(get_db_client),
+    s3_client: S3Client = Depends(get_s3_client),
+    job_cache: JobRecordCache = Depends(get_job_cache),
+):
+    """멀티파트 업로드를 취소하고 업로드된 파트를 폐기합니다. job은 FAILED로 기록됩니다."""
+    upload = await _get_owned_multipart(db_client, job_id, user_id)
+    _require_initiated(upload)
+
+    try:
+        await run_in_threadpool(s3_client.abort_multipart_upload, upload["s3_key"], upload["upload_id"])
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"S3 multipart abort 실패: {e}")
+
+    try:
+        await db_client.update_multipart_state(job_id, MULTIPART_STATE_ABORTED, status='FAILED')
+        await job_cache.update(job_id, status='FAILED')
+    except Exception as e:
+        print(f"[DB Update Warning] multipart ABORTED job_id={job_id} error={e}")
+        await job_cache.invalidate(job_id)
+
+    return {"job_id": job_id, "state": MULTIPART_STATE_ABORTED}
+
+
+# ----------------------------------------------------
+# 업로드 완료 확인 (UPLOADED): 클라이언트 보고 대신 S3에 객체가 실제로 있는지 확인
+# ----------------------------------------------------
+@router.post("/{job_id}/complete")
+async def complete_upload(
+    job_id: str,
+    user_id: Optional[str] = Depends(get_current_user_id),
+    db_client: AsyncDBClient = Depends(get_db_client),
+    s3_client: S3Client = Depends(get_s3_client),
+    job_cache: JobRecordCache = Depends(get_job_cache),
+):
+    """
+    PUT/POST 업로드가 끝났다고 클라이언트가 알리면 S3 HEAD로 크기와 Content-Type을 확인한 뒤 UPLOADED로 전환합니다.
+    이미 UPLOADED 이후 상태면 그대로 반환합니다 (재시도 안전).
+    """
+    if not user_id:
+        raise HTTPException(status_code=401, detail="Authentication required for upload")
+    try:
+        intent = await db_client.get_upload_intent(job_id)
+    except Exception as e:
+        print(f"[DB Error] get_upload_intent job_id={job_id} error={e}")
+        raise HTTPException(status_code=500, detail="internal error")
+    if not intent:
+        raise HTTPException(status_code=404, detail="job not found")
+    if intent["user_id"] != user_id:
+        raise HTTPException(status_code=403, detail="forbidden")
+    if intent["status"] not in AWAITING_UPLOAD_STATUSES:
+        return {"job_id": job_id, "status": intent["status"]}
+
+    try:
+        meta = await run_in_threadpool(s3_client.head_upload_object, intent["s3_key"])
+    except ClientError as e:
+        print(f"[S3 Head] job_id={job_id} key={intent['s3_key']} error={e}")
+        if e.response.get("Error", {}).get("Code") in _S3_NOT_FOUND_CODES:
+            # 아직 업로드되지 않음 (또는 presigned URL이 만료되어 실패) -> 클라이언트가 다시 시도할 수 있음
+            raise HTTPException(status_code=409, detail="uploaded object not found")
+        # 자격 증명/권한/스로틀링 등 S3 쪽 문제
+        raise HTTPException(status_code=502, detail="failed to check uploaded object")
+    except Exception as e:
+        print(f"[S3 Head] job_id={job_id} key={intent['s3_key']} error={e}")
+        raise HTTPException(status_code=502, detail="failed to check uploaded object")
+
+    expected_size = intent.get("file_size_bytes")
+    if expected_size is not None and meta["size"] != int(expected_size):
+        raise HTTPException(status_code=400, detail=f"size mismatch: expected {expected_size}, got {meta['size']}")
+    if intent.get("file_type") and meta["content_type"] != intent["file_type"]:
+        raise HTTPException(status_code=400, detail=f"content-type mismatch: expected {intent['file_type']}, got {meta['content_type']}")
+
+    try:
+        if await db_client.mark_uploaded(job_id):
+            await job_cache.update(job_id, status=UPLOADED_STATUS)
+    except Exception as e:
+        print(f"[DB Update Error] mark_uploaded job_id={job_id} error={e}")
+        await job_cache.invalidate(job_id)
+        raise HTTPException(status_code=500, detail="internal error")
+    return {"job_id": job_id, "status": UPLOADED_STATUS}
+
+
+@router.post("/events/s3", status_code=202)
+async def ingest_s3_events(
+    request: Request,
+    upload_events: UploadEventConsumer = Depends(get_upload_events),
+):
+    """
+    S3 이벤트 알림 수신 (MinIO bucket notification webhook 등). 본문은 S3 이벤트 형식 {"Records": [...]}.
+    큐에 넣고 바로 202를 반환하며, 처리(job 조회/UPLOADED 전환)는 백그라운드 소비자가 수행합니다.
+    """
+    if not S3_EVENT_WEBHOOK_TOKEN:
+        raise HTTPException(status_code=404, detail="S3 event ingestion is not configured")
+    token = request.headers.get("authorization", "")
+    if token.lower().startswith("bearer "):
+        token = token[7:]
+    if not hmac.compare_digest(token.encode(), S3_EVENT_WEBHOOK_TOKEN.encode()):
+        raise HTTPException(status_code=401, detail="invalid token")
+
+    try:
+        event = await request.json()
+    except Exception:
+        raise HTTPException(status_code=400, detail="invalid JSON")
+    if not isinstance(event, dict):
+        raise HTTPException(status_code=400, detail="invalid event")
+    try:
+        queued = upload_events.submit(event)
+    except asyncio.QueueFull:
+        # 503이면 MinIO가 재전송 (중복 이벤트는 mark_uploaded가 한 번만 반영)
+        raise HTTPException(status_code=503, detail="event queue full")
+    return {"queued": queued}
@@ -3,39 +3,93 @@
 # boto3를 사용해 s3 통신, .env의 키와 S3 버킷 이름 사용
 
 import os
-import boto3
 from botocore.exceptions import ClientError
-from botocore.config import Config
-from typing import Optional
+from typing import Dict, Iterable, List, Optional
+
+from app import boto_clients
+from app.presign_cache import PresignedUrlCache
+from app.sigv4 import SigV4Presigner
 
 S3_VIDEO_BUCKET_NAME = os.getenv("S3_VIDEO_BUCKET_NAME")
 S3_RESULT_BUCKET_NAME = os.getenv("S3_RESULT_BUCKET_NAME")
 AWS_REGION = os.getenv("AWS_REGION", "ap-northeast-2")
 PRESIGNED_URL_EXPIRATION = 3600  # 1 hour
+# 1이면 boto3 대신 app.sigv4로 presigned URL을 직접 서명 (AWS_ACCESS_KEY_ID/SECRET이 설정된 경우만)
+S3_NATIVE_PRESIGNER = os.getenv("S3_NATIVE_PRESIGNER", "0") == "1"
+# S3 호환 스토리지(MinIO, moto server 등) 사용 시: 예) S3_ENDPOINT_URL=http://localhost:9000, S3_ADDRESSING_STYLE=path
+S3_ENDPOINT_URL = os.getenv("S3_ENDPOINT_URL") or None
+S3_ADDRESSING_STYLE = os.getenv("S3_ADDRESSING_STYLE", "virtual").lower()  # virtual | path | auto
+# 1이면 시작 시 업로드/결과 버킷이 없을 때 생성 (로컬 개발/부하 테스트 전용)
+S3_DEV_CREATE_BUCKETS = os.getenv("S3_DEV_CREATE_BUCKETS", "0") == "1"
 
 class S3Client:
     def __init__(self):
-        # Use signature v4 and virtual-host addressing to avoid redirect/host mismatch
-        config = Config(
-            signature_version="s3v4",
-            s3={"addressing_style": "virtual"}
-        )
+        # 결과 파일 presigned GET URL 재사용 (상태 폴링마다 재서명하지 않음)
+        self._presign_cache = PresignedUrlCache()
+        self._presigner = self._build_native_presigner()
+
+    @property
+    def _client(self):
+        # boto3 클라이언트는 프로세스 전역 레지스트리에서 공유 (S3Client 인스턴스마다 새로 만들지 않음)
         # aws access key로 s3 presigned url 생성에 접근
         # 관리 잘못하면 보안 이슈가 될 수 있으니 주의(s3 과금 어마어마할 것)
-        self._client = boto3.client(
+        # Use signature v4 and virtual-host addressing (AWS 기본) to avoid redirect/host mismatch
+        return boto_clients.get_client(
             "s3",
+            region=AWS_REGION,
             aws_access_key_id=os.getenv("AWS_ACCESS_KEY_ID"),
             aws_secret_access_key=os.getenv("AWS_SECRET_ACCESS_KEY"),
-            region_name=AWS_REGION,
-            config=config,
+            signature_version="s3v4",
+            addressing_style=S3_ADDRESSING_STYLE,
+            endpoint_url=S3_ENDPOINT_URL,
         )
 
+    def warm_up(self) -> None:
+        """시작 시 호출: boto3 클라이언트 생성(서비스 모델 로드)과 서명 경로 초기화를 미리 끝냄 (네트워크 호출 없음)."""
+        self._client.generate_presigned_url(
+            ClientMethod="get_object",
+            Params={"Bucket": S3_RESULT_BUCKET_NAME or S3_VIDEO_BUCKET_NAME or "warm-up", "Key": "warm-up"},
+            ExpiresIn=60,
+        )
+
+    @staticmethod
+    def _build_native_presigner() -> Optional[SigV4Presigner]:
+        access_key = os.getenv("AWS_ACCESS_KEY_ID")
+        secret_key = os.getenv("AWS_SECRET_ACCESS_KEY")
+        if not (S3_NATIVE_PRESIGNER and access_key and secret_key):
+            # 키가 env에 없으면 boto3 자격 증명 체인(인스턴스 프로파일 등)에 맡김
+            return None
+        if not SigV4Presigner.supports(S3_ENDPOINT_URL, S3_ADDRESSING_STYLE):
+            print(f"[S3] native presigner does not support endpoint={S3_ENDPOINT_URL} addressing_style={S3_ADDRESSING_STYLE}, using boto3")
+            return None
+        return SigV4Presigner(
+            access_key, secret_key, AWS_REGION,
+            endpoint_url=S3_ENDPOINT_URL, addressing_style=S3_ADDRESSING_STYLE,
+        )
+
+    def ensure_buckets(self) -> None:
+        """(개발용) 업로드/결과 버킷이 없으면 생성합니다. S3_DEV_CREATE_BUCKETS=1일 때 lifespan에서 호출."""
+        for bucket in dict.fromkeys(b for b in (S3_VIDEO_BUCKET_NAME, S3_RESULT_BUCKET_NAME) if b):
+            try:
+                self._client.head_bucket(Bucket=bucket)
+                continue
+            except ClientError as e:
+                if e.response.get("Error", {}).get("Code") not in ("404", "NoSuchBucket", "NotFound"):
+                    raise
+            params = {"Bucket": bucket}
+            # AWS는 us-east-1 외 리전에 LocationConstraint 필요, S3 호환 서버는 서버 기본 리전 사용
+            if not S3_ENDPOINT_URL and AWS_REGION != "us-east-1":
+                params["CreateBucketConfiguration"] = {"LocationConstraint": AWS_REGION}
+            self._client.create_bucket(**params)
+            print(f"[S3] created bucket {bucket}")
+
     # s3 presigned URL 생성 메서드
     def create_presigned_url(self, object_key: str, file_type: str, file_size: int) -> str:
         """
         PUT 용 presigned URL 반환.
         - file_type(Content-Type)을 서명에 포함시키면 클라이언트도 동일한 Content-Type을 반드시 보냄.
         - Content-Length는 서명에 포함하지 않음(브라우저가 자동으로 설정하므로 서명에 포함하면 문제 발생).
+          크기를 서버에서 강제해야 하면 create_presigned_post(upload_mode=post)를 사용.
         """
         params = {
             'Bucket': S3_VIDEO_BUCKET_NAME,
@@ -45,6 +99,10 @@ class S3Client:
         if file_type:
             params['ContentType'] = file_type
 
+        if self._presigner is not None:
+            headers = {'content-type': file_type} if file_type else None
+            return self._presigner.presign('PUT', S3_VIDEO_BUCKET_NAME, object_key, PRESIGNED_URL_EXPIRATION, headers=headers)
+
         url = self._client.generate_presigned_url(
             ClientMethod='put_object',
             Params=params,
@@ -53,6 +111,25 @@ class S3Client:
         )
         return url
     
+    def create_presigned_post(self, object_key: str, file_type: str, file_size: int, expires_in: int = PRESIGNED_URL_EXPIRATION) -> dict:
+        """
+        POST(form) 업로드용 presigned 정책 반환: {"url": ..., "fields": {...}}.
+        PUT과 달리 정책에 content-length-range(선언한 file_size와 정확히 일치)와 Content-Type이 들어가므로
+        S3가 크기/타입이 다른 업로드를 직접 거부합니다. 클라이언트는 fields를 모두 넣고 file 필드를 마지막에 보냄.
+        """
+        fields = {'Content-Type': file_type}
+        conditions = [
+            {'Content-Type': file_type},
+            ['content-length-range', file_size, file_size],
+        ]
+        return self._client.generate_presigned_post(
+            Bucket=S3_VIDEO_BUCKET_NAME,
+            Key=object_key,
+            Fields=fields,
+            Conditions=conditions,
+            ExpiresIn=expires_in,
+        )
+
     def create_presigned_get_url(self, object_key: str, bucket_name: Optional[str] = None, expires_in: int = PRESIGNED_URL_EXPIRATION) -> str:
         """
         Generate a presigned GET URL using the configured boto3 client.
@@ -60,18 +137,134 @@ class S3Client:
         Accepts the object key as the primary argument. If `bucket_name` is not
         provided, `S3_RESULT_BUCKET_NAME` will be used. This matches existing
         caller usage which passes only the s3 key.
+
+        The same URL is reused for (bucket, key) until PRESIGNED_URL_CACHE_MARGIN
+        seconds before it expires (see app.presign_cache).
         """
         bucket = bucket_name or S3_RESULT_BUCKET_NAME
         if not bucket:
             raise RuntimeError("S3 result bucket is not configured (S3_RESULT_BUCKET_NAME)")
 
+        url = self._presign_cache.get(bucket, object_key, expires_in)
+        if url is not None:
+            return url
+        if self._presigner is not None:
+            url = self._presigner.presign("GET", bucket, object_key, expires_in)
+            self._presign_cache.set(bucket, object_key, expires_in, url)
+            return url
         try:
             url = self._client.generate_presigned_url(
                 ClientMethod="get_object",
                 Params={"Bucket": bucket, "Key": object_key},
                 ExpiresIn=expires_in,
             )
+            self._presign_cache.set(bucket, object_key, expires_in, url)
             return url
         except ClientError as e:
             # Raise a RuntimeError so callers return 500 with a helpful message
-            raise RuntimeError(f"Failed to create presigned GET URL: {e}")
\ No newline at end of file
+            raise RuntimeError(f"Failed to create presigned GET URL: {e}")
+
+    def head_upload_object(self, object_key: str) -> dict:
+        """업로드 버킷 객체 메타데이터 (업로드 완료 확인용). 객체가 없으면 ClientError(404)."""
+        return self.head_result_object(object_key, bucket_name=S3_VIDEO_BUCKET_NAME)
+
+    def head_result_object(self, object_key: str, bucket_name: Optional[str] = None) -> dict:
+        """결과 객체 메타데이터: {"etag", "size", "content_type"}."""
+        resp = self._client.head_object(Bucket=bucket_name or S3_RESULT_BUCKET_NAME, Key=object_key)
+        return {
+            "etag": resp["ETag"],
+            "size": resp["ContentLength"],
+            "content_type": resp.get("ContentType") or "application/octet-stream",
+        }
+
+    def get_result_object(self, object_key: str, byte_range: Optional[str] = None, etag: Optional[str] = None, bucket_name: Optional[str] = None) -> dict:
+        """
+        결과 객체 GetObject 응답(Body는 스트림)을 반환합니다.
+        byte_range: HTTP Range 헤더 값 그대로 (예: "bytes=0-1023")
+        etag: 주어지면 IfMatch로 전달해 HEAD 이후 객체가 바뀐 경우 실패시킴
+        """
+        params = {"Bucket": bucket_name or S3_RESULT_BUCKET_NAME, "Key": object_key}
+        if byte_range:
+            params["Range"] = byte_range
+        if etag:
+            params["IfMatch"] = etag
+        return self._client.get_object(**params)
+
+    def create_presigned_get_urls(self, object_keys: Iterable[str], bucket_name: Optional[str] = None, expires_in: int = PRESIGNED_URL_EXPIRATION) -> Dict[str, str]:
+        """
+        여러 키의 presigned GET URL을 한 번에 생성해 {key: url}로 반환합니다.
+        중복 키는 한 번만 서명하고, 실패한 키는 로그만 남기고 결과에서 제외합니다.
+        """
+        urls = {}
+        for key in dict.fromkeys(object_keys):
+            try:
+                urls[key] = self.create_presigned_get_url(key, bucket_name=bucket_name, expires_in=expires_in)
+            except Exception as e:
+                print(f"[S3 Presign Error] key={key} error={e}")
+        return urls
+
+    # ------------------------------------------------------------------
+    # multipart upload (대용량 3D 캡처 zip)
+    # ------------------------------------------------------------------
+    def create_multipart_upload(self, object_key: str, file_type: Optional[str] = None) -> str:
+        """업로드 버킷에 멀티파트 업로드를 시작하고 UploadId를 반환합니다."""
+        params = {'Bucket': S3_VIDEO_BUCKET_NAME, 'Key': object_key}
+        if file_type:
+            params['ContentType'] = file_type
+        return self._client.create_multipart_upload(**params)['UploadId']
+
+    def create_presigned_part_urls(self, object_key: str, upload_id: str, part_numbers: Iterable[int], expires_in: int = PRESIGNED_URL_EXPIRATION) -> Dict[int, str]:
+        """
+        파트별 presigned PUT(UploadPart) URL을 {part_number: url}로 반환합니다.
+        클라이언트는 파트를 병렬로 올리고, 실패한 파트만 다시 요청하면 됩니다.
+        """
+        urls = {}
+        for part_number in part_numbers:
+            if self._presigner is not None:
+                urls[part_number] = self._presigner.presign(
+                    'PUT', S3_VIDEO_BUCKET_NAME, object_key, expires_in,
+                    query={'uploadId': upload_id, 'partNumber': part_number},
+                )
+            else:
+                urls[part_number] = self._client.generate_presigned_url(
+                    ClientMethod='upload_part',
+                    Params={'Bucket': S3_VIDEO_BUCKET_NAME, 'Key': object_key, 'UploadId': upload_id, 'PartNumber': part_number},
+                    ExpiresIn=expires_in,
+                    HttpMethod='PUT',
+                )
+        return urls
+
+    def complete_multipart_upload(self, object_key: str, upload_id: str, parts: List[dict]) -> None:
+        """parts: [{'PartNumber': int, 'ETag': str}, ...] (파트 번호 순으로 정렬해 전달)"""
+        self._client.complete_multipart_upload(
+            Bucket=S3_VIDEO_BUCKET_NAME,
+            Key=object_key,
+            UploadId=upload_id,
+            MultipartUpload={'Parts': sorted(parts, key=lambda p: p['PartNumber'])},
+        )
+
+    def list_parts(self, object_key: str, upload_id: str) -> List[dict]:
+        """
+        이미 업로드가 끝난 파트 목록 [{'PartNumber', 'ETag', 'Size'}, ...]을 반환합니다.
+        (ListParts는 요청당 최대 1,000개이므로 마커로 끝까지 조회)
+        """
+        parts = []
+        marker = 0
+        while True:
+            resp = self._client.list_parts(
+                Bucket=S3_VIDEO_BUCKET_NAME, Key=object_key, UploadId=upload_id, PartNumberMarker=marker,
+            )
+            parts.extend(
+                {'PartNumber': p['PartNumber'], 'ETag': p['ETag'], 'Size': p['Size']}
+                for p in resp.get('Parts', [])
+            )
+            if not resp.get('IsTruncated'):
+                return parts
+            marker = resp['NextPartNumberMarker']
+
+    def abort_multipart_upload(self, object_key: str, upload_id: str) -> None:
+        """업로드된 파트를 모두 폐기합니다 (미완료 파트도 스토리지 과금 대상이므로 취소 시 반드시 호출)."""
+        self._client.abort_multipart_upload(Bucket=S3_VIDEO_BUCKET_NAME, Key=object_key, UploadId=upload_id)
+
+    def close(self) -> None:
+        self._presign_cache.close()
@@ -0,0 +1,145 @@
+# app/sigv4.py
+
+# S3 presigned URL(SigV4 query string) 직접 생성기
+# - boto3 generate_presigned_url은 URL마다 요청 객체 생성 + botocore 이벤트 파이프라인을 모두 거침
+# - 여기서는 날짜/리전/서비스 서명 키(HMAC 4단계)를 하루에 한 번만 만들고 캐시한 뒤,
+#   키마다 canonical request -> string to sign -> HMAC 한 번으로 서명
+# - boto3(s3v4, virtual addressing)와 바이트 단위로 같은 URL을 만듦 (benchmarks/bench_presign.py로 비교)
+# - 커스텀 endpoint(MinIO 등)는 path 방식만 지원, 그 외 조합은 S3Client가 boto3로 처리 (SigV4Presigner.supports)
+
+import re
+import hmac
+import hashlib
+import datetime
+from typing import Dict, Optional, Tuple
+from urllib.parse import quote, urlsplit
+
+_ALGORITHM = "AWS4-HMAC-SHA256"
+_SERVICE = "s3"
+_UNSIGNED_PAYLOAD = "UNSIGNED-PAYLOAD"
+# virtual-host 방식이 가능한 버킷 이름 (점이 있으면 TLS 인증서가 맞지 않아 boto3도 path 방식 사용)
+_VIRTUAL_BUCKET = re.compile(r"^[a-z0-9][a-z0-9\-]{1,61}[a-z0-9]$")
+
+
+def _hmac(key: bytes, msg: str) -> bytes:
+    return hmac.new(key, msg.encode("utf-8"), hashlib.sha256).digest()
+
+
+def _quote(value: str) -> str:
+    return quote(value, safe="-_.~")
+
+
+class SigV4Presigner:
+    def __init__(
+        self,
+        access_key: str,
+        secret_key: str,
+        region: str,
+        session_token: Optional[str] = None,
+        endpoint_url: Optional[str] = None,
+        addressing_style: str = "virtual",
+    ):
+        if not self.supports(endpoint_url, addressing_style):
+            raise ValueError(f"unsupported presign target: endpoint={endpoint_url} addressing_style={addressing_style}")
+        self._access_key = access_key
+        self._secret_key = secret_key
+        self._region = region
+        self._session_token = session_token
+        # (date_stamp, signing_key): 날짜가 바뀔 때만 다시 유도
+        self._signing_key: Tuple[Optional[str], bytes] = (None, b"")
+        self._scope_suffix = f"/{region}/{_SERVICE}/aws4_request"
+        self._addressing_style = addressing_style
+        if endpoint_url:
+            parts = urlsplit(endpoint_url)
+            self._scheme, self._endpoint_host = parts.scheme, parts.netloc
+        else:
+            self._scheme, self._endpoint_host = "https", None
+
+    def _signing_host(self, host: str) -> str:
+        # botocore와 동일: 스킴의 기본 포트는 host 헤더에서 생략
+        default = {"https": ":443", "http": ":80"}.get(self._scheme)
+        return host[: -len(default)] if default and host.endswith(default) else host
+
+    @staticmethod
+    def supports(endpoint_url: Optional[str], addressing_style: str) -> bool:
+        """boto3와 같은 URL을 보장할 수 있는 조합인지: AWS(virtual/path) 또는 커스텀 endpoint + path."""
+        if endpoint_url:
+            return addressing_style == "path"
+        return addressing_style in ("virtual", "path")
+
+    def _key_for(self, date_stamp: str) -> bytes:
+        cached_date, key = self._signing_key
+        if cached_date != date_stamp:
+            key = _hmac(("AWS4" + self._secret_key).encode("utf-8"), date_stamp)
+            key = _hmac(key, self._region)
+            key = _hmac(key, _SERVICE)
+            key = _hmac(key, "aws4_request")
+            self._signing_key = (date_stamp, key)
+        return key
+
+    def _host_and_path(self, bucket: str, key: str) -> Tuple[str, str]:
+        """(URL에 쓰는 host, path). 서명용 host 헤더는 _signing_host로 기본 포트를 뺌."""
+        path = quote(key, safe="/~")
+        if self._endpoint_host:
+            return self._endpoint_host, f"/{quote(bucket, safe='~')}/{path}"
+        regional = "s3.amazonaws.com" if self._region == "us-east-1" else f"s3.{self._region}.amazonaws.com"
+        if self._addressing_style == "virtual" and _VIRTUAL_BUCKET.match(bucket):
+            return f"{bucket}.{regional}", f"/{path}"
+        return regional, f"/{quote(bucket, safe='~')}/{path}"
+
+    def presign(
+        self,
+        method: str,
+        bucket: str,
+        key: str,
+        expires_in: int,
+        query: Optional[Dict[str, str]] = None,
+        headers: Optional[Dict[str, str]] = None,
+        now: Optional[datetime.datetime] = None,
+    ) -> str:
+        """
+        presigned URL을 반환합니다.
+        query: 작업 파라미터(예: uploadId, partNumber) - 주어진 순서대로 X-Amz-* 앞에 붙음 (boto3와 같은 순서로 전달)
+        headers: 서명에 포함할 헤더(예: content-type) - 클라이언트가 같은 값으로 보내야 함
+        """
+        now = now or datetime.datetime.now(datetime.timezone.utc)
+        amz_date = now.strftime("%Y%m%dT%H%M%SZ")
+        date_stamp = amz_date[:8]
+        host, path = self._host_and_path(bucket, key)
+
+        signed = {"host": self._signing_host(host)}
+        for name, value in (headers or {}).items():
+            signed[name.lower()] = str(value).strip()
+        header_names = sorted(signed)
+        signed_headers = ";".join(header_names)
+
+        params = [(k, str(v)) for k, v in (query or {}).items()]
+        params += [
+            ("X-Amz-Algorithm", _ALGORITHM),
+            ("X-Amz-Credential", f"{self._access_key}/{date_stamp}{self._scope_suffix}"),
+            ("X-Amz-Date", amz_date),
+            ("X-Amz-Expires", str(expires_in)),
+            ("X-Amz-SignedHeaders", signed_headers),
+        ]
+        if self._session_token:
+            params.append(("X-Amz-Security-Token", self._session_token))
+        encoded = [(_quote(k), _quote(v)) for k, v in params]
+
+        canonical_request = "\n".join((
+            method.upper(),
+            path,
+            "&".join(f"{k}={v}" for k, v in sorted(encoded)),
+            "".join(f"{name}:{signed[name]}\n" for name in header_names),
+            signed_headers,
+            _UNSIGNED_PAYLOAD,
+        ))
+        string_to_sign = "\n".join((
+            _ALGORITHM,
+            amz_date,
+            f"{date_stamp}{self._scope_suffix}",
+            hashlib.sha256(canonical_request.encode("utf-8")).hexdigest(),
+        ))
+        signature = hmac.new(self._key_for(date_stamp), string_to_sign.encode("utf-8"), hashlib.sha256).hexdigest()
+
+        query_string = "&".join(f"{k}={v}" for k, v in encoded)
+        return f"{self._scheme}://{host}{path}?{query_string}&X-Amz-Signature={signature}"
@@ -0,0 +1,77 @@
+# app/token_cache.py
+
+# 검증을 통과한 JWT -> sub(user id) 캐시
+# - 같은 브라우저가 같은 쿠키/토큰으로 요청을 반복하므로, 서명(RSA) 검증과 claims 검증은 토큰당 한 번만 수행
+# - 키는 토큰 원문 대신 sha256(token) (메모리 절약 + 토큰이 메모리 덤프/메트릭에 그대로 남지 않도록)
+# - 항목은 토큰의 exp 시각까지만 유효 -> 만료된 토큰이 캐시 때문에 통과하는 일은 없음
+# - 검증에 실패한 토큰은 저장하지 않음 (실패 경로는 항상 전체 검증)
+
+import os
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+from app import metrics
+
+# 0이면 캐시 비활성화
+TOKEN_CACHE_MAX_ENTRIES = int(os.getenv("TOKEN_CACHE_MAX_ENTRIES", "10000"))
+
+
+def _token_key(token: str) -> bytes:
+    return hashlib.sha256(token.encode("utf-8")).digest()
+
+
+class VerifiedTokenCache:
+    def __init__(self, max_entries: int = TOKEN_CACHE_MAX_ENTRIES):
+        self._data: "OrderedDict[bytes, tuple]" = OrderedDict()  # sha256(token) -> (exp, sub)
+        self._max_entries = max_entries
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0, "expired": 0}
+        self.metrics_name = metrics.register_source("token_cache", self.stats)
+
+    def get(self, token: str) -> Optional[str]:
+        """검증된 적 있고 아직 만료되지 않은 토큰이면 sub를, 아니면 None을 반환합니다."""
+        if self._max_entries <= 0:
+            return None
+        key = _token_key(token)
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None and entry[0] > time.time():
+                self._data.move_to_end(key)
+                self._stats["hits"] += 1
+                return entry[1]
+            if entry is not None:
+                del self._data[key]
+                self._stats["expired"] += 1
+            self._stats["misses"] += 1
+            return None
+
+    def set(self, token: str, sub: str, exp: int) -> None:
+        """서명과 claims 검증을 모두 통과한 토큰만 저장합니다."""
+        if self._max_entries <= 0:
+            return
+        key = _token_key(token)
+        with self._lock:
+            self._data[key] = (int(exp), sub)
+            self._data.move_to_end(key)
+            while len(self._data) > self._max_entries:
+                self._data.popitem(last=False)
+                self._stats["evictions"] += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self._stats["hits"] + self._stats["misses"]
+            return dict(
+                self._stats,
+                size=len(self._data),
+                hit_rate=round(self._stats["hits"] / lookups, 4) if lookups else None,
+            )
+
+    def close(self) -> None:
+        metrics.unregister_source(self.metrics_name)
@@ -0,0 +1,98 @@
+# app/upload_events.py
+
+# S3 이벤트 알림(ObjectCreated:*)으로 업로드 완료(UPLOADED)를 기록하는 소비자
+# - POST /api/upload/events/s3 (MinIO bucket notification webhook 등)가 이벤트를 asyncio.Queue에 넣고 즉시 202 응답
+# - lifespan에서 시작한 백그라운드 태스크가 큐를 비우며 s3_key로 job을 찾아, 크기가 맞으면 UPLOADED로 전환
+# - 운영에서 SQS/EventBridge를 쓰게 되더라도 handle_record()만 재사용하면 됨 (큐는 로컬 대체물)
+
+import os
+import asyncio
+from typing import Optional
+from urllib.parse import unquote_plus
+
+from app import metrics
+from app.async_db_client import AsyncDBClient
+from app.job_cache import JobRecordCache
+from app.db_common import UPLOADED_STATUS
+
+S3_VIDEO_BUCKET_NAME = os.getenv("S3_VIDEO_BUCKET_NAME")
+S3_EVENT_QUEUE_SIZE = int(os.getenv("S3_EVENT_QUEUE_SIZE", "1000"))
+
+
+class UploadEventConsumer:
+    def __init__(self, db_client: AsyncDBClient, job_cache: JobRecordCache, queue_size: int = S3_EVENT_QUEUE_SIZE):
+        self._db = db_client
+        self._job_cache = job_cache
+        self._queue: "asyncio.Queue[dict]" = asyncio.Queue(maxsize=queue_size)
+        self._task: Optional[asyncio.Task] = None
+        self._stats = {"received": 0, "uploaded": 0, "ignored": 0, "size_mismatch": 0, "errors": 0, "dropped": 0}
+        self.metrics_name = metrics.register_source("upload_events", self.stats)
+
+    def submit(self, event: dict) -> int:
+        """S3 이벤트 알림 본문의 Records를 큐에 넣고, 넣은 개수를 반환합니다. 큐가 가득 차면 QueueFull."""
+        records = event.get("Records") or []
+        for record in records:
+            try:
+                self._queue.put_nowait(record)
+            except asyncio.QueueFull:
+                self._stats["dropped"] += 1
+                raise
+            self._stats["received"] += 1
+        return len(records)
+
+    async def handle_record(self, record: dict) -> None:
+        # AWS: "ObjectCreated:Put", MinIO: "s3:ObjectCreated:Put"
+        event_name = str(record.get("eventName", ""))
+        if not event_name.split("s3:", 1)[-1].startswith("ObjectCreated:"):
+            self._stats["ignored"] += 1
+            return
+        s3 = record.get("s3") or {}
+        bucket = (s3.get("bucket") or {}).get("name")
+        obj = s3.get("object") or {}
+        if S3_VIDEO_BUCKET_NAME and bucket != S3_VIDEO_BUCKET_NAME:
+            self._stats["ignored"] += 1
+            return
+        # 이벤트의 객체 키는 URL 인코딩되어 옴 (공백은 '+')
+        key = unquote_plus(obj.get("key", ""))
+        intent = await self._db.get_upload_intent_by_key(key)
+        if intent is None:
+            self._stats["ignored"] += 1
+            return
+        expected = intent.get("file_size_bytes")
+        if expected is not None and obj.get("size") is not None and int(obj["size"]) != int(expected):
+            self._stats["size_mismatch"] += 1
+            print(f"[Upload Events] size mismatch job_id={intent['job_id']} expected={expected} actual={obj['size']}")
+            return
+        if await self._db.mark_uploaded(intent["job_id"]):
+            await self._job_cache.update(intent["job_id"], status=UPLOADED_STATUS)
+            self._stats["uploaded"] += 1
+        else:
+            self._stats["ignored"] += 1
+
+    async def _run(self) -> None:
+        while True:
+            record = await self._queue.get()
+            try:
+                await self.handle_record(record)
+            except Exception as e:
+                self._stats["errors"] += 1
+                print(f"[Upload Events] failed to handle record: {e}")
+            finally:
+                self._queue.task_done()
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        metrics.unregister_source(self.metrics_name)
+
+    def stats(self) -> dict:
+        return dict(self._stats, queued=self._queue.qsize())
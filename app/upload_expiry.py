@@ -0,0 +1,92 @@
+# app/upload_expiry.py
+
+# 업로드가 끝나지 않은 채 버려진 job 정리
+# - 단일 PUT/POST 업로드는 중간에 끊기면 이어 올릴 수 없어 행이 PENDING으로 영원히 남음
+#   (이어 올리기가 필요한 대용량 파일은 POST /api/upload/multipart 사용)
+# - UPLOAD_PENDING_TTL초가 지나도록 UPLOADED가 되지 않은 job을 FAILED로 바꾸고,
+#   진행 중이던 멀티파트 업로드는 S3에서도 abort (미완료 파트도 스토리지 과금 대상)
+# - 워커마다 돌아도 DB 전환이 조건부(UPDATE ... WHERE processing_status IN (...))라 한 번만 적용됨
+
+import os
+import asyncio
+from typing import Optional
+
+from starlette.concurrency import run_in_threadpool
+
+from app import metrics
+from app.async_db_client import AsyncDBClient
+from app.s3_client import S3Client
+from app.job_cache import JobRecordCache
+from app.db_common import EXPIRED_UPLOAD_STATUS, MULTIPART_STATE_INITIATED
+
+# 0이면 정리하지 않음
+UPLOAD_PENDING_TTL = int(os.getenv("UPLOAD_PENDING_TTL", str(24 * 3600)))
+UPLOAD_EXPIRY_INTERVAL = float(os.getenv("UPLOAD_EXPIRY_INTERVAL", "600"))
+UPLOAD_EXPIRY_BATCH = int(os.getenv("UPLOAD_EXPIRY_BATCH", "100"))
+
+
+class StaleUploadReaper:
+    def __init__(
+        self,
+        db_client: AsyncDBClient,
+        s3_client: S3Client,
+        job_cache: JobRecordCache,
+        ttl: int = UPLOAD_PENDING_TTL,
+        interval: float = UPLOAD_EXPIRY_INTERVAL,
+    ):
+        self._db = db_client
+        self._s3 = s3_client
+        self._job_cache = job_cache
+        self._ttl = ttl
+        self._interval = interval
+        self._task: Optional[asyncio.Task] = None
+        self._stats = {"runs": 0, "expired": 0, "multipart_aborted": 0, "errors": 0}
+        self.metrics_name = metrics.register_source("upload_expiry", self.stats)
+
+    async def expire_once(self, limit: int = UPLOAD_EXPIRY_BATCH) -> int:
+        """오래된 업로드 대기 job을 최대 limit개 정리하고, FAILED로 바꾼 개수를 반환합니다."""
+        self._stats["runs"] += 1
+        expired = 0
+        for upload in await self._db.list_stale_uploads(self._ttl, limit):
+            job_id = upload["job_id"]
+            # 조회 후 업로드가 끝났으면 조건부 UPDATE가 아무것도 바꾸지 않음
+            if not await self._db.expire_upload(job_id):
+                continue
+            expired += 1
+            await self._job_cache.update(job_id, status=EXPIRED_UPLOAD_STATUS)
+            if upload["upload_id"] and upload["multipart_state"] == MULTIPART_STATE_INITIATED:
+                try:
+                    await run_in_threadpool(self._s3.abort_multipart_upload, upload["s3_key"], upload["upload_id"])
+                    self._stats["multipart_aborted"] += 1
+                except Exception as e:
+                    # 남은 파트는 버킷의 AbortIncompleteMultipartUpload 수명 주기 규칙이 정리
+                    self._stats["errors"] += 1
+                    print(f"[Upload Expiry] multipart abort failed job_id={job_id} error={e}")
+        self._stats["expired"] += expired
+        return expired
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self._interval)
+            try:
+                await self.expire_once()
+            except Exception as e:
+                self._stats["errors"] += 1
+                print(f"[Upload Expiry] failed: {e}")
+
+    def start(self) -> None:
+        if self._ttl > 0 and self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        metrics.unregister_source(self.metrics_name)
+
+    def stats(self) -> dict:
+        return dict(self._stats, running=self._task is not None, ttl_seconds=self._ttl)
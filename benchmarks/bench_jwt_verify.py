@@ -0,0 +1,105 @@
+# benchmarks/bench_jwt_verify.py
+
+# JWT 서명 검증 벤치마크
+# - construct: 이전 방식 (토큰마다 jwk.construct() + 헤더/claims 따로 디코딩)
+# - 그 외: app.jwt_verifiers의 각 백엔드로 auth_utils._verify_signature 수행 (kid -> 미리 만든 키, 토큰 1회 파싱)
+# - 로컬에서 만든 RSA 키쌍으로 RS256 토큰을 서명하고, JWKS 캐시를 직접 채워 네트워크 없이 측정
+# - 검증된 토큰 캐시(_TOKEN_CACHE)를 거치지 않도록 _verify_signature를 직접 호출
+#
+# 실행 (프로젝트 루트에서):
+#   python -m benchmarks.bench_jwt_verify
+#   python -m benchmarks.bench_jwt_verify --rounds 5000 --keys 4 --backends jose cryptography
+
+import argparse
+import os
+import time
+
+import rsa
+from jose import jwt, jwk
+from jose.utils import base64url_decode
+
+# auth_utils는 import 시점에 JWKS_URL을 읽으므로 먼저 설정 (실제로 조회하지는 않음)
+os.environ.setdefault("JWKS_URL", "https://example.invalid/.well-known/jwks.json")
+
+from app import auth_utils  # noqa: E402
+from app.jwt_verifiers import VERIFIER_BACKENDS, build_verifier  # noqa: E402
+
+
+def _make_keys(n: int):
+    """(kid, 개인키 PEM, 공개 JWK dict) 목록. Cognito JWKS처럼 여러 키가 있는 상황을 흉내냄."""
+    out = []
+    for i in range(n):
+        pub, priv = rsa.newkeys(2048)
+        kid = f"test-kid-{i}"
+        jwk_dict = jwk.construct(pub.save_pkcs1().decode(), "RS256").to_dict()
+        jwk_dict.update(kid=kid, use="sig")
+        out.append((kid, priv.save_pkcs1().decode(), jwk_dict))
+    return out
+
+
+def _install_backend(name: str, jwks: dict) -> None:
+    auth_utils._VERIFIER = build_verifier(name)
+    auth_utils._install_jwks(jwks)
+
+
+def _legacy_verify(token: str, jwks: dict) -> dict:
+    """이전 구현: keys 목록 선형 탐색 + 토큰마다 jwk.construct()."""
+    kid = jwt.get_unverified_header(token)["kid"]
+    jwk_dict = next(k for k in jwks["keys"] if k.get("kid") == kid)
+    public_key = jwk.construct(jwk_dict)
+    message, encoded_sig = token.rsplit(".", 1)
+    if not public_key.verify(message.encode("utf-8"), base64url_decode(encoded_sig.encode("utf-8"))):
+        raise SystemExit("legacy verify failed")
+    return jwt.get_unverified_claims(token)
+
+
+def bench(name: str, fn, tokens, rounds: int) -> float:
+    fn(tokens[0])  # warm-up
+    start = time.perf_counter()
+    for i in range(rounds):
+        fn(tokens[i % len(tokens)])
+    elapsed = time.perf_counter() - start
+    print(f"{name:<13} {rounds:>7} tokens  {elapsed:8.3f}s  {elapsed / rounds * 1e6:8.1f} us/token  {rounds / elapsed:9.0f} verifies/s")
+    return elapsed
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="JWT signature verification benchmark")
+    parser.add_argument("--keys", type=int, default=2, help="keys in the JWKS (Cognito publishes 2)")
+    parser.add_argument("--rounds", type=int, default=2000)
+    parser.add_argument("--backends", nargs="+", default=list(VERIFIER_BACKENDS), choices=list(VERIFIER_BACKENDS))
+    args = parser.parse_args(argv)
+
+    keys = _make_keys(args.keys)
+    jwks = {"keys": [k[2] for k in keys]}
+    exp = int(time.time()) + 3600
+    tokens = [
+        jwt.encode({"sub": f"user-{i}", "exp": exp, "token_use": "access"}, priv, algorithm="RS256", headers={"kid": kid})
+        for i, (kid, priv, _) in enumerate(keys)
+    ]
+    print(f"python-jose RSA backend: {jwk.RSAKey.__module__}.{jwk.RSAKey.__name__}")
+
+    baseline = bench("construct", lambda t: _legacy_verify(t, jwks), tokens, args.rounds)
+    for name in args.backends:
+        try:
+            _install_backend(name, jwks)
+        except RuntimeError as e:
+            print(f"{name:<13} skipped: {e}")
+            continue
+        for token in tokens:
+            if auth_utils._verify_signature(token) != _legacy_verify(token, jwks):
+                raise SystemExit(f"claims mismatch between construct and {name}")
+        # 변조된 서명은 모든 백엔드에서 거부되어야 함
+        tampered = tokens[0][:-4] + ("AAAA" if not tokens[0].endswith("AAAA") else "BBBB")
+        try:
+            auth_utils._verify_signature(tampered)
+        except auth_utils.JWTError:
+            pass
+        else:
+            raise SystemExit(f"{name} accepted a tampered signature")
+        elapsed = bench(name, auth_utils._verify_signature, tokens, args.rounds)
+        print(f"{'':<13} {baseline / elapsed:.1f}x vs construct")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+# benchmarks/bench_presign.py
+
+# boto3 generate_presigned_url vs app.sigv4.SigV4Presigner 비교
+# - 같은 시각으로 고정해 두 URL이 바이트 단위로 같은지 먼저 확인한 뒤 처리량을 측정
+# - 네트워크/실제 자격 증명 불필요 (더미 키로 서명만 수행)
+#
+# 실행 (프로젝트 루트에서):
+#   python -m benchmarks.bench_presign
+#   python -m benchmarks.bench_presign --keys 20 --rounds 500
+
+import argparse
+import datetime
+import time
+
+import boto3
+import botocore.auth
+from botocore.config import Config
+
+from app.sigv4 import SigV4Presigner
+
+ACCESS_KEY = "AKIDEXAMPLE"
+SECRET_KEY = "wJalrXUtnFEMI/K7MDENG+bPxRfiCYEXAMPLEKEY"
+REGION = "ap-northeast-2"
+BUCKET = "golf-analysis-results"
+EXPIRES = 3600
+
+
+def _keys(n: int):
+    return [f"user-123/3d/3f0e9a4c-{i:04d}/result_{i}.json" for i in range(n)]
+
+
+def _boto_client():
+    return boto3.client(
+        "s3",
+        aws_access_key_id=ACCESS_KEY,
+        aws_secret_access_key=SECRET_KEY,
+        region_name=REGION,
+        config=Config(signature_version="s3v4", s3={"addressing_style": "virtual"}),
+    )
+
+
+def check_identical(keys) -> None:
+    frozen = datetime.datetime(2024, 1, 1, 12, 0, 0, tzinfo=datetime.timezone.utc)
+    original = botocore.auth.get_current_datetime
+    botocore.auth.get_current_datetime = lambda *a, **k: frozen
+    try:
+        client = _boto_client()
+        presigner = SigV4Presigner(ACCESS_KEY, SECRET_KEY, REGION)
+        for key in keys:
+            expected = client.generate_presigned_url(
+                "get_object", Params={"Bucket": BUCKET, "Key": key}, ExpiresIn=EXPIRES
+            )
+            actual = presigner.presign("GET", BUCKET, key, EXPIRES, now=frozen)
+            if expected != actual:
+                raise SystemExit(f"URL mismatch for {key}\n  boto3:  {expected}\n  native: {actual}")
+    finally:
+        botocore.auth.get_current_datetime = original
+    print(f"identical URLs for {len(keys)} key(s)")
+
+
+def bench(name: str, fn, keys, rounds: int) -> float:
+    fn(keys[0])  # warm-up (boto3 서비스 모델 로드 등)
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for key in keys:
+            fn(key)
+    elapsed = time.perf_counter() - start
+    total = rounds * len(keys)
+    print(f"{name:<8} {total:>8} urls  {elapsed:8.3f}s  {elapsed / total * 1e6:8.1f} us/url")
+    return elapsed
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="presigned URL generation benchmark")
+    parser.add_argument("--keys", type=int, default=10, help="keys per round (result files per job)")
+    parser.add_argument("--rounds", type=int, default=200)
+    args = parser.parse_args(argv)
+
+    keys = _keys(args.keys)
+    check_identical(keys)
+
+    client = _boto_client()
+    presigner = SigV4Presigner(ACCESS_KEY, SECRET_KEY, REGION)
+    boto_time = bench(
+        "boto3",
+        lambda k: client.generate_presigned_url("get_object", Params={"Bucket": BUCKET, "Key": k}, ExpiresIn=EXPIRES),
+        keys, args.rounds,
+    )
+    native_time = bench("native", lambda k: presigner.presign("GET", BUCKET, k, EXPIRES), keys, args.rounds)
+    print(f"speedup  {boto_time / native_time:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
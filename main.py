@@ -9,18 +9,67 @@ if os.path.exists('.env.local'):
 else:
     load_dotenv()
 
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware # CORS 임포트
+from app.async_db_client import AsyncDBClient
+from app.s3_client import S3Client, S3_DEV_CREATE_BUCKETS
+from app.job_cache import build_job_cache
+from app.result_file_cache import ResultFileCache
+from app.upload_events import UploadEventConsumer
+from app.upload_expiry import StaleUploadReaper
+from app.jwks_refresher import JwksRefresher
 from app.routers import upload_router
 from app.routers import token_router
 from app.routers import result_router
 from app.routers import auth_router
+from app.routers import metrics_router
 
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # 공유 클라이언트는 프로세스당 한 번만 생성 (DB 연결/boto3 클라이언트는 첫 사용 시 생성)
+    # 라우터는 app.dependencies의 Depends로 주입받음
+    app.state.db_client = AsyncDBClient()
+    # replica 복제 지연 점검은 요청 경로가 아닌 백그라운드 태스크에서 수행
+    app.state.db_client.start()
+    app.state.s3_client = S3Client()
+    # boto3 서비스 모델 로드를 첫 업로드 요청이 아닌 시작 시점에 수행
+    try:
+        app.state.s3_client.warm_up()
+    except Exception as e:
+        print(f"[Startup] S3 client warm-up failed: {e}")
+    if S3_DEV_CREATE_BUCKETS:
+        # 로컬 S3 호환 서버(MinIO 등)에 버킷 준비: 실패하면 업로드가 전부 실패하므로 시작을 중단
+        app.state.s3_client.ensure_buckets()
+    app.state.job_cache = build_job_cache()
+    app.state.result_file_cache = ResultFileCache()
+    # S3 이벤트 알림(업로드 완료) 소비 태스크
+    app.state.upload_events = UploadEventConsumer(app.state.db_client, app.state.job_cache)
+    app.state.upload_events.start()
+    # 업로드가 끝나지 않은 채 버려진 job을 주기적으로 FAILED 처리
+    app.state.upload_expiry = StaleUploadReaper(app.state.db_client, app.state.s3_client, app.state.job_cache)
+    app.state.upload_expiry.start()
+    # Cognito JWKS를 미리 받아 두고 백그라운드에서 갱신 (요청 경로에서 JWKS 조회로 대기하지 않도록)
+    app.state.jwks_refresher = JwksRefresher()
+    await app.state.jwks_refresher.start()
+    try:
+        yield
+    finally:
+        await app.state.jwks_refresher.stop()
+        await app.state.upload_expiry.stop()
+        await app.state.upload_events.stop()
+        await app.state.db_client.close()
+        await app.state.job_cache.close()
+        app.state.s3_client.close()
+        app.state.result_file_cache.close()
+
+
 app = FastAPI(
     title="Golf Analysis Upload API",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
 )
 
 # -----------------------------------------------------------------
@@ -55,6 +104,8 @@ app.include_router(upload_router.router, prefix="/api")
 app.include_router(result_router.router, prefix="/api") 
 # auth router for backend-mediated login
 app.include_router(auth_router.router, prefix="/api")
+# 내부 통계 (DB 연결 풀 등) -> 최종 경로: /api/metrics
+app.include_router(metrics_router.router, prefix="/api")
 
 @app.get("/")
 def read_root():
@@ -0,0 +1,54 @@
+# tests/conftest.py
+
+# 실행 (프로젝트 루트에서): python -m pytest tests
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import auth_utils  # noqa: E402
+
+
+class FakeClock:
+    """auth_utils/token_cache의 time 모듈 대신 사용 (time.time()만 제공)."""
+
+    def __init__(self, now: float = 1_700_000_000.0):
+        self.now = now
+
+    def time(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float) -> None:
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    from app import token_cache
+    fake = FakeClock()
+    monkeypatch.setattr(auth_utils, "time", fake)
+    monkeypatch.setattr(token_cache, "time", fake)
+    return fake
+
+
+@pytest.fixture(autouse=True)
+def reset_auth_state(monkeypatch):
+    """모듈 전역 JWKS/토큰 캐시 상태를 테스트마다 초기화."""
+    monkeypatch.setattr(auth_utils, "JWKS_URL", "https://example.invalid/.well-known/jwks.json")
+    # 로컬 .env의 Cognito 설정과 무관하게 iss/aud 검증은 생략
+    monkeypatch.setattr(auth_utils, "ISSUER", None)
+    monkeypatch.setattr(auth_utils, "ALLOWED_CLIENT_IDS", [])
+    monkeypatch.setattr(auth_utils, "_JWKS_CACHE", None)
+    monkeypatch.setattr(auth_utils, "_JWKS_CACHE_TS", 0)
+    monkeypatch.setattr(auth_utils, "_JWKS_KEYS", {})
+    monkeypatch.setattr(auth_utils, "_JWKS_LAST_REFETCH", 0)
+    monkeypatch.setattr(auth_utils, "_JWKS_BACKGROUND_REFRESH", False)
+    monkeypatch.setattr(auth_utils, "_KID_STATS", {"refetches": 0, "refetch_skipped": 0, "unknown_kid_rejects": 0})
+    auth_utils._UNKNOWN_KIDS.clear()
+    auth_utils._TOKEN_CACHE.clear()
+    yield
+    auth_utils._UNKNOWN_KIDS.clear()
+    auth_utils._TOKEN_CACHE.clear()
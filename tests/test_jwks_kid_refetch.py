@@ -0,0 +1,105 @@
+# tests/test_jwks_kid_refetch.py
+
+# 모르는 kid에 대한 JWKS 재조회: 최소 간격, 음성 캐시, 키 교체(rotation)
+
+import requests
+
+from app import auth_utils
+
+
+class FakeJwksEndpoint:
+    """requests.get 대체. keys에 있는 kid 목록을 JWKS로 반환하고 호출 횟수를 셈."""
+
+    def __init__(self, kids):
+        self.kids = list(kids)
+        self.calls = 0
+        self.fail = False
+
+    def get(self, url, timeout=None):
+        self.calls += 1
+        if self.fail:
+            raise requests.exceptions.ConnectionError("down")
+        return self
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return {"keys": [{"kid": kid} for kid in self.kids]}
+
+
+def _setup(monkeypatch, kids):
+    endpoint = FakeJwksEndpoint(kids)
+    monkeypatch.setattr(auth_utils.requests, "get", endpoint.get)
+    # 실제 RSA 키 대신 kid마다 구분 가능한 객체
+    monkeypatch.setattr(auth_utils, "_build_key_map", lambda jwks: {k["kid"]: f"key-{k['kid']}" for k in jwks["keys"]})
+    auth_utils._fetch_jwks()
+    return endpoint
+
+
+def test_rotation_inside_min_interval_is_not_locked_out(monkeypatch, clock):
+    endpoint = _setup(monkeypatch, ["old"])
+    assert endpoint.calls == 1
+
+    # JWKS를 받은 직후 새 kid가 등장 -> 최소 간격 안이라 조회는 건너뜀
+    endpoint.kids = ["old", "new"]
+    clock.advance(5)
+    assert auth_utils._refetch_key_for_kid("new") is None
+    assert auth_utils._KID_STATS["refetch_skipped"] == 1
+    assert endpoint.calls == 1
+
+    # 간격 안에서는 조회 없이 거부
+    clock.advance(10)
+    assert auth_utils._refetch_key_for_kid("new") is None
+    assert endpoint.calls == 1
+
+    # 최소 간격이 지나면 (JWKS_UNKNOWN_KID_TTL보다 훨씬 전이라도) 바로 다시 조회해서 통과
+    clock.advance(auth_utils.JWKS_MIN_REFETCH_INTERVAL)
+    assert auth_utils._refetch_key_for_kid("new") == "key-new"
+    assert endpoint.calls == 2
+    assert auth_utils._KID_STATS["refetches"] == 1
+
+
+def test_unknown_kid_after_real_fetch_is_negative_cached(monkeypatch, clock):
+    endpoint = _setup(monkeypatch, ["old"])
+    clock.advance(auth_utils.JWKS_MIN_REFETCH_INTERVAL + 1)
+
+    assert auth_utils._refetch_key_for_kid("bogus") is None
+    assert endpoint.calls == 2
+
+    # 최소 간격이 지나도 TTL 동안은 조회 없이 거부
+    clock.advance(auth_utils.JWKS_MIN_REFETCH_INTERVAL + 1)
+    assert auth_utils._refetch_key_for_kid("bogus") is None
+    assert endpoint.calls == 2
+    assert auth_utils._KID_STATS["unknown_kid_rejects"] == 1
+
+    clock.advance(auth_utils.JWKS_UNKNOWN_KID_TTL)
+    assert auth_utils._refetch_key_for_kid("bogus") is None
+    assert endpoint.calls == 3
+
+
+def test_failed_fetch_does_not_negative_cache_for_full_ttl(monkeypatch, clock):
+    endpoint = _setup(monkeypatch, ["old"])
+    clock.advance(auth_utils.JWKS_MIN_REFETCH_INTERVAL + 1)
+
+    endpoint.fail = True
+    assert auth_utils._refetch_key_for_kid("new") is None
+    assert endpoint.calls == 2
+
+    endpoint.fail = False
+    endpoint.kids = ["old", "new"]
+    clock.advance(auth_utils.JWKS_MIN_REFETCH_INTERVAL)
+    assert auth_utils._refetch_key_for_kid("new") == "key-new"
+    assert endpoint.calls == 3
+
+
+def test_new_key_set_clears_negative_cache(monkeypatch, clock):
+    endpoint = _setup(monkeypatch, ["old"])
+    clock.advance(auth_utils.JWKS_MIN_REFETCH_INTERVAL + 1)
+    assert auth_utils._refetch_key_for_kid("new") is None
+
+    # 백그라운드 갱신이 새 kid를 포함한 키 세트를 설치하면 바로 통과
+    endpoint.kids = ["old", "new"]
+    auth_utils._install_jwks(endpoint.json())
+    assert auth_utils._get_key_for_kid("new") == "key-new"
+    assert not auth_utils._is_unknown_kid("new")
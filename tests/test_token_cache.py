@@ -0,0 +1,140 @@
+# tests/test_token_cache.py
+
+# 검증된 토큰 캐시 (app.token_cache / auth_utils._resolve_user_id)
+
+from jose.exceptions import JWTError
+
+from app import auth_utils
+from app.token_cache import VerifiedTokenCache
+
+
+class CountingVerifier:
+    """_verify_signature 대체: 호출 횟수를 세고, fail이면 서명 실패처럼 JWTError."""
+
+    def __init__(self, claims):
+        self.claims = claims
+        self.calls = 0
+        self.fail = False
+
+    def __call__(self, token):
+        self.calls += 1
+        if self.fail:
+            raise JWTError("서명 검증 실패")
+        return dict(self.claims)
+
+
+def _install_verifier(monkeypatch, claims):
+    verifier = CountingVerifier(claims)
+    monkeypatch.setattr(auth_utils, "_verify_signature", verifier)
+    return verifier
+
+
+# ----------------------------------------------------------------------
+# VerifiedTokenCache
+# ----------------------------------------------------------------------
+def test_entry_served_until_exp_boundary(clock):
+    cache = VerifiedTokenCache(max_entries=10)
+    try:
+        exp = int(clock.now) + 60
+        cache.set("tok", "u1", exp)
+
+        clock.now = exp - 1
+        assert cache.get("tok") == "u1"
+        # exp 시각부터는 제공하지 않고 항목도 삭제
+        clock.now = exp
+        assert cache.get("tok") is None
+        assert cache.stats()["expired"] == 1
+        assert cache.stats()["size"] == 0
+    finally:
+        cache.close()
+
+
+def test_lru_eviction_at_max_entries(clock):
+    cache = VerifiedTokenCache(max_entries=2)
+    try:
+        exp = int(clock.now) + 60
+        cache.set("a", "ua", exp)
+        cache.set("b", "ub", exp)
+        assert cache.get("a") == "ua"  # a를 최근 사용으로
+        cache.set("c", "uc", exp)      # 가장 오래 안 쓴 b가 밀려남
+
+        assert cache.get("b") is None
+        assert cache.get("a") == "ua"
+        assert cache.get("c") == "uc"
+        assert cache.stats()["evictions"] == 1
+        assert cache.stats()["size"] == 2
+    finally:
+        cache.close()
+
+
+def test_zero_max_entries_disables_cache(clock):
+    cache = VerifiedTokenCache(max_entries=0)
+    try:
+        cache.set("tok", "u1", int(clock.now) + 60)
+        assert cache.get("tok") is None
+        assert cache.stats()["size"] == 0
+    finally:
+        cache.close()
+
+
+def test_keys_are_hashed(clock):
+    cache = VerifiedTokenCache(max_entries=10)
+    try:
+        cache.set("secret-token", "u1", int(clock.now) + 60)
+        assert all(isinstance(k, bytes) and b"secret-token" not in k for k in cache._data)
+    finally:
+        cache.close()
+
+
+# ----------------------------------------------------------------------
+# auth_utils._resolve_user_id
+# ----------------------------------------------------------------------
+def test_hit_skips_signature_verification(monkeypatch, clock):
+    verifier = _install_verifier(monkeypatch, {"sub": "u1", "exp": int(clock.now) + 60})
+
+    assert auth_utils.get_user_id_from_token("tok") == "u1"
+    assert auth_utils.get_user_id_from_token("Bearer tok") == "u1"
+    assert auth_utils.get_current_user_id(Authorization="Bearer tok", access_token_cookie=None, id_token_cookie=None) == "u1"
+    assert verifier.calls == 1
+
+
+def test_failed_signature_is_never_cached(monkeypatch, clock):
+    verifier = _install_verifier(monkeypatch, {"sub": "u1", "exp": int(clock.now) + 60})
+    verifier.fail = True
+
+    assert auth_utils.get_user_id_from_token("tok") is None
+    assert auth_utils.get_user_id_from_token("tok") is None
+    assert verifier.calls == 2
+    assert auth_utils._TOKEN_CACHE.stats()["size"] == 0
+
+
+def test_failed_claims_are_never_cached(monkeypatch, clock):
+    # 서명은 맞지만 이미 만료된 토큰
+    verifier = _install_verifier(monkeypatch, {"sub": "u1", "exp": int(clock.now) - 1})
+
+    assert auth_utils.get_user_id_from_token("tok") is None
+    assert auth_utils.get_user_id_from_token("tok") is None
+    assert verifier.calls == 2
+    assert auth_utils._TOKEN_CACHE.stats()["size"] == 0
+
+
+def test_cached_token_rechecked_after_exp(monkeypatch, clock):
+    exp = int(clock.now) + 60
+    verifier = _install_verifier(monkeypatch, {"sub": "u1", "exp": exp})
+    assert auth_utils.get_user_id_from_token("tok") == "u1"
+
+    clock.now = exp + 1
+    assert auth_utils.get_user_id_from_token("tok") is None
+    assert verifier.calls == 2
+
+
+def test_disabled_cache_verifies_every_time(monkeypatch, clock):
+    disabled = VerifiedTokenCache(max_entries=0)
+    monkeypatch.setattr(auth_utils, "_TOKEN_CACHE", disabled)
+    try:
+        verifier = _install_verifier(monkeypatch, {"sub": "u1", "exp": int(clock.now) + 60})
+        assert auth_utils.get_user_id_from_token("tok") == "u1"
+        assert auth_utils.get_user_id_from_token("tok") == "u1"
+        assert verifier.calls == 2
+    finally:
+        disabled.close()